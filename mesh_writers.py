@@ -0,0 +1,2836 @@
+"""
+++++++++++ 
++ CFDMSH +
+++++++++++ 
+
+Mesh Writers of the CFDMSH Library
+
+Author: Tougeron W. (www.tougeron-cfd.com)
+
+Licence: GNU General Public License
+
+These functions only need NumPy: they write the mesh arrays extracted
+by the GetMeshArrays function of cfdmsh, or saved in a mesh snapshot,
+so that meshes can be converted without a Salome session.
+"""
+
+version = "4.0"
+
+import numpy
+import itertools
+import gzip
+import io
+import hashlib
+import mmap
+import time
+import ast
+import os
+import json
+
+#### Here are internal functions ####
+
+def _StartMonitor( exporter, callback = None, log = None ):
+	"""
+	Starts recording the phase timings of an export. The returned monitor is updated by _SwitchPhase and closed by _StopMonitor.
+	"""
+	
+	start_time = time.time()
+	
+	return {"exporter": exporter, "callback": callback, "log": log, "start_time": start_time, "phase": None, "phase_start_time": start_time, "phases": {}}
+	
+
+def _SwitchPhase( monitor, phase ):
+	"""
+	Adds the time spent since the last switch to the current phase of a monitor and starts a new phase. Does nothing if the monitor equals None.
+	"""
+	
+	if monitor == None: return
+	
+	now = time.time()
+	
+	if monitor["phase"] != None:
+		
+		monitor["phases"][monitor["phase"]] = monitor["phases"].get(monitor["phase"], 0.0) + now - monitor["phase_start_time"]
+		
+	
+	monitor["phase"] = phase
+	
+	monitor["phase_start_time"] = now
+	
+
+def _GetPeakMemory():
+	"""
+	Gives the peak resident set size of the current process in bytes, or None if it is not available on this platform.
+	"""
+	
+	try:
+		import resource
+	except ImportError:
+		return None
+	
+	peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	
+	if os.uname()[0] == "Darwin":
+		
+		return peak_memory
+		
+	
+	return peak_memory * 1024
+	
+
+def _StopMonitor( monitor, file, nb_elements, nb_nodes ):
+	"""
+	Closes a monitor and builds the export report (phase timings, throughput and peak memory). The report is passed to the monitor callback, appended as a JSON line to the monitor log file and returned.
+	"""
+	
+	if monitor == None: return
+	
+	_SwitchPhase(monitor, None)
+	
+	total_time = time.time() - monitor["start_time"]
+	
+	try:
+		import salome_version
+		salome_version_name = salome_version.getVersion()
+	except:
+		salome_version_name = None
+	
+	report = {
+		"exporter": monitor["exporter"],
+		"file": file,
+		"date": time.asctime(time.localtime()),
+		"version": version,
+		"salome_version": salome_version_name,
+		"phases": monitor["phases"],
+		"time": total_time,
+		"nb_elements": int(nb_elements),
+		"nb_nodes": int(nb_nodes),
+		"elements_per_second": nb_elements / total_time if total_time > 0 else None,
+		"peak_memory": _GetPeakMemory()
+	}
+	
+	if monitor["callback"] != None:
+		
+		monitor["callback"](report)
+		
+	
+	if monitor["log"] != None:
+		
+		with open(monitor["log"], "a") as log_file:
+			
+			log_file.write(json.dumps(report) + "\n")
+			
+		
+	
+	return report
+	
+
+def _WriteMonitoredLines( file, lines, monitor = None ):
+	"""
+	Writes into an opened file the lines given by a generator, the time spent producing them being counted as formatting and the time spent writing them as I/O.
+	"""
+	
+	_SwitchPhase(monitor, "formatting")
+	
+	for line in lines:
+		
+		_SwitchPhase(monitor, "io")
+		
+		file.write(line)
+		
+		_SwitchPhase(monitor, "formatting")
+		
+	
+
+# Element types of the exported mesh formats
+# (element dimension, number of nodes): (SU2 type, AMSH type)
+
+element_type_codes = {
+	(1, 2): (3, "bar2"),
+	(2, 3): (5, "tria3"),
+	(2, 4): (9, "quad4"),
+	(3, 4): (10, "tetra4"),
+	(3, 5): (14, "penta5"),
+	(3, 6): (13, "penta6"),
+	(3, 8): (12, "hexa8")
+	}
+
+element_type_lookups = {
+	"su2": numpy.zeros((4, 9), dtype = numpy.int64),
+	"amsh": numpy.full((4, 9), "", dtype = object)
+	}
+
+for (element_dimension, nb_nodes), (su2_type, amsh_type) in element_type_codes.items():
+	
+	element_type_lookups["su2"][element_dimension, nb_nodes] = su2_type
+	element_type_lookups["amsh"][element_dimension, nb_nodes] = amsh_type
+	
+
+# Node orders of the AMSH volume elements
+# (the SMESH nodes taken for each AMSH node)
+
+amsh_node_orders = {
+	"tetra4": [2, 1, 0, 3],
+	"penta5": [3, 2, 1, 0, 4],
+	"penta6": [3, 4, 5, 0, 1, 2],
+	"hexa8": [4, 5, 6, 7, 0, 1, 2, 3]
+	}
+
+def _GetElementTypes( mesh_dimension, nb_nodes_in_elements, boundary = False, format = "su2" ):
+	"""
+	Classifies in one pass elements according to their number of nodes. Unsupported elements get the type 0 ("su2" format) or "" ("amsh" format).
+	"""
+	
+	if boundary == True: mesh_dimension -= 1
+	
+	lookup = element_type_lookups[format][mesh_dimension]
+	
+	nb_nodes_in_elements = numpy.asarray(nb_nodes_in_elements, dtype = numpy.int64)
+	
+	return lookup[numpy.where(nb_nodes_in_elements < len(lookup), nb_nodes_in_elements, 0)]
+	
+
+def _GetElementCentroids( coordinates, offsets, connectivity, chunk_size = 1000000 ):
+	"""
+	Gives the centroids of a set of elements, chunk_size elements at a time.
+	"""
+	
+	nb_elements = len(offsets) - 1
+	
+	centroids = numpy.zeros((nb_elements, coordinates.shape[1]))
+	
+	nb_nodes_in_elements = numpy.diff(offsets)
+	
+	for start in range(0, nb_elements, chunk_size):
+		
+		stop = min(start + chunk_size, nb_elements)
+		
+		node_coordinates = coordinates[connectivity[offsets[start]:offsets[stop]]]
+		
+		centroids[start:stop] = numpy.add.reduceat(node_coordinates, offsets[start:stop] - offsets[start], axis = 0) / nb_nodes_in_elements[start:stop, None]
+		
+	
+	return centroids
+	
+
+def _PartitionElements( centroids, nb_parts ):
+	"""
+	Partitions a set of elements by recursive coordinate bisection of their centroids.
+	"""
+	
+	partitions = numpy.zeros(len(centroids), dtype = numpy.int64)
+	
+	parts_to_split = [(numpy.arange(len(centroids)), 0, nb_parts)]
+	
+	while len(parts_to_split) > 0:
+		
+		[indexes, first_part, nb_parts_in_split] = parts_to_split.pop()
+		
+		if nb_parts_in_split == 1 or len(indexes) == 0:
+			
+			partitions[indexes] = first_part
+			
+			continue
+			
+		
+		# Split along the axis of largest extent, proportionally to the number of parts on each side
+		
+		points = centroids[indexes]
+		
+		axis = numpy.argmax(points.max(axis = 0) - points.min(axis = 0))
+		
+		nb_parts_on_left = nb_parts_in_split // 2
+		
+		split = len(indexes) * nb_parts_on_left // nb_parts_in_split
+		
+		order = numpy.argpartition(points[:, axis], split) if split < len(indexes) else numpy.arange(len(indexes))
+		
+		parts_to_split.append((indexes[order[:split]], first_part, nb_parts_on_left))
+		parts_to_split.append((indexes[order[split:]], first_part + nb_parts_on_left, nb_parts_in_split - nb_parts_on_left))
+		
+		#-
+		
+	
+	return partitions
+	
+
+def _RenumberMeshArrays( mesh_arrays, element_order, node_order = None ):
+	"""
+	Reorders the domain elements of mesh arrays and renumbers their nodes consistently in the domain and the groups. If node_order is None, the nodes are numbered in the order they are first used by the reordered elements.
+	"""
+	
+	offsets = mesh_arrays["offsets"]
+	
+	connectivity = mesh_arrays["connectivity"]
+	
+	nb_nodes_in_mesh = len(mesh_arrays["coordinates"])
+	
+	# Reorder the domain elements
+	
+	[new_offsets, connectivity] = _ReorderElements(offsets, connectivity, element_order)
+	
+	for key in ["element_ids", "types", "partitions"]:
+		
+		if key in mesh_arrays:
+			
+			mesh_arrays[key] = mesh_arrays[key][element_order]
+			
+		
+	
+	#-
+	
+	# Get the node order
+	
+	if node_order is None:
+		
+		node_order = _GetFirstUseNodeOrder(connectivity, nb_nodes_in_mesh)
+		
+	
+	new_node_indexes = numpy.empty(nb_nodes_in_mesh, dtype = numpy.int64)
+	
+	new_node_indexes[node_order] = numpy.arange(nb_nodes_in_mesh)
+	
+	#-
+	
+	# Renumber the nodes
+	
+	mesh_arrays["offsets"] = new_offsets
+	
+	mesh_arrays["connectivity"] = new_node_indexes[connectivity]
+	
+	mesh_arrays["coordinates"] = mesh_arrays["coordinates"][node_order]
+	
+	mesh_arrays["node_ids"] = mesh_arrays["node_ids"][node_order]
+	
+	for group in mesh_arrays["groups"]:
+		
+		if "batches" in group:
+			
+			group["batches"] = _RenumberBatches(group["batches"], new_node_indexes)
+			
+		
+		else:
+			
+			group["connectivity"] = new_node_indexes[group["connectivity"]]
+			
+		
+	
+	#-
+	
+	return mesh_arrays
+	
+
+def _ReorderElements( offsets, connectivity, element_order ):
+	"""
+	Gives the offsets and the connectivity of a set of elements taken in a given order.
+	"""
+	
+	nb_nodes_in_elements = numpy.diff(offsets)[element_order]
+	
+	new_offsets = numpy.zeros(len(element_order) + 1, dtype = numpy.int64)
+	
+	numpy.cumsum(nb_nodes_in_elements, out = new_offsets[1:])
+	
+	return [new_offsets, connectivity[numpy.repeat(offsets[element_order] - new_offsets[:-1], nb_nodes_in_elements) + numpy.arange(new_offsets[-1])]]
+	
+
+def _GetFirstUseNodeOrder( connectivity, nb_nodes ):
+	"""
+	Gives the nodes in the order they are first used by a connectivity, the unused nodes coming last.
+	"""
+	
+	[used_nodes, first_uses] = numpy.unique(connectivity, return_index = True)
+	
+	unused_nodes = numpy.setdiff1d(numpy.arange(nb_nodes), used_nodes, assume_unique = True)
+	
+	return numpy.concatenate((used_nodes[numpy.argsort(first_uses, kind = "stable")], unused_nodes))
+	
+
+def _RenumberBatches( batches, new_node_indexes ):
+	"""
+	Renumbers the nodes of lazily extracted group elements.
+	"""
+	
+	for batch in batches:
+		
+		batch["connectivity"] = new_node_indexes[batch["connectivity"]]
+		
+		yield batch
+		
+	
+
+def _GetBandwidth( offsets, connectivity ):
+	"""
+	Gives the bandwidth of the node adjacency matrix of a set of elements, that is the largest index difference between two nodes of a same element.
+	"""
+	
+	if len(offsets) < 2: return 0
+	
+	return int((numpy.maximum.reduceat(connectivity, offsets[:-1]) - numpy.minimum.reduceat(connectivity, offsets[:-1])).max())
+	
+
+def _GetMeanNodeGap( offsets, connectivity ):
+	"""
+	Gives the mean node index gap of a set of elements, that is the mean over the elements of the difference between their largest and smallest node indexes, as a measure of the memory locality of the elements.
+	"""
+	
+	if len(offsets) < 2: return 0.0
+	
+	return float((numpy.maximum.reduceat(connectivity, offsets[:-1]) - numpy.minimum.reduceat(connectivity, offsets[:-1])).mean())
+	
+
+def _GetRanges( values, starts, counts ):
+	"""
+	Concatenates the ranges values[starts[n]:starts[n] + counts[n]] and gives the range index n of each concatenated value.
+	"""
+	
+	ends = numpy.cumsum(counts)
+	
+	positions = numpy.repeat(starts - ends + counts, counts) + numpy.arange(ends[-1] if len(ends) > 0 else 0)
+	
+	return values[positions], numpy.repeat(numpy.arange(len(starts)), counts)
+	
+
+def _GetReverseCuthillMcKeeOrder( offsets, connectivity, nb_nodes ):
+	"""
+	Gives the Reverse Cuthill-McKee order of the nodes of a set of elements. The graph is walked level by level through the node to element incidence, without building the node adjacency.
+	"""
+	
+	def WalkLevels(start_node):
+		
+		levels = [numpy.array([start_node])]
+		
+		visited[start_node] = True
+		
+		while True:
+			
+			# Get the unvisited neighbours of the current level
+			
+			[elements, element_parents] = _GetRanges(node_elements, node_offsets[levels[-1]], degrees[levels[-1]])
+			
+			[neighbours, neighbour_elements] = _GetRanges(connectivity, offsets[elements], nb_nodes_in_elements[elements])
+			
+			neighbour_parents = element_parents[neighbour_elements]
+			
+			unvisited = ~visited[neighbours]
+			
+			neighbours = neighbours[unvisited]
+			
+			neighbour_parents = neighbour_parents[unvisited]
+			
+			if len(neighbours) == 0: break
+			
+			#-
+			
+			# Number them by parent order, then by increasing degree
+			
+			sorter = numpy.lexsort((degrees[neighbours], neighbour_parents))
+			
+			[level, first_positions] = numpy.unique(neighbours[sorter], return_index = True)
+			
+			level = level[numpy.argsort(first_positions)]
+			
+			visited[level] = True
+			
+			levels.append(level)
+			
+			#-
+			
+		
+		return levels
+		
+	
+	nb_nodes_in_elements = numpy.diff(offsets)
+	
+	# Get the elements of each node
+	
+	node_elements = numpy.repeat(numpy.arange(len(nb_nodes_in_elements)), nb_nodes_in_elements)[numpy.argsort(connectivity, kind = "stable")]
+	
+	degrees = numpy.bincount(connectivity, minlength = nb_nodes)
+	
+	node_offsets = numpy.zeros(nb_nodes + 1, dtype = numpy.int64)
+	
+	numpy.cumsum(degrees, out = node_offsets[1:])
+	
+	#-
+	
+	visited = degrees == 0
+	
+	order = []
+	
+	while not visited.all():
+		
+		# Start from a pseudo-peripheral node of the next component
+		
+		unvisited_nodes = numpy.flatnonzero(~visited)
+		
+		start_node = unvisited_nodes[numpy.argmin(degrees[unvisited_nodes])]
+		
+		levels = WalkLevels(start_node)
+		
+		start_node = levels[-1][numpy.argmin(degrees[levels[-1]])]
+		
+		visited[numpy.concatenate(levels)] = False
+		
+		order += WalkLevels(start_node)
+		
+		#-
+		
+	
+	order = numpy.concatenate(order)[::-1] if len(order) > 0 else numpy.zeros(0, dtype = numpy.int64)
+	
+	return numpy.concatenate((order, numpy.flatnonzero(degrees == 0)))
+	
+
+def _GetMortonOrder( points ):
+	"""
+	Gives the order of a set of points along a Morton (Z-order) space-filling curve.
+	"""
+	
+	def SpreadBits(values):
+		
+		values = values & numpy.uint64(0x1fffff)
+		
+		for shift, mask in [(32, 0x1f00000000ffff), (16, 0x1f0000ff0000ff), (8, 0x100f00f00f00f00f), (4, 0x10c30c30c30c30c3), (2, 0x1249249249249249)]:
+			
+			values = (values | (values << numpy.uint64(shift))) & numpy.uint64(mask)
+			
+		
+		return values
+		
+	
+	if len(points) == 0: return numpy.zeros(0, dtype = numpy.int64)
+	
+	# Quantize the coordinates on 21 bits
+	
+	minimums = points.min(axis = 0)
+	
+	extents = points.max(axis = 0) - minimums
+	
+	extents[extents == 0] = 1
+	
+	quantized_points = ((points - minimums) / extents * (2**21 - 1)).astype(numpy.uint64)
+	
+	#-
+	
+	codes = numpy.zeros(len(points), dtype = numpy.uint64)
+	
+	for axis in range(points.shape[1]):
+		
+		codes |= SpreadBits(quantized_points[:, axis]) << numpy.uint64(axis)
+		
+	
+	return numpy.argsort(codes, kind = "stable")
+	
+
+def _ReorderMeshArrays( mesh_arrays, renumber ):
+	"""
+	Renumbers the nodes and the elements of mesh arrays in the Reverse Cuthill-McKee order ("rcm") or along a Morton curve ("morton"). The bandwidth and the mean node index gap of the elements are printed before and after. Whatever the renumbering, the renumbered order is only kept if it does not increase the bandwidth and reduces the bandwidth or the mean node index gap. The mesh arrays are left in their original order otherwise.
+	"""
+	
+	offsets = mesh_arrays["offsets"]
+	
+	connectivity = mesh_arrays["connectivity"]
+	
+	if renumber == "rcm":
+		
+		node_order = _GetReverseCuthillMcKeeOrder(offsets, connectivity, len(mesh_arrays["coordinates"]))
+		
+		# Sort the elements by their first node
+		
+		new_node_indexes = numpy.empty(len(node_order), dtype = numpy.int64)
+		
+		new_node_indexes[node_order] = numpy.arange(len(node_order))
+		
+		first_nodes = numpy.minimum.reduceat(new_node_indexes[connectivity], offsets[:-1]) if len(offsets) > 1 else numpy.zeros(0, dtype = numpy.int64)
+		
+		element_order = numpy.argsort(first_nodes, kind = "stable")
+		
+		#-
+		
+	
+	elif renumber == "morton":
+		
+		element_order = _GetMortonOrder(_GetElementCentroids(mesh_arrays["coordinates"], offsets, connectivity))
+		
+		node_order = _GetFirstUseNodeOrder(_ReorderElements(offsets, connectivity, element_order)[1], len(mesh_arrays["coordinates"]))
+		
+	
+	else:
+		
+		print("[X] The renumbering", renumber, "is not supported. Use \"rcm\" or \"morton\"."); return
+		
+	
+	# Keep the original order unless the locality is improved
+	
+	new_node_indexes = numpy.empty(len(node_order), dtype = numpy.int64)
+	
+	new_node_indexes[node_order] = numpy.arange(len(node_order))
+	
+	[bandwidth, new_bandwidth] = [_GetBandwidth(offsets, connectivity), _GetBandwidth(offsets, new_node_indexes[connectivity])]
+	
+	[gap, new_gap] = [_GetMeanNodeGap(offsets, connectivity), _GetMeanNodeGap(offsets, new_node_indexes[connectivity])]
+	
+	print("[i] Bandwidth: %i before, %i after the %s renumbering. Mean node index gap per element: %g before, %g after."%(bandwidth, new_bandwidth, renumber, gap, new_gap))
+	
+	if new_bandwidth > bandwidth or (new_bandwidth == bandwidth and new_gap >= gap):
+		
+		print("[i] The locality is not improved by the %s renumbering. The original order is kept."%(renumber))
+		
+		return mesh_arrays
+		
+	
+	#-
+	
+	_RenumberMeshArrays(mesh_arrays, element_order, node_order)
+	
+	print("[i] The renumbered order is kept.")
+	
+	return mesh_arrays
+	
+
+def _SaveMeshSnapshot( file, mesh_arrays, key ):
+	"""
+	Saves the arrays returned by GetMeshArrays, with their mesh key, into a compressed NPZ file of a given name without extension.
+	"""
+	
+	snapshot_arrays = {
+		"key": numpy.array(key),
+		"name": numpy.array(mesh_arrays["name"]),
+		"dimension": numpy.array(mesh_arrays["dimension"]),
+		"group_names": numpy.array([group["name"] for group in mesh_arrays["groups"]], dtype = str),
+		"group_types": numpy.array([group["type"] for group in mesh_arrays["groups"]], dtype = str)
+		}
+	
+	for array_name in ["node_ids", "coordinates", "element_ids", "offsets", "connectivity"]:
+		
+		snapshot_arrays[array_name] = mesh_arrays[array_name]
+		
+	
+	for g, group in enumerate(mesh_arrays["groups"]):
+		
+		for array_name in ["element_ids", "offsets", "connectivity"]:
+			
+			snapshot_arrays["group_%i_%s"%(g, array_name)] = group[array_name]
+			
+		
+	
+	numpy.savez_compressed("%s.npz"%(file), **snapshot_arrays)
+	
+
+def _LoadMeshSnapshot( file, key = None ):
+	"""
+	Loads the mesh arrays saved by _SaveMeshSnapshot into an NPZ file of a given name without extension. Returns None if the file does not exist or, if key is different from None, was saved from a mesh having another key.
+	"""
+	
+	if not os.path.isfile("%s.npz"%(file)): return None
+	
+	with numpy.load("%s.npz"%(file)) as snapshot_arrays:
+		
+		if key != None and str(snapshot_arrays["key"]) != key: return None
+		
+		groups = []
+		
+		for g, [group_name, group_type] in enumerate(zip(snapshot_arrays["group_names"].tolist(), snapshot_arrays["group_types"].tolist())):
+			
+			group = {"name": group_name, "type": group_type}
+			
+			for array_name in ["element_ids", "offsets", "connectivity"]:
+				
+				group[array_name] = snapshot_arrays["group_%i_%s"%(g, array_name)]
+				
+			
+			group["size"] = len(group["element_ids"])
+			
+			groups.append(group)
+			
+		
+		mesh_arrays = {
+			"name": str(snapshot_arrays["name"]),
+			"dimension": int(snapshot_arrays["dimension"]),
+			"node_ids": snapshot_arrays["node_ids"],
+			"coordinates": snapshot_arrays["coordinates"],
+			"element_ids": snapshot_arrays["element_ids"],
+			"offsets": snapshot_arrays["offsets"],
+			"connectivity": snapshot_arrays["connectivity"],
+			"groups": groups
+			}
+		
+	
+	return mesh_arrays
+	
+
+def _PowerOfTen( figures ):
+	"""
+	Splits an array of figures into mantissas and powers of ten, as done figure by figure by the exporters.
+	"""
+	
+	mantissas = numpy.array(figures, dtype = numpy.float64, order = "C")
+	
+	powers = numpy.zeros(mantissas.shape, dtype = numpy.int64)
+	
+	flat_mantissas = mantissas.reshape(-1)
+	
+	flat_powers = powers.reshape(-1)
+	
+	finite = numpy.isfinite(flat_mantissas) & (flat_mantissas != 0)
+	
+	# Scale up the figures lower than one
+	
+	indexes = numpy.flatnonzero(finite & (numpy.abs(flat_mantissas) < 1))
+	
+	while len(indexes) > 0:
+		
+		flat_mantissas[indexes] *= 10
+		
+		flat_powers[indexes] -= 1
+		
+		indexes = indexes[numpy.abs(flat_mantissas[indexes]) < 1]
+		
+	
+	#-
+	
+	# Scale down the figures greater than ten
+	
+	indexes = numpy.flatnonzero(finite & (numpy.abs(flat_mantissas) >= 10))
+	
+	while len(indexes) > 0:
+		
+		flat_mantissas[indexes] /= 10
+		
+		flat_powers[indexes] += 1
+		
+		indexes = indexes[numpy.abs(flat_mantissas[indexes]) >= 10]
+		
+	
+	#-
+	
+	return mantissas, powers
+	
+
+def _FormatSU2Elements( types, offsets, connectivity, element_ids, chunk_size = 100000 ):
+	"""
+	Yields the SU2 definition lines of a set of elements, chunk_size elements at a time.
+	"""
+	
+	nb_elements = len(element_ids)
+	
+	nb_nodes_in_elements = numpy.diff(offsets)
+	
+	max_nb_nodes = int(nb_nodes_in_elements.max()) if nb_elements > 0 else 0
+	
+	line_formats = numpy.array(["%i" + "\t%i" * nb_nodes + "\t%i\n" for nb_nodes in range(max_nb_nodes + 1)], dtype = object)
+	
+	for start in range(0, nb_elements, chunk_size):
+		
+		stop = min(start + chunk_size, nb_elements)
+		
+		nb_nodes_in_chunk = nb_nodes_in_elements[start:stop]
+		
+		# Interleave the element types, node indexes and element IDs
+		
+		line_starts = offsets[start:stop] - offsets[start] + 2 * numpy.arange(stop - start)
+		
+		figures = numpy.empty(offsets[stop] - offsets[start] + 2 * (stop - start), dtype = numpy.int64)
+		
+		node_mask = numpy.ones(len(figures), dtype = bool)
+		
+		node_mask[line_starts] = False
+		node_mask[line_starts + nb_nodes_in_chunk + 1] = False
+		
+		figures[line_starts] = types[start:stop]
+		figures[line_starts + nb_nodes_in_chunk + 1] = element_ids[start:stop]
+		figures[node_mask] = connectivity[offsets[start]:offsets[stop]]
+		
+		#-
+		
+		yield "".join(line_formats[nb_nodes_in_chunk].tolist())%tuple(figures.tolist())
+		
+	
+
+def _FormatSU2Coordinates( coordinates, axes, chunk_size = 100000 ):
+	"""
+	Yields the SU2 coordinate lines of a set of nodes, chunk_size nodes at a time.
+	"""
+	
+	nb_nodes = len(coordinates)
+	
+	line_format = "\t%.16fE%i" * len(axes) + "\n"
+	
+	for start in range(0, nb_nodes, chunk_size):
+		
+		stop = min(start + chunk_size, nb_nodes)
+		
+		[mantissas, powers] = _PowerOfTen(coordinates[start:stop][:, list(axes)])
+		
+		figures = numpy.empty((stop - start, 2 * len(axes)), dtype = object)
+		
+		figures[:, 0::2] = mantissas
+		figures[:, 1::2] = powers
+		
+		yield (line_format * (stop - start))%tuple(figures.ravel().tolist())
+		
+	
+
+def _FormatRows( rows, row_format, chunk_size = 100000 ):
+	"""
+	Yields the lines of a table, one line per row formatted with the same row format, chunk_size rows at a time.
+	"""
+	
+	nb_rows = len(rows)
+	
+	for start in range(0, nb_rows, chunk_size):
+		
+		stop = min(start + chunk_size, nb_rows)
+		
+		yield (row_format * (stop - start))%tuple(rows[start:stop].ravel().tolist())
+		
+	
+
+def _FormatAmshColumns( figures, nb_columns, nb_indentation_spaces, nb_spaces = 6, chunk_size = 100000 ):
+	"""
+	Yields the FFA lines of a flat table of figures written nb_columns figures per line, chunk_size lines at a time. Integer figures are written as they are and float figures as a mantissa and a power of ten.
+	"""
+	
+	nb_figures = len(figures)
+	
+	if numpy.issubdtype(figures.dtype, numpy.floating):
+		
+		figure_format = "%.16fE%i"
+		
+	
+	else:
+		
+		figure_format = "%i"
+		
+	
+	line_formats = [" " * nb_indentation_spaces + (" " * nb_spaces).join([figure_format] * nb_figures_in_line) + "\n" for nb_figures_in_line in range(nb_columns + 1)]
+	
+	chunk_size *= nb_columns
+	
+	for start in range(0, nb_figures, chunk_size):
+		
+		stop = min(start + chunk_size, nb_figures)
+		
+		# Split the float figures into mantissas and powers of ten
+		
+		if figure_format == "%i":
+			
+			values = figures[start:stop]
+			
+		
+		else:
+			
+			[mantissas, powers] = _PowerOfTen(figures[start:stop])
+			
+			values = numpy.empty((stop - start, 2), dtype = object)
+			
+			values[:, 0] = mantissas
+			values[:, 1] = powers
+			
+		
+		#-
+		
+		[nb_full_lines, nb_figures_in_last_line] = divmod(stop - start, nb_columns)
+		
+		lines_format = line_formats[nb_columns] * nb_full_lines
+		
+		if nb_figures_in_last_line > 0:
+			
+			lines_format += line_formats[nb_figures_in_last_line]
+			
+		
+		yield lines_format%tuple(values.ravel().tolist())
+		
+	
+
+def _GetAmshElementGroups( element_dimension, offsets, element_types ):
+	"""
+	Classifies in one pass elements of a given dimension according to their number of nodes and gives, for each AMSH element type of a list present among them, the type, the number of nodes and the indexes of its elements (kept in their original order). Elements of other types are left out.
+	"""
+	
+	nb_nodes_in_elements = numpy.diff(offsets)
+	
+	nb_types = len(element_types)
+	
+	# Rank the elements by type
+	
+	type_ranks = numpy.full(9, nb_types, dtype = numpy.int64)
+	
+	type_nb_nodes = {}
+	
+	for (dimension, nb_nodes), (su2_type, amsh_type) in element_type_codes.items():
+		
+		if dimension == element_dimension and amsh_type in element_types:
+			
+			type_ranks[nb_nodes] = element_types.index(amsh_type)
+			
+			type_nb_nodes[amsh_type] = nb_nodes
+			
+		
+	
+	ranks = numpy.where(nb_nodes_in_elements < 9, type_ranks[numpy.minimum(nb_nodes_in_elements, 8)], nb_types)
+	
+	#-
+	
+	# Split the elements sorted by rank
+	
+	element_order = numpy.argsort(ranks, kind = "stable")
+	
+	counts = numpy.bincount(ranks, minlength = nb_types + 1)
+	
+	starts = numpy.concatenate(([0], numpy.cumsum(counts)))
+	
+	element_groups = []
+	
+	for rank in range(nb_types):
+		
+		if counts[rank] > 0:
+			
+			element_groups.append((element_types[rank], type_nb_nodes[element_types[rank]], element_order[starts[rank]:starts[rank + 1]]))
+			
+		
+	
+	#-
+	
+	return element_groups
+	
+
+def _GetElementNodes( offsets, connectivity, indexes, nb_nodes ):
+	"""
+	Gives as an array of nb_nodes columns the node indexes of elements having the same number of nodes.
+	"""
+	
+	return connectivity[offsets[indexes][:, None] + numpy.arange(nb_nodes)]
+	
+
+def _WriteAmshFile( file, mesh_arrays, help = False, monitor = None ):
+	"""
+	Writes the arrays returned by GetMeshArrays into an AMSH file of a given name without extension and, if help is True, into a help file giving the Salome IDs of the written nodes and elements. The element counts of the help file are taken from the "counts" entry of the arrays if present (numbers of nodes, edges, triangles, quadrangles, tetrahedrons, pyramids, prisms and hexahedrons of the mesh), else from the arrays. If monitor is different from None, the writing phases are recorded into it.
+	"""
+	
+	mesh_name = mesh_arrays["name"]
+	
+	mesh_dimension = mesh_arrays["dimension"]
+	
+	coordinates = mesh_arrays["coordinates"]
+	
+	node_ids = mesh_arrays["node_ids"]
+	
+	groups = mesh_arrays["groups"]
+	
+	nb_groups = len(groups)
+	
+	# Classify the elements
+	
+	_SwitchPhase(monitor, "classification")
+	
+	if mesh_dimension == 2:
+		
+		domain_types = ["quad4", "tria3"]
+		
+		boundary_types = ["bar2"]
+		
+	
+	elif mesh_dimension == 3:
+		
+		domain_types = ["hexa8", "penta6", "penta5", "tetra4"]
+		
+		boundary_types = ["tria3", "quad4"]
+		
+	
+	domain_element_groups = _GetAmshElementGroups(mesh_dimension, mesh_arrays["offsets"], domain_types)
+	
+	boundary_element_groups = [_GetAmshElementGroups(mesh_dimension - 1, group["offsets"], boundary_types) for group in groups]
+	
+	#-
+	
+	# Open the amsh file
+	
+	_SwitchPhase(monitor, "io")
+	
+	date = time.asctime(time.localtime())
+	
+	amsh_file = open("%s.amsh"%(file), "w")
+	
+	amsh_file.write("unstr_grid_data N 0 0 2\n")
+	amsh_file.write(" title L 1 1 0\n")
+	amsh_file.write(" '%s exported from Salome on %s'\n"%(mesh_name, date))
+	
+	#-
+	
+	# Open the help file
+	
+	if help == True:
+		
+		if "counts" in mesh_arrays:
+			
+			counts = mesh_arrays["counts"]
+			
+		
+		else:
+			
+			type_counts = {}
+			
+			for element_type, nb_nodes, indexes in domain_element_groups:
+				
+				type_counts[element_type] = len(indexes)
+				
+			
+			for group, element_groups in zip(groups, boundary_element_groups):
+				
+				for element_type, nb_nodes, indexes in element_groups:
+					
+					type_counts[element_type] = type_counts.get(element_type, 0) + len(indexes)
+					
+				
+			
+			counts = [len(coordinates)] + [type_counts.get(element_type, 0) for element_type in ["bar2", "tria3", "quad4", "tetra4", "penta5", "penta6", "hexa8"]]
+			
+		
+		mesh_file = open("%s.help"%(file), "w")
+		
+		mesh_file.write("%s\n"%(date))
+		mesh_file.write("'%s'	'%s'\n"%(mesh_name, file))
+		mesh_file.write("NODES	EDGES	TRIA	QUAD	TETRA	PYRA	PRISM	HEXA\n")
+		mesh_file.write("%i	%i	%i	%i	%i	%i	%i	%i\n"%tuple(counts))
+		
+		for group in groups:
+			
+			mesh_file.write("'%s'	"%(group["name"]))
+			
+		
+		mesh_file.write("\n")
+		
+		mesh_file.write("NODES\nID	X	Y	Z\n")
+		
+	
+	#-
+	
+	# Write the node coordinates
+	
+	amsh_file.write(" region N 0 0 %i\n"%(2 + nb_groups + len(domain_element_groups)))
+	amsh_file.write(" region_name L 1 1 0\n")
+	amsh_file.write(" 'volume_elements'\n")
+	amsh_file.write(" coordinates DF %i %i 0\n"%(mesh_dimension, len(coordinates)))
+	
+	print("[i] Writing node coordinates... (%s nodes)"%(len(coordinates)))
+	
+	if help == True:
+		
+		_WriteMonitoredLines(mesh_file, _FormatRows(numpy.column_stack((node_ids, coordinates)), "%i\t%f\t%f\t%f\n"), monitor)
+		
+	
+	_WriteMonitoredLines(amsh_file, _FormatAmshColumns(coordinates[:, :mesh_dimension].T.ravel(), mesh_dimension, 18), monitor)
+	
+	#-
+	
+	# Write the group element definitions
+	
+	print("[i] Writing definition of group elements... (%s groups)"%(nb_groups))
+	
+	if help == True:
+		
+		mesh_file.write("GROUPS\n")
+		
+	
+	for group, element_groups in zip(groups, boundary_element_groups):
+		
+		_SwitchPhase(monitor, "io")
+		
+		amsh_file.write(" boundary N 0 0 %i\n"%(len(element_groups) + 1))
+		amsh_file.write(" boundary_name L 1 1 0\n")
+		amsh_file.write(" '%s'\n"%(group["name"]))
+		
+		if help == True:
+			
+			mesh_file.write("'%s'\n"%(group["name"]))
+			
+		
+		for element_type, nb_nodes, indexes in element_groups:
+			
+			_SwitchPhase(monitor, "io")
+			
+			amsh_file.write(" belem_group N 0 0 2\n")
+			amsh_file.write(" bound_elem_type L 1 1 0\n")
+			amsh_file.write(" '%s'\n"%(element_type))
+			amsh_file.write(" bound_elem_nodes IF %i %i 0\n"%(nb_nodes, len(indexes)))
+			
+			element_nodes = _GetElementNodes(group["offsets"], group["connectivity"], indexes, nb_nodes)
+			
+			if help == True:
+				
+				mesh_file.write("%s\n"%({"bar2": "EDGES", "tria3": "TRIA", "quad4": "QUAD"}[element_type]))
+				mesh_file.write("N	ID	NODE1	NODE2	...\n")
+				
+				_WriteMonitoredLines(mesh_file, _FormatRows(numpy.column_stack((numpy.arange(1, len(indexes) + 1), group["element_ids"][indexes], node_ids[element_nodes])), "%i\t%i\t" + "%i\t" * nb_nodes + "\n"), monitor)
+				
+			
+			_WriteMonitoredLines(amsh_file, _FormatAmshColumns(element_nodes.T.ravel() + 1, nb_nodes, 30), monitor)
+			
+		
+	
+	#-
+	
+	# Write the domain element definitions
+	
+	print("[i] Writing definition of domain elements... (%s elements)"%(len(mesh_arrays["element_ids"])))
+	
+	if help == True:
+		
+		mesh_file.write("DOMAIN CELLS\n")
+		
+	
+	for element_type, nb_nodes, indexes in domain_element_groups:
+		
+		_SwitchPhase(monitor, "io")
+		
+		amsh_file.write(" element_group N 0 0 2\n")
+		amsh_file.write(" element_type L 1 1 0\n")
+		amsh_file.write(" '%s'\n"%(element_type))
+		amsh_file.write(" element_nodes IF %i %i 0\n"%(nb_nodes, len(indexes)))
+		
+		element_nodes = _GetElementNodes(mesh_arrays["offsets"], mesh_arrays["connectivity"], indexes, nb_nodes)
+		
+		if help == True:
+			
+			mesh_file.write("%s\n"%({"quad4": "QUAD", "tria3": "TRIA", "hexa8": "HEXA", "penta6": "PRISM", "penta5": "PENTA", "tetra4": "TETRA"}[element_type]))
+			mesh_file.write("N	ID	NODE1	NODE2	...\n")
+			
+			_WriteMonitoredLines(mesh_file, _FormatRows(numpy.column_stack((numpy.arange(1, len(indexes) + 1), mesh_arrays["element_ids"][indexes], node_ids[element_nodes])), "%i\t%i\t" + "%i\t" * nb_nodes + "\n"), monitor)
+			
+		
+		# Reorder the nodes of the volume elements
+		
+		if element_type in amsh_node_orders:
+			
+			element_nodes = element_nodes[:, amsh_node_orders[element_type]]
+			
+		
+		#-
+		
+		_WriteMonitoredLines(amsh_file, _FormatAmshColumns(element_nodes.T.ravel() + 1, nb_nodes, 24), monitor)
+		
+	
+	#-
+	
+	# Close the files
+	
+	_SwitchPhase(monitor, "io")
+	
+	amsh_file.close()
+	
+	if help == True:
+		
+		mesh_file.close()
+		
+	
+	#-
+	
+
+def _GetSU2Sections( mesh_arrays, axes, chunk_size = 100000 ):
+	"""
+	Yields the name, the progress message, the content arrays and the lines of each section of an SU2 file. The content arrays are None if the section is written lazily.
+	"""
+	
+	yield "NDIME", None, [numpy.array([mesh_arrays["dimension"]])], ["NDIME= %i\n"%(mesh_arrays["dimension"])]
+	
+	# Get the domain element definitions
+	
+	nb_elements_in_domain = len(mesh_arrays["element_ids"])
+	
+	message = "[i] Writing definition of domain elements... (%s elements)"%(nb_elements_in_domain)
+	
+	arrays = [mesh_arrays["types"], mesh_arrays["offsets"], mesh_arrays["connectivity"], mesh_arrays["element_ids"]]
+	
+	lines = itertools.chain(["NELEM= %i\n"%(nb_elements_in_domain)], _FormatSU2Elements(*arrays, chunk_size = chunk_size))
+	
+	yield "NELEM", message, arrays, lines
+	
+	#-
+	
+	# Get the node coordinates
+	
+	nb_nodes_in_mesh = len(mesh_arrays["coordinates"])
+	
+	message = "[i] Writing node coordinates... (%s nodes)"%(nb_nodes_in_mesh)
+	
+	arrays = [numpy.array(axes), mesh_arrays["coordinates"]]
+	
+	lines = itertools.chain(["NPOIN= %i\n"%(nb_nodes_in_mesh)], _FormatSU2Coordinates(mesh_arrays["coordinates"], axes, chunk_size))
+	
+	yield "NPOIN", message, arrays, lines
+	
+	#-
+	
+	# Get the group element definitions
+	
+	groups = mesh_arrays["groups"]
+	
+	message = "[i] Writing definition of group elements... (%s groups)"%(len(groups))
+	
+	yield "NMARK", message, [numpy.array([len(groups)])], ["NMARK= %i\n"%(len(groups))]
+	
+	for group in groups:# For each group of the mesh
+		
+		# Get the group elements batch after batch if they are extracted lazily
+		
+		if "batches" in group:
+			
+			batches = group["batches"]
+			
+			arrays = None
+			
+		
+		else:
+			
+			batches = [group]
+			
+			arrays = [group["types"], group["offsets"], group["connectivity"], group["element_ids"]]
+			
+		
+		#-
+		
+		lines = itertools.chain(["MARKER_TAG= %s\n"%(group["name"]), "MARKER_ELEMS= %s\n"%(group["size"])], itertools.chain.from_iterable(_FormatSU2Elements(batch["types"], batch["offsets"], batch["connectivity"], batch["element_ids"], chunk_size) for batch in batches))
+		
+		yield "MARKER_TAG= %s"%(group["name"]), None, arrays, lines
+		
+	
+	#-
+	
+
+def _HashArrays( name, arrays ):
+	"""
+	Gives the hash of the content of a list of arrays.
+	"""
+	
+	content_hash = hashlib.sha1(name.encode())
+	
+	for array in arrays:
+		
+		array = numpy.ascontiguousarray(array)
+		
+		content_hash.update(("%s%s"%(array.dtype, array.shape)).encode())
+		
+		content_hash.update(array.data)
+		
+	
+	return content_hash.hexdigest()
+	
+
+def _WriteSU2Blocks( su2_file, mesh_arrays, axes, chunk_size = 100000, previous = None, monitor = None ):
+	"""
+	Writes the NDIME, NELEM, NPOIN and NMARK blocks of a mesh into an opened SU2 file. If previous is different from None, hashes the sections, copies the unchanged ones from the previous file and returns the written sections. If monitor is different from None, the formatting and writing times are recorded into it.
+	"""
+	
+	if previous != None:
+		
+		sections = []
+		
+		reusable_sections = {}
+		
+		for name, content_hash, start, length in previous["sections"]:
+			
+			reusable_sections[(name, content_hash)] = (start, length)
+			
+		
+		if previous["file"] != None:
+			
+			previous_su2_file = open(previous["file"], "rb")
+			
+		
+	
+	for name, message, arrays, lines in _GetSU2Sections(mesh_arrays, axes, chunk_size):
+		
+		if previous == None:
+			
+			if message != None: print(message)
+			
+			_WriteMonitoredLines(su2_file, lines, monitor)
+			
+			continue
+			
+		
+		# Copy the section from the previous file if its content did not change
+		
+		if arrays != None:
+			
+			_SwitchPhase(monitor, "hashing")
+			
+			content_hash = _HashArrays(name, arrays)
+			
+		
+		else:
+			
+			content_hash = None
+			
+		
+		start = su2_file.tell()
+		
+		if content_hash != None and (name, content_hash) in reusable_sections and previous["file"] != None:
+			
+			[previous_start, length] = reusable_sections[(name, content_hash)]
+			
+			print("[i] Reusing unchanged section %s... (%i bytes)"%(name, length))
+			
+			_SwitchPhase(monitor, "io")
+			
+			su2_file.flush()
+			
+			previous_su2_file.seek(previous_start)
+			
+			while length > 0:
+				
+				block = previous_su2_file.read(min(length, 2**24))
+				
+				su2_file.buffer.write(block)
+				
+				length -= len(block)
+				
+			
+		
+		else:
+			
+			if message != None: print(message)
+			
+			_WriteMonitoredLines(su2_file, lines, monitor)
+			
+		
+		#-
+		
+		sections.append((name, content_hash, start, su2_file.tell() - start))
+		
+	
+	if previous != None:
+		
+		if previous["file"] != None:
+			
+			previous_su2_file.close()
+			
+		
+		return sections
+		
+	
+
+def _GetSU2FileName( file, compress = None ):
+	"""
+	Gives the name of the SU2 file of a given name without extension, compressed or not.
+	"""
+	
+	return file + {"gzip": ".su2.gz", "zstd": ".su2.zst"}.get(compress, ".su2")
+	
+
+def _OpenSU2File( file, compress = None, suffix = "" ):
+	"""
+	Opens for writing the SU2 file of a given name without extension, compressed or not, the suffix being added to the name of the file. Returns None if the compression is not available.
+	"""
+	
+	file_name = _GetSU2FileName(file, compress) + suffix
+	
+	if compress == None:
+		
+		return open(file_name, "w")
+		
+	
+	elif compress == "gzip":
+		
+		return gzip.open(file_name, "wt", compresslevel = 6)
+		
+	
+	elif compress == "zstd":
+		
+		try:
+			import zstandard
+		except ImportError:
+			print("[X] The zstandard module is required to write zstd compressed files."); return None
+		
+		return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(file_name, "wb")))
+		
+	
+	else:
+		
+		print("[X] The compression", compress, "is not supported. Use None, \"gzip\" or \"zstd\"."); return None
+		
+	
+
+def _WriteSU2File( file, mesh_arrays, compress = None, incremental = False, monitor = None ):
+	"""
+	Writes the arrays returned by _GetSU2Arrays into an SU2 file of a given name without extension. If incremental is True, only the sections which changed since the previous export are rewritten. If monitor is different from None, the writing phases are recorded into it. The file is written beside the previous one and only replaces it once complete. Returns the name of the written file, or None if the file could not be written.
+	"""
+	
+	if incremental == True and compress != None:
+		
+		print("[X] The incremental export cannot be used with a compressed file."); return
+		
+	
+	if incremental == False:
+		
+		su2_file_name = _GetSU2FileName(file, compress)
+		
+		su2_file = _OpenSU2File(file, compress, ".tmp")
+		
+		if su2_file == None: return
+		
+		_WriteSU2Blocks(su2_file, mesh_arrays, mesh_arrays["axes"], monitor = monitor)
+		
+		su2_file.close()
+		
+		if _CheckSU2Groups(mesh_arrays, "%s.tmp"%(su2_file_name)) == None: return
+		
+		os.replace("%s.tmp"%(su2_file_name), su2_file_name)
+		
+	
+	else:
+		
+		su2_file_name = _WriteSU2FileIncrementally(file, mesh_arrays, monitor)
+		
+		if su2_file_name == None: return
+		
+	
+	# Write the element partitions
+	
+	if "partitions" in mesh_arrays:
+		
+		_SwitchPhase(monitor, "io")
+		
+		partition_file = open("%s.su2.epart.%i"%(file, mesh_arrays["nb_parts"]), "w")
+		
+		for start in range(0, len(mesh_arrays["partitions"]), 100000):
+			
+			partitions = mesh_arrays["partitions"][start:start + 100000]
+			
+			partition_file.write(("%i\n" * len(partitions))%tuple(partitions.tolist()))
+			
+		
+		partition_file.close()
+		
+	
+	#-
+	
+	return su2_file_name
+	
+
+def _CheckSU2Groups( mesh_arrays, temporary_file_name ):
+	"""
+	Checks that all the group elements extracted lazily were supported by the SU2 format once the file was written, the temporary file being deleted otherwise. Returns None if some group elements were not written.
+	"""
+	
+	if len(mesh_arrays.get("unsupported_groups", [])) > 0:
+		
+		os.remove(temporary_file_name)
+		
+		print("[X] The groups", mesh_arrays["unsupported_groups"], "contain elements which are not supported by the SU2 format. No file was written."); return
+		
+	
+	return True
+	
+
+def _GetSU2WriterArrays( mesh_arrays ):
+	"""
+	Gives the part of the arrays returned by _GetSU2Arrays which is read by the _WriteSU2File function, for example to send them to another process.
+	"""
+	
+	writer_arrays = {}
+	
+	for key in ["dimension", "element_ids", "types", "offsets", "connectivity", "coordinates", "axes", "partitions", "nb_parts", "unsupported_groups"]:
+		
+		if key in mesh_arrays:
+			
+			writer_arrays[key] = mesh_arrays[key]
+			
+		
+	
+	writer_arrays["groups"] = []
+	
+	for group in mesh_arrays["groups"]:
+		
+		writer_group = {}
+		
+		for key in ["name", "size", "element_ids", "types", "offsets", "connectivity", "batches"]:
+			
+			if key in group:
+				
+				writer_group[key] = group[key]
+				
+			
+		
+		writer_arrays["groups"].append(writer_group)
+		
+	
+	return writer_arrays
+	
+
+def _WriteSU2FileIncrementally( file, mesh_arrays, monitor = None ):
+	"""
+	Writes the arrays returned by _GetSU2Arrays into an uncompressed SU2 file, rewriting only the sections which changed since the previous export. Returns the name of the written file, or None if the file could not be written.
+	"""
+	
+	su2_file_name = "%s.su2"%(file)
+	
+	hash_file_name = "%s.su2.hash"%(file)
+	
+	# Get the sections of the previous export
+	
+	previous = {"file": None, "sections": []}
+	
+	if os.path.isfile(su2_file_name) and os.path.isfile(hash_file_name):
+		
+		hash_file = open(hash_file_name, "r")
+		
+		try:
+			previous_export = ast.literal_eval(hash_file.read())
+		except:
+			previous_export = None
+		
+		hash_file.close()
+		
+		# Check the previous file was not modified since
+		
+		if previous_export != None and previous_export["size"] == os.path.getsize(su2_file_name) and previous_export["time"] == os.path.getmtime(su2_file_name):
+			
+			previous = {"file": su2_file_name, "sections": previous_export["sections"]}
+			
+		
+		#-
+		
+	
+	#-
+	
+	# Write the new file beside the previous one
+	
+	su2_file = open("%s.tmp"%(su2_file_name), "w")
+	
+	sections = _WriteSU2Blocks(su2_file, mesh_arrays, mesh_arrays["axes"], previous = previous, monitor = monitor)
+	
+	su2_file.close()
+	
+	if _CheckSU2Groups(mesh_arrays, "%s.tmp"%(su2_file_name)) == None: return
+	
+	os.replace("%s.tmp"%(su2_file_name), su2_file_name)
+	
+	#-
+	
+	# Write the section hashes
+	
+	hash_file = open(hash_file_name, "w")
+	
+	hash_file.write(repr({"size": os.path.getsize(su2_file_name), "time": os.path.getmtime(su2_file_name), "sections": sections}))
+	
+	hash_file.close()
+	
+	#-
+	
+	return su2_file_name
+	
+
+def _GetPlanarAxes( coordinates, tol = 1e-7 ):
+	"""
+	Gives the two sorted coordinate axes in which a set of nodes extends. Returns None if the nodes are not in a plane parallel to the XY, XZ or YZ plane.
+	"""
+	
+	if len(coordinates) == 0:
+		
+		print("[X] The mesh has no node."); return
+		
+	
+	# Get the mesh extent along each axis
+	
+	extents = coordinates.max(axis = 0) - coordinates.min(axis = 0)
+	
+	#-
+	
+	# Keep the two axes of largest extent
+	
+	axes = numpy.argsort(extents, kind = "stable")
+	
+	if extents[axes[0]] > tol:
+		
+		print("[X] The mesh is not planar (minimum extent: %g)."%(extents[axes[0]])); return
+		
+	
+	return sorted(axes[1:].tolist())
+	
+	#-
+	
+
+def _PrepareSU2Arrays( mesh_arrays, tol = 1e-7, part = None, renumber = None, monitor = None ):
+	"""
+	Completes mesh arrays with the SU2 element "types", the coordinate "axes" to write and, if part is different from None, the element "partitions" and their number "nb_parts". If renumber is different from None, the arrays are reordered to reduce the bandwidth before being partitioned. If monitor is different from None, the classification and ordering times are recorded into it. Returns None if the mesh cannot be exported.
+	"""
+	
+	def GetTypedBatches(group_name, batches):
+		
+		for batch in batches:
+			
+			batch["types"] = _GetElementTypes(mesh_dimension, numpy.diff(batch["offsets"]), boundary = True)
+			
+			if (batch["types"] == 0).any():
+				
+				mesh_arrays["unsupported_groups"].append(group_name); return
+				
+			
+			yield batch
+			
+		
+	
+	mesh_dimension = mesh_arrays["dimension"]
+	
+	groups = mesh_arrays["groups"]
+	
+	# Get the element types
+	
+	_SwitchPhase(monitor, "classification")
+	
+	mesh_arrays["types"] = _GetElementTypes(mesh_dimension, numpy.diff(mesh_arrays["offsets"]))
+	
+	mesh_arrays["unsupported_groups"] = []
+	
+	for group in groups:
+		
+		if group["type"] != ["EDGE", "FACE"][mesh_dimension - 2]:
+			
+			print("[X] The group", group["name"], "contains", group["type"], "elements, which are not boundary elements of a %iD mesh."%(mesh_dimension)); return
+			
+		
+		if "batches" in group:
+			
+			group["batches"] = GetTypedBatches(group["name"], group["batches"])
+			
+		
+		else:
+			
+			group["types"] = _GetElementTypes(mesh_dimension, numpy.diff(group["offsets"]), boundary = True)
+			
+		
+	
+	for element_types in [mesh_arrays["types"]] + [group["types"] for group in groups if "types" in group]:
+		
+		if (element_types == 0).any():
+			
+			print("[X] The mesh contains elements which are not supported by the SU2 format."); return
+			
+		
+	
+	#-
+	
+	# Get the coordinate axes to write
+	
+	if mesh_dimension == 2:
+		
+		axes = _GetPlanarAxes(mesh_arrays["coordinates"], tol)
+		
+		if axes == None: return
+		
+	
+	elif mesh_dimension == 3:
+		
+		axes = list(range(mesh_dimension))
+		
+	
+	mesh_arrays["axes"] = axes
+	
+	#-
+	
+	# Reduce the bandwidth
+	
+	_SwitchPhase(monitor, "ordering")
+	
+	if renumber != None:
+		
+		print("[i] Renumbering the mesh... (%s)"%(renumber))
+		
+		if _ReorderMeshArrays(mesh_arrays, renumber) == None: return
+		
+	
+	#-
+	
+	# Partition the domain elements and make the partitions contiguous
+	
+	if part != None:
+		
+		print("[i] Partitioning the domain elements... (%i parts)"%(part))
+		
+		centroids = _GetElementCentroids(mesh_arrays["coordinates"], mesh_arrays["offsets"], mesh_arrays["connectivity"])
+		
+		mesh_arrays["partitions"] = _PartitionElements(centroids, part)
+		
+		mesh_arrays["nb_parts"] = part
+		
+		_RenumberMeshArrays(mesh_arrays, numpy.argsort(mesh_arrays["partitions"], kind = "stable"))
+		
+	
+	#-
+	
+	return mesh_arrays
+	
+
+# Faces of the volume elements for the polyMesh format
+# (number of nodes: SMESH nodes of each face, triangles being completed with -1)
+
+polymesh_cell_faces = {
+	4: [[0, 1, 2, -1], [0, 1, 3, -1], [1, 2, 3, -1], [0, 2, 3, -1]],
+	5: [[0, 1, 2, 3], [0, 1, 4, -1], [1, 2, 4, -1], [2, 3, 4, -1], [3, 0, 4, -1]],
+	6: [[0, 1, 2, -1], [3, 4, 5, -1], [0, 1, 4, 3], [1, 2, 5, 4], [2, 0, 3, 5]],
+	8: [[0, 1, 2, 3], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]]
+	}
+
+def _GetCellFaces( coordinates, offsets, connectivity, chunk_size = 100000 ):
+	"""
+	Gives the faces of volume elements as an array of four node indexes per face (the fourth one being -1 for triangles), each face being oriented so that its normal points out of its element, and the element index of each face. The faces are oriented chunk_size elements at a time. Returns None if some elements are not tetrahedrons, pyramids, prisms or hexahedrons.
+	"""
+	
+	nb_nodes_in_cells = numpy.diff(offsets)
+	
+	if not numpy.isin(nb_nodes_in_cells, list(polymesh_cell_faces)).all():
+		
+		print("[X] The mesh contains volume elements which are not tetrahedrons, pyramids, prisms or hexahedrons."); return
+		
+	
+	nb_faces = sum(numpy.count_nonzero(nb_nodes_in_cells == nb_nodes) * len(local_faces) for nb_nodes, local_faces in polymesh_cell_faces.items())
+	
+	faces = numpy.zeros((nb_faces, 4), dtype = connectivity.dtype)
+	face_cells = numpy.zeros(nb_faces, dtype = numpy.int64)
+	
+	first_face = 0
+	
+	for nb_nodes, local_faces in polymesh_cell_faces.items():
+		
+		cells = numpy.flatnonzero(nb_nodes_in_cells == nb_nodes)
+		
+		local_faces = numpy.array(local_faces)
+		
+		triangles = local_faces[:, 3] < 0
+		
+		for start in range(0, len(cells), chunk_size):
+			
+			chunk_cells = cells[start:start + chunk_size]
+			
+			cell_nodes = _GetElementNodes(offsets, connectivity, chunk_cells, nb_nodes)
+			
+			# Get the faces, the missing node of triangles being replaced by their first node
+			
+			cell_faces = cell_nodes[:, numpy.where(local_faces >= 0, local_faces, local_faces[:, :1])]
+			
+			#-
+			
+			# Orient the faces outwards
+			
+			points = coordinates[cell_faces]
+			
+			normals = numpy.cross(points[:, :, 2] - points[:, :, 0], points[:, :, 3] - points[:, :, 1])
+			
+			outwards = points.mean(axis = 2) - coordinates[cell_nodes].mean(axis = 1)[:, None]
+			
+			inward_faces = (normals * outwards).sum(axis = 2) < 0
+			
+			del points, normals, outwards
+			
+			cell_faces[:, triangles, 3] = -1
+			
+			reversed_faces = numpy.where(triangles[:, None], cell_faces[:, :, [0, 2, 1, 3]], cell_faces[:, :, [0, 3, 2, 1]])
+			
+			cell_faces = numpy.where(inward_faces[:, :, None], reversed_faces, cell_faces)
+			
+			#-
+			
+			last_face = first_face + len(chunk_cells) * len(local_faces)
+			
+			faces[first_face:last_face] = cell_faces.reshape(-1, 4)
+			face_cells[first_face:last_face] = numpy.repeat(chunk_cells, len(local_faces))
+			
+			first_face = last_face
+			
+		
+	
+	return [faces, face_cells]
+	
+
+def _SortFaces( faces ):
+	"""
+	Sorts faces given as in the _GetCellFaces function so that identical faces, whatever their node order, are contiguous. The faces are sorted by a hash of their sorted nodes, and by the sorted nodes themselves if two different faces have the same hash. Returns the face order and the index of the first sorted face of each set of identical faces.
+	"""
+	
+	keys = numpy.sort(faces, axis = 1)
+	
+	# Hash the sorted nodes
+	
+	hashes = numpy.full(len(faces), 14695981039346656037, dtype = numpy.uint64)
+	
+	for column in keys.T:
+		
+		hashes = (hashes ^ (column + 1).astype(numpy.uint64)) * numpy.uint64(1099511628211)
+		
+	
+	#-
+	
+	order = numpy.argsort(hashes, kind = "stable")
+	
+	sorted_hashes = hashes[order]
+	
+	sorted_keys = keys[order]
+	
+	new_faces = numpy.ones(len(faces), dtype = bool)
+	
+	new_faces[1:] = sorted_hashes[1:] != sorted_hashes[:-1]
+	
+	# Sort by the nodes in case of hash collisions
+	
+	if (new_faces[1:] == False).any() and (sorted_keys[1:][new_faces[1:] == False] != sorted_keys[:-1][new_faces[1:] == False]).any():
+		
+		order = numpy.lexsort(keys.T[::-1])
+		
+		sorted_keys = keys[order]
+		
+		new_faces[1:] = (sorted_keys[1:] != sorted_keys[:-1]).any(axis = 1)
+		
+	
+	#-
+	
+	return [order, numpy.flatnonzero(new_faces)]
+	
+
+def _GetPolyMeshArrays( mesh_arrays, monitor = None ):
+	"""
+	Builds from the arrays returned by GetMeshArrays the faces (as in the _GetCellFaces function), owners, neighbours and patches of an OpenFOAM polyMesh. The internal faces come first, sorted by owner and neighbour, followed by the boundary faces of each patch. The patches are the face groups of the mesh, the boundary faces belonging to no group being put into a last "defaultFaces" patch. Returns None if the mesh cannot be converted.
+	"""
+	
+	if mesh_arrays["dimension"] != 3:
+		
+		print("[X] Only 3D meshes can be written into the polyMesh format."); return
+		
+	
+	# Match the faces of the cells
+	
+	_SwitchPhase(monitor, "classification")
+	
+	cell_faces = _GetCellFaces(mesh_arrays["coordinates"], mesh_arrays["offsets"], mesh_arrays["connectivity"])
+	
+	if cell_faces == None: return
+	
+	[faces, face_cells] = cell_faces
+	
+	[order, starts] = _SortFaces(faces)
+	
+	nb_shares = numpy.diff(numpy.append(starts, len(faces)))
+	
+	if (nb_shares > 2).any():
+		
+		print("[X] %i faces are shared by more than two cells."%((nb_shares > 2).sum())); return
+		
+	
+	#-
+	
+	# Get the internal faces
+	
+	first_faces = order[starts[nb_shares == 2]]
+	second_faces = order[starts[nb_shares == 2] + 1]
+	
+	owner_faces = numpy.where(face_cells[first_faces] < face_cells[second_faces], first_faces, second_faces)
+	neighbour_faces = numpy.where(face_cells[first_faces] < face_cells[second_faces], second_faces, first_faces)
+	
+	internal_order = numpy.lexsort((face_cells[neighbour_faces], face_cells[owner_faces]))
+	
+	owner_faces = owner_faces[internal_order]
+	neighbour_faces = neighbour_faces[internal_order]
+	
+	#-
+	
+	# Sort the boundary faces by patch
+	
+	boundary_faces = order[starts[nb_shares == 1]]
+	
+	boundary_patches = numpy.full(len(boundary_faces), -1)
+	
+	patch_names = []
+	
+	for group in mesh_arrays["groups"]:
+		
+		if group["type"] != "FACE": continue
+		
+		if "batches" in group:
+			
+			batches = list(group["batches"])
+			
+		
+		else:
+			
+			batches = [group]
+			
+		
+		group_faces = [_GetElementNodes(batch["offsets"], batch["connectivity"], numpy.flatnonzero(numpy.diff(batch["offsets"]) == nb_nodes), nb_nodes) for batch in batches for nb_nodes in [3, 4]]
+		
+		if len(group_faces) == 0: continue
+		
+		group_faces = numpy.concatenate([numpy.pad(nodes, ((0, 0), (0, 4 - nodes.shape[1])), constant_values = -1) for nodes in group_faces])
+		
+		# Find the group faces among the boundary faces
+		
+		[group_order, group_starts] = _SortFaces(numpy.concatenate((faces[boundary_faces], group_faces)))
+		
+		new_face_sets = numpy.zeros(len(group_order), dtype = numpy.int64)
+		
+		new_face_sets[group_starts] = 1
+		
+		face_sets = numpy.cumsum(new_face_sets) - 1
+		
+		in_boundary = group_order < len(boundary_faces)
+		
+		boundary_face_of_sets = numpy.full(len(group_starts), -1)
+		
+		boundary_face_of_sets[face_sets[in_boundary]] = group_order[in_boundary]
+		
+		matched_faces = boundary_face_of_sets[face_sets[in_boundary == False]]
+		
+		if (matched_faces < 0).any():
+			
+			print("[i] %i faces of the group %s are not boundary faces and are ignored."%((matched_faces < 0).sum(), group["name"]))
+			
+		
+		matched_faces = matched_faces[matched_faces >= 0]
+		
+		#-
+		
+		boundary_patches[matched_faces[boundary_patches[matched_faces] < 0]] = len(patch_names)
+		
+		patch_names.append(group["name"])
+		
+	
+	if (boundary_patches < 0).any():
+		
+		boundary_patches[boundary_patches < 0] = len(patch_names)
+		
+		patch_names.append("defaultFaces")
+		
+	
+	boundary_order = numpy.argsort(boundary_patches, kind = "stable")
+	
+	boundary_faces = boundary_faces[boundary_order]
+	
+	nb_patch_faces = numpy.bincount(boundary_patches, minlength = len(patch_names))
+	
+	#-
+	
+	polymesh_faces = numpy.concatenate((faces[owner_faces], faces[boundary_faces]))
+	
+	patches = [{"name": name, "size": int(size), "start": int(start)} for name, size, start in zip(patch_names, nb_patch_faces, len(owner_faces) + numpy.cumsum(nb_patch_faces) - nb_patch_faces)]
+	
+	return {
+		"faces": polymesh_faces,
+		"owner": numpy.concatenate((face_cells[owner_faces], face_cells[boundary_faces])),
+		"neighbour": face_cells[neighbour_faces],
+		"patches": patches
+		}
+	
+
+def _WriteFoamFile( file, class_name, lists, binary = False, note = None, monitor = None ):
+	"""
+	Writes lists of labels or of vectors into an OpenFOAM file of a given path, in ASCII or in binary format (little-endian, 32-bit labels and 64-bit scalars). Each list is given as a one-dimensional array of labels or as an array of three columns of scalars.
+	"""
+	
+	_SwitchPhase(monitor, "io")
+	
+	foam_file = open(file, "wb")
+	
+	header_lines = [
+		"FoamFile\n",
+		"{\n",
+		"    version     2.0;\n",
+		"    format      %s;\n"%("binary" if binary == True else "ascii"),
+		"    arch        \"LSB;label=32;scalar=64\";\n",
+		"    class       %s;\n"%(class_name)]
+	
+	if note != None:
+		
+		header_lines.append("    note        \"%s\";\n"%(note))
+		
+	
+	header_lines += [
+		"    location    \"constant/polyMesh\";\n",
+		"    object      %s;\n"%(os.path.basename(file)),
+		"}\n",
+		"\n"]
+	
+	foam_file.write("".join(header_lines).encode())
+	
+	for values in lists:
+		
+		foam_file.write(("%i\n("%(len(values))).encode())
+		
+		if binary == True:
+			
+			_SwitchPhase(monitor, "formatting")
+			
+			data = numpy.ascontiguousarray(values, dtype = "<f8" if values.ndim == 2 else "<i4").tobytes()
+			
+			_SwitchPhase(monitor, "io")
+			
+			foam_file.write(data)
+			
+		
+		else:
+			
+			foam_file.write(b"\n")
+			
+			if values.ndim == 2:
+				
+				lines = _FormatRows(values, "(%.17g %.17g %.17g)\n")
+				
+			
+			else:
+				
+				lines = _FormatRows(values[:, None], "%i\n")
+				
+			
+			_WriteMonitoredLines(foam_file, (line.encode() for line in lines), monitor)
+			
+		
+		foam_file.write(b")\n\n")
+		
+	
+	foam_file.close()
+	
+
+def _WritePolyMesh( case_dir, mesh_arrays, binary = False, monitor = None ):
+	"""
+	Writes the arrays returned by GetMeshArrays into the points, faces, owner, neighbour and boundary files of the constant/polyMesh directory of an OpenFOAM case. The faces are written as a compact face list. If monitor is different from None, the writing phases are recorded into it. Returns None if the mesh cannot be converted.
+	"""
+	
+	polymesh_arrays = _GetPolyMeshArrays(mesh_arrays, monitor)
+	
+	if polymesh_arrays == None: return
+	
+	faces = polymesh_arrays["faces"]
+	
+	nb_points = len(mesh_arrays["coordinates"])
+	
+	nb_cells = len(mesh_arrays["element_ids"])
+	
+	nb_internal_faces = len(polymesh_arrays["neighbour"])
+	
+	note = "nPoints:%i  nCells:%i  nFaces:%i  nInternalFaces:%i"%(nb_points, nb_cells, len(faces), nb_internal_faces)
+	
+	# Create the polyMesh directory
+	
+	_SwitchPhase(monitor, "io")
+	
+	polymesh_dir = os.path.join(case_dir, "constant", "polyMesh")
+	
+	os.makedirs(polymesh_dir, exist_ok = True)
+	
+	#-
+	
+	# Write the points, faces, owner and neighbour files
+	
+	print("[i] Writing points... (%s points)"%(nb_points))
+	
+	_WriteFoamFile(os.path.join(polymesh_dir, "points"), "vectorField", [mesh_arrays["coordinates"]], binary, monitor = monitor)
+	
+	print("[i] Writing faces... (%s faces, %s internal faces)"%(len(faces), nb_internal_faces))
+	
+	face_offsets = numpy.concatenate(([0], numpy.cumsum((faces >= 0).sum(axis = 1))))
+	
+	_WriteFoamFile(os.path.join(polymesh_dir, "faces"), "faceCompactList", [face_offsets, faces[faces >= 0]], binary, monitor = monitor)
+	
+	_WriteFoamFile(os.path.join(polymesh_dir, "owner"), "labelList", [polymesh_arrays["owner"]], binary, note, monitor)
+	
+	_WriteFoamFile(os.path.join(polymesh_dir, "neighbour"), "labelList", [polymesh_arrays["neighbour"]], binary, note, monitor)
+	
+	#-
+	
+	# Write the boundary file
+	
+	print("[i] Writing boundary... (%s patches)"%(len(polymesh_arrays["patches"])))
+	
+	boundary_lines = [
+		"FoamFile\n",
+		"{\n",
+		"    version     2.0;\n",
+		"    format      ascii;\n",
+		"    class       polyBoundaryMesh;\n",
+		"    location    \"constant/polyMesh\";\n",
+		"    object      boundary;\n",
+		"}\n",
+		"\n",
+		"%i\n"%(len(polymesh_arrays["patches"])),
+		"(\n"]
+	
+	for patch in polymesh_arrays["patches"]:
+		
+		boundary_lines += [
+			"    %s\n"%(patch["name"]),
+			"    {\n",
+			"        type            patch;\n",
+			"        nFaces          %i;\n"%(patch["size"]),
+			"        startFace       %i;\n"%(patch["start"]),
+			"    }\n"]
+		
+	
+	boundary_lines.append(")\n")
+	
+	boundary_file = open(os.path.join(polymesh_dir, "boundary"), "w")
+	
+	boundary_file.write("".join(boundary_lines))
+	
+	boundary_file.close()
+	
+	#-
+	
+	return polymesh_arrays
+	
+
+#### - ####
+
+#### Here are cfdmsh functions ####
+
+def WriteAmshFile( mesh_arrays, file = None, help = False, renumber = None, callback = None, log = None ):
+	"""
+	
+	
+Description:
+	Writes mesh arrays into an .amsh file readable by the CFD solver Edge 5.0.0, without needing a Salome session.
+	
+
+Arguments:
+	# mesh_arrays 
+		Description:       The arrays of the mesh to write, as returned by the GetMeshArrays function, or the name without extension of a mesh snapshot saved by this function. 
+		Type:              Dictionary or String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     -  
+
+	# file 
+		Description:       The name without extension of the amsh file to write. If equals None, the name of the mesh is taken. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# help 
+		Description:       Activates the generation of a help file giving relation between Edge and Salome node IDs. 
+		Type:              Boolean 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     False  
+
+	# renumber 
+		Description:       If different from None, the renumbering applied to reduce the bandwidth of the mesh (see the ExportSU2File function). 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# callback 
+		Description:       If different from None, a function called at the end of the export with the export report (see the ExportAmshFile function). 
+		Type:              Function 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# log 
+		Description:       If different from None, the name of a file to which the export report is appended as a JSON line. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+Returned Values:
+	"dim" value:    - 
+	"single" value: - 
+	Type:           - 
+	Number:         - 
+	Name:           -  
+
+Conditions of use:
+	The mesh arrays have to contain the "name", "dimension", "node_ids", "coordinates", "element_ids", "offsets", "connectivity" and "groups" entries described in the GetMeshArrays function. The given arrays are not modified.
+	
+
+"""
+	
+	monitor = _StartMonitor("WriteAmshFile", callback, log)
+	
+	# Get the mesh arrays
+	
+	_SwitchPhase(monitor, "extraction")
+	
+	if isinstance(mesh_arrays, str):
+		
+		snapshot = mesh_arrays
+		
+		mesh_arrays = _LoadMeshSnapshot(snapshot)
+		
+		if mesh_arrays == None:
+			
+			print("[X] The mesh snapshot %s.npz does not exist."%(snapshot)); return
+			
+		
+	
+	else:
+		
+		mesh_arrays = dict(mesh_arrays)
+		
+		mesh_arrays["groups"] = [dict(group) for group in mesh_arrays["groups"]]
+		
+	
+	#-
+	
+	# Reduce the bandwidth
+	
+	if renumber != None:
+		
+		_SwitchPhase(monitor, "ordering")
+		
+		print("[i] Renumbering the mesh... (%s)"%(renumber))
+		
+		if _ReorderMeshArrays(mesh_arrays, renumber) == None: return
+		
+	
+	#-
+	
+	# Write the amsh file
+	
+	if file == None:
+		
+		file = mesh_arrays["name"]
+		
+	
+	_WriteAmshFile(file, mesh_arrays, help, monitor)
+	
+	#-
+	
+	# Report the export
+	
+	nb_elements = len(mesh_arrays["element_ids"]) + sum([group["size"] for group in mesh_arrays["groups"]])
+	
+	_StopMonitor(monitor, file, nb_elements, len(mesh_arrays["coordinates"]))
+	
+	#-
+	
+
+waf = WriteAmshFile
+
+def WriteSU2File( mesh_arrays, file = None, compress = None, tol = 1e-7, incremental = False, part = None, renumber = None, callback = None, log = None ):
+	"""
+	
+	
+Description:
+	Writes mesh arrays into an .su2 file readable by the CFD solver SU2 4.0, without needing a Salome session.
+	
+
+Arguments:
+	# mesh_arrays 
+		Description:       The arrays of the mesh to write, as returned by the GetMeshArrays function, or the name without extension of a mesh snapshot saved by this function. 
+		Type:              Dictionary or String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     -  
+
+	# file 
+		Description:       The name without extension of the file to write. If equals None, the name of the mesh is taken. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# compress 
+		Description:       If different from None, the compression of the written file (see the ExportSU2File function). 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# tol 
+		Description:       For 2D meshes, the maximum extent of the mesh along the third axis (see the DetectPlanarAxes function). 
+		Type:              Float 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     1e-7  
+
+	# incremental 
+		Description:       If equals True, only the sections which changed since the previous export are rewritten (see the ExportSU2File function). 
+		Type:              Boolean 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     False  
+
+	# part 
+		Description:       If different from None, the number of parts into which the domain elements are partitioned (see the ExportSU2File function). 
+		Type:              Integer 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# renumber 
+		Description:       If different from None, the renumbering applied to reduce the bandwidth of the mesh (see the ExportSU2File function). 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# callback 
+		Description:       If different from None, a function called at the end of the export with the export report (see the ExportSU2File function). 
+		Type:              Function 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# log 
+		Description:       If different from None, the name of a file to which the export report is appended as a JSON line. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+Returned Values:
+	"dim" value:    - 
+	"single" value: - 
+	Type:           - 
+	Number:         - 
+	Name:           -  
+
+Conditions of use:
+	The mesh arrays have to contain the "name", "dimension", "coordinates", "element_ids", "offsets", "connectivity" and "groups" entries described in the GetMeshArrays function. The given arrays are not modified.
+	
+
+"""
+	
+	if part != None and part < 1:
+		
+		print("[X] The number of parts should be at least 1."); return
+		
+	
+	monitor = _StartMonitor("WriteSU2File", callback, log)
+	
+	# Get the mesh arrays
+	
+	_SwitchPhase(monitor, "extraction")
+	
+	if isinstance(mesh_arrays, str):
+		
+		snapshot = mesh_arrays
+		
+		mesh_arrays = _LoadMeshSnapshot(snapshot)
+		
+		if mesh_arrays == None:
+			
+			print("[X] The mesh snapshot %s.npz does not exist."%(snapshot)); return
+			
+		
+	
+	else:
+		
+		mesh_arrays = dict(mesh_arrays)
+		
+		mesh_arrays["groups"] = [dict(group) for group in mesh_arrays["groups"]]
+		
+	
+	mesh_arrays = _PrepareSU2Arrays(mesh_arrays, tol, part, renumber, monitor)
+	
+	if mesh_arrays == None: return
+	
+	#-
+	
+	# Write the su2 file
+	
+	if file == None:
+		
+		file = mesh_arrays["name"]
+		
+	
+	if _WriteSU2File(file, mesh_arrays, compress, incremental, monitor) == None: return
+	
+	#-
+	
+	# Report the export
+	
+	nb_elements = len(mesh_arrays["types"]) + sum([group["size"] for group in mesh_arrays["groups"]])
+	
+	_StopMonitor(monitor, file, nb_elements, len(mesh_arrays["coordinates"]))
+	
+	#-
+	
+
+wsf = WriteSU2File
+
+def WritePolyMesh( mesh_arrays, case_dir = None, binary = False, renumber = None, callback = None, log = None ):
+	"""
+	
+	
+Description:
+	Writes mesh arrays into the polyMesh directory of an OpenFOAM case, without needing a Salome session.
+	
+
+Arguments:
+	# mesh_arrays 
+		Description:       The arrays of the mesh to write, as returned by the GetMeshArrays function, or the name without extension of a mesh snapshot saved by this function. 
+		Type:              Dictionary or String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     -  
+
+	# case_dir 
+		Description:       The directory of the OpenFOAM case. The mesh is written into its constant/polyMesh subdirectory. If equals None, the name of the mesh is taken. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# binary 
+		Description:       If equals True, the points, faces, owner and neighbour files are written in the OpenFOAM binary format. 
+		Type:              Boolean 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     False  
+
+	# renumber 
+		Description:       If different from None, the renumbering applied to reduce the bandwidth of the mesh (see the ExportSU2File function). 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# callback 
+		Description:       If different from None, a function called at the end of the export with the export report (see the ExportAmshFile function). 
+		Type:              Function 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# log 
+		Description:       If different from None, the name of a file to which the export report is appended as a JSON line. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+Returned Values:
+	"dim" value:    - 
+	"single" value: - 
+	Type:           - 
+	Number:         - 
+	Name:           -  
+
+Conditions of use:
+	The mesh arrays have to contain the "name", "dimension", "node_ids", "coordinates", "element_ids", "offsets", "connectivity" and "groups" entries described in the GetMeshArrays function, and to describe a 3D mesh (see the ExportPolyMesh function). The given arrays are not modified.
+	
+
+"""
+	
+	monitor = _StartMonitor("WritePolyMesh", callback, log)
+	
+	# Get the mesh arrays
+	
+	_SwitchPhase(monitor, "extraction")
+	
+	if isinstance(mesh_arrays, str):
+		
+		snapshot = mesh_arrays
+		
+		mesh_arrays = _LoadMeshSnapshot(snapshot)
+		
+		if mesh_arrays == None:
+			
+			print("[X] The mesh snapshot %s.npz does not exist."%(snapshot)); return
+			
+		
+	
+	else:
+		
+		mesh_arrays = dict(mesh_arrays)
+		
+		mesh_arrays["groups"] = [dict(group) for group in mesh_arrays["groups"]]
+		
+	
+	#-
+	
+	# Reduce the bandwidth
+	
+	if renumber != None:
+		
+		_SwitchPhase(monitor, "ordering")
+		
+		print("[i] Renumbering the mesh... (%s)"%(renumber))
+		
+		if _ReorderMeshArrays(mesh_arrays, renumber) == None: return
+		
+	
+	#-
+	
+	# Write the polyMesh files
+	
+	if case_dir == None:
+		
+		case_dir = mesh_arrays["name"]
+		
+	
+	if _WritePolyMesh(case_dir, mesh_arrays, binary, monitor) == None: return
+	
+	#-
+	
+	# Report the export
+	
+	_StopMonitor(monitor, case_dir, len(mesh_arrays["element_ids"]), len(mesh_arrays["coordinates"]))
+	
+	#-
+	
+
+wpm = WritePolyMesh
+
+def ReadSU2File( file, sections = ["NELEM", "NPOIN", "NMARK"] ):
+	"""
+	
+	
+Description:
+	Reads an .su2 file into NumPy arrays, for example to check the result of the ExportSU2File function.
+	
+
+Arguments:
+	# file 
+		Description:       The name of the su2 file to read, with its extension. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     -  
+
+	# sections 
+		Description:       The list of sections to read among "NELEM", "NPOIN" and "NMARK". The other sections are skipped without being parsed. 
+		Type:              List of Strings 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     ["NELEM", "NPOIN", "NMARK"]  
+
+Returned Values:
+	"dim" value:    - 
+	"single" value: - 
+	Type:           Dictionary 
+	Number:         1 
+	Name:           -  
+
+Conditions of use:
+	The file is memory-mapped and only the text of one section at a time is copied into memory. The returned dictionary has the same keys as the one returned by the GetMeshArrays function, completed with the element "types", except that the "coordinates" have one column per dimension of the mesh. The keys of the sections which are not read are missing.
+	
+
+"""
+	
+	def ParseElements(start, end, nb_elements):
+		
+		# Split the text into integers and count them line by line
+		
+		text = GetSectionText(start, end)
+		
+		try:
+			figures = numpy.fromstring(text, dtype = numpy.int64, sep = " ")
+		except ValueError:
+			print("[X] The element section starting at byte %i could not be read."%(start)); return None
+		
+		characters = numpy.frombuffer(text, dtype = numpy.uint8)
+		
+		spaces = characters <= 32
+		
+		figure_starts = numpy.flatnonzero(~spaces & numpy.concatenate(([True], spaces[:-1])))
+		
+		line_ends = numpy.flatnonzero(characters == 10)
+		
+		nb_figures_in_lines = numpy.bincount(numpy.searchsorted(line_ends, figure_starts), minlength = len(line_ends) + 1)
+		
+		nb_figures_in_lines = nb_figures_in_lines[nb_figures_in_lines > 0]
+		
+		#-
+		
+		if len(nb_figures_in_lines) != nb_elements or len(figures) != len(figure_starts):
+			
+			print("[X] The element section starting at byte %i could not be read."%(start)); return None
+			
+		
+		# Get the element types, nodes and IDs
+		
+		line_starts = numpy.zeros(nb_elements, dtype = numpy.int64)
+		
+		numpy.cumsum(nb_figures_in_lines[:-1], out = line_starts[1:])
+		
+		types = figures[line_starts]
+		
+		nb_nodes_in_elements = nb_nodes_lookup[numpy.where((types >= 0) & (types < len(nb_nodes_lookup)), types, 0)]
+		
+		with_ids = nb_figures_in_lines - 1 - nb_nodes_in_elements
+		
+		if (nb_nodes_in_elements == 0).any() or ((with_ids != 0) & (with_ids != 1)).any():
+			
+			print("[X] The element section starting at byte %i contains unknown element types."%(start)); return None
+			
+		
+		element_ids = numpy.where(with_ids == 1, figures[line_starts + nb_figures_in_lines - 1], numpy.arange(nb_elements))
+		
+		node_mask = numpy.ones(len(figures), dtype = bool)
+		
+		node_mask[line_starts] = False
+		node_mask[(line_starts + nb_figures_in_lines - 1)[with_ids == 1]] = False
+		
+		offsets = numpy.zeros(nb_elements + 1, dtype = numpy.int64)
+		
+		numpy.cumsum(nb_nodes_in_elements, out = offsets[1:])
+		
+		#-
+		
+		return {
+			"types": types,
+			"element_ids": element_ids,
+			"offsets": offsets,
+			"connectivity": figures[node_mask]
+			}
+		
+	
+	def GetSectionText(start, end):
+		
+		# Replace the comments by spaces
+		
+		text = su2_map[start:end]
+		
+		if b"%" not in text: return text
+		
+		characters = numpy.frombuffer(text, dtype = numpy.uint8).copy()
+		
+		line_indexes = numpy.cumsum(characters == 10)
+		
+		comment_positions = numpy.flatnonzero(characters == 37)
+		
+		comment_starts = numpy.full(line_indexes[-1] + 1, len(characters), dtype = numpy.int64)
+		
+		numpy.minimum.at(comment_starts, line_indexes[comment_positions], comment_positions)
+		
+		characters[(numpy.arange(len(characters)) >= comment_starts[line_indexes]) & (characters != 10)] = 32
+		
+		return characters.tobytes()
+		
+		#-
+		
+	
+	def FindHeader(keyword, start = 0):
+		
+		# Get the position, the value and the data start of a section header
+		
+		position = su2_map.find(keyword, start)
+		
+		while position != -1 and su2_map.find(b"%", su2_map.rfind(b"\n", 0, position) + 1, position) != -1:# Skip the keywords in comments
+			
+			position = su2_map.find(keyword, position + len(keyword))
+			
+		
+		if position == -1: return None
+		
+		line_end = su2_map.find(b"\n", position)
+		
+		if line_end == -1: line_end = len(su2_map)
+		
+		value = su2_map[position + len(keyword):line_end].split(b"%")[0].strip()
+		
+		return position, value, line_end + 1
+		
+		#-
+		
+	
+	def FindSectionEnd(data_start):
+		
+		index = numpy.searchsorted(header_positions, data_start)
+		
+		if index < len(header_positions):
+			
+			return header_positions[index]
+			
+		
+		return len(su2_map)
+		
+	
+	# Get the number of nodes of each SU2 element type
+	
+	nb_nodes_lookup = numpy.zeros(max(codes[0] for codes in element_type_codes.values()) + 1, dtype = numpy.int64)
+	
+	for (element_dimension, nb_nodes), (su2_type, amsh_type) in element_type_codes.items():
+		
+		nb_nodes_lookup[su2_type] = nb_nodes
+		
+	
+	#-
+	
+	# Map the file
+	
+	su2_file = open(file, "rb")
+	
+	if os.fstat(su2_file.fileno()).st_size == 0:
+		
+		su2_file.close()
+		
+		print("[X] The file", file, "is not a valid su2 file."); return
+		
+	
+	su2_map = mmap.mmap(su2_file.fileno(), 0, access = mmap.ACCESS_READ)
+	
+	#-
+	
+	# Locate the sections
+	
+	headers = {}
+	
+	for keyword in [b"NDIME=", b"NELEM=", b"NPOIN=", b"NMARK="]:
+		
+		headers[keyword] = FindHeader(keyword)
+		
+	
+	markers = []
+	
+	try:
+		
+		mesh_dimension = int(headers[b"NDIME="][1])
+		
+		nb_elements = int(headers[b"NELEM="][1])
+		
+		nb_nodes = int(headers[b"NPOIN="][1].split()[0])
+		
+		if headers[b"NMARK="] != None:
+			
+			marker_start = headers[b"NMARK="][2]
+			
+			for n in range(int(headers[b"NMARK="][1])):
+				
+				marker_tag = FindHeader(b"MARKER_TAG=", marker_start)
+				
+				marker_elems = FindHeader(b"MARKER_ELEMS=", marker_tag[2])
+				
+				markers.append((marker_tag, marker_elems, int(marker_elems[1])))
+				
+				marker_start = marker_elems[2]
+				
+			
+		
+	
+	except (TypeError, ValueError, IndexError):
+		
+		su2_map.close()
+		su2_file.close()
+		
+		print("[X] The file", file, "is not a valid su2 file."); return
+		
+	
+	header_positions = numpy.sort([header[0] for header in headers.values() if header != None] + [marker[i][0] for marker in markers for i in range(2)])
+	
+	#-
+	
+	mesh_arrays = {
+		"name": os.path.splitext(os.path.basename(file))[0],
+		"dimension": mesh_dimension
+		}
+	
+	# Read the domain elements
+	
+	if "NELEM" in sections:
+		
+		[position, value, data_start] = headers[b"NELEM="]
+		
+		element_arrays = ParseElements(data_start, FindSectionEnd(data_start), nb_elements)
+		
+		if element_arrays == None:
+			
+			su2_map.close()
+			su2_file.close()
+			
+			return
+			
+		
+		mesh_arrays.update(element_arrays)
+		
+	
+	#-
+	
+	# Read the node coordinates
+	
+	if "NPOIN" in sections:
+		
+		[position, value, data_start] = headers[b"NPOIN="]
+		
+		try:
+			figures = numpy.fromstring(GetSectionText(data_start, FindSectionEnd(data_start)), dtype = numpy.float64, sep = " ")
+		except ValueError:
+			figures = numpy.zeros(0)
+		
+		if nb_nodes == 0 or len(figures)%nb_nodes != 0 or len(figures)//nb_nodes not in [mesh_dimension, mesh_dimension + 1]:
+			
+			su2_map.close()
+			su2_file.close()
+			
+			print("[X] The node section of the file", file, "could not be read."); return
+			
+		
+		mesh_arrays["coordinates"] = figures.reshape(nb_nodes, -1)[:, :mesh_dimension]
+		
+	
+	#-
+	
+	# Read the groups
+	
+	if "NMARK" in sections:
+		
+		mesh_arrays["groups"] = []
+		
+		for (marker_tag, marker_elems, marker_size) in markers:
+			
+			data_start = marker_elems[2]
+			
+			group = {
+				"name": marker_tag[1].decode(),
+				"size": marker_size
+				}
+			
+			element_arrays = ParseElements(data_start, FindSectionEnd(data_start), group["size"])
+			
+			if element_arrays == None:
+				
+				su2_map.close()
+				su2_file.close()
+				
+				return
+				
+			
+			group.update(element_arrays)
+			
+			mesh_arrays["groups"].append(group)
+			
+		
+	
+	#-
+	
+	# Close the file
+	
+	su2_map.close()
+	
+	su2_file.close()
+	
+	#-
+	
+	return mesh_arrays
+	
+
+rsf = ReadSU2File
+
+#### - ####
@@ -13,31 +13,260 @@ Changes:
 2019-11-18 : Updated the code to run with SALOME 9.3.0.
              In ExportSU2File when 2D mesh, identifies the
 			 two coordinates dimensions.
+2026-10-16 : Added GetMeshArrays. ExportSU2File extracts the mesh
+             once into NumPy arrays instead of querying it per
+             node and per element.
+             The SU2 and AMSH writers moved to mesh_writers.py,
+             which only needs NumPy (see WriteSU2File and
+             WriteAmshFile).
+             RotateFlapGenerateAndExportMeshInAmshFormat can
+             compute the angles in parallel Salome sessions.
+             Added ExportPolyMesh (OpenFOAM polyMesh format).
+             The Salome modules are imported and the GEOM and
+             SMESH builders created when first used, and the
+             welcome message is only printed in interactive
+             sessions, to speed up the import in scripts.
+             DiscretizeEdgeByCurvature can compute the chord
+             distances with NumPy (see its "bulk" argument).
 """
 
 version = "4.0"
 
-import salome, salome.geom.geomtools
+import time
 
-import GEOM
-from salome.geom import geomBuilder
-geompy = geomBuilder.New()
+import_start_time = time.time()
 
-import SMESH, SALOMEDS
-from salome.smesh import smeshBuilder
-smesh = smeshBuilder.New()
-from salome.StdMeshers import StdMeshersBuilder
+# Maximum time in seconds to import the library, the Salome modules being excluded
 
-#import numpy
-import time
+import_time_budget = 0.5
+
+import importlib
+
+class _LazyObject:
+	"""
+	Stands for an object (a module or a Salome builder) created by a given function the first time one of its attributes is used.
+	"""
+	
+	def __init__( self, Create ):
+		
+		self.__dict__["_Create"] = Create
+		self.__dict__["_object"] = None
+		
+	
+	def __getattr__( self, name ):
+		
+		if self.__dict__["_object"] == None:
+			
+			self.__dict__["_object"] = self._Create()
+			
+		
+		return getattr(self.__dict__["_object"], name)
+		
+	
+
+def _ImportSalome():
+	"""
+	Imports the salome module.
+	"""
+	
+	return importlib.import_module("salome")
+	
+
+def _ImportGeom():
+	"""
+	Imports the GEOM module.
+	"""
+	
+	return importlib.import_module("GEOM")
+	
+
+def _ImportSmesh():
+	"""
+	Imports the SMESH module.
+	"""
+	
+	return importlib.import_module("SMESH")
+	
+
+def _ImportSalomeds():
+	"""
+	Imports the SALOMEDS module.
+	"""
+	
+	return importlib.import_module("SALOMEDS")
+	
+
+def _ImportGeomBuilder():
+	"""
+	Imports the geomBuilder module.
+	"""
+	
+	return importlib.import_module("salome.geom.geomBuilder")
+	
+
+def _NewGeomBuilder():
+	"""
+	Creates the GEOM builder.
+	"""
+	
+	return geomBuilder.New()
+	
+
+def _ImportSmeshBuilder():
+	"""
+	Imports the smeshBuilder module, with the standard meshing algorithms.
+	"""
+	
+	smesh_builder = importlib.import_module("salome.smesh.smeshBuilder")
+	
+	importlib.import_module("salome.StdMeshers.StdMeshersBuilder")
+	
+	return smesh_builder
+	
+
+def _ImportStdMeshersBuilder():
+	"""
+	Imports the StdMeshersBuilder module.
+	"""
+	
+	return importlib.import_module("salome.StdMeshers.StdMeshersBuilder")
+	
+
+def _NewSmeshBuilder():
+	"""
+	Creates the SMESH builder.
+	"""
+	
+	return smeshBuilder.New()
+	
+
+def _ImportGeomTools():
+	"""
+	Imports the geomtools module.
+	"""
+	
+	return importlib.import_module("salome.geom.geomtools")
+	
+
+# The Salome modules and the GEOM and SMESH builders are loaded when first used
+
+salome = _LazyObject(_ImportSalome)
+
+GEOM = _LazyObject(_ImportGeom)
+SMESH = _LazyObject(_ImportSmesh)
+SALOMEDS = _LazyObject(_ImportSalomeds)
+
+geomBuilder = _LazyObject(_ImportGeomBuilder)
+geompy = _LazyObject(_NewGeomBuilder)
+
+smeshBuilder = _LazyObject(_ImportSmeshBuilder)
+smesh = _LazyObject(_NewSmeshBuilder)
+StdMeshersBuilder = _LazyObject(_ImportStdMeshersBuilder)
+
+geomtools = _LazyObject(_ImportGeomTools)
+
+#-
+
+import numpy
+import itertools
+import hashlib
+import concurrent.futures
+import multiprocessing
 import random
 import ast
 import csv
+import re
 import os
 import math
+import sys
+import contextlib
+import json
+import shutil
+import tempfile
+import subprocess
+
+from mesh_writers import _GetRanges, _StartMonitor, _SwitchPhase, _StopMonitor, _ReorderMeshArrays, _SaveMeshSnapshot, _LoadMeshSnapshot, _GetPlanarAxes, _PrepareSU2Arrays, _GetSU2WriterArrays, _WriteSU2File, _WriteAmshFile, _WritePolyMesh
+from mesh_writers import WriteAmshFile, waf, WriteSU2File, wsf, WritePolyMesh, wpm, ReadSU2File, rsf
 
 #### Here are internal functions ####
 
+# Index of the objects published in the study tree
+# (component: {"modifications": study modification counter, "names": names in the study tree order, "study_objects": study objects in the same order, "study_objects_by_id": {study ID: study object}, "name_ids": {name: study IDs}, "ids": IDs given by salome.ObjectToID, computed when first needed})
+
+study_indexes = {}
+
+def _IndexStudyObject( index, study_object ):
+	"""
+	Adds a study object at the end of a study index.
+	"""
+	
+	name = study_object.GetName()
+	
+	index["names"].append(name)
+	index["study_objects"].append(study_object)
+	index["study_objects_by_id"][study_object.GetID()] = study_object
+	index["name_ids"].setdefault(name, []).append(study_object.GetID())
+	
+	if index["ids"] != None:
+		
+		index["ids"].append(salome.ObjectToID(study_object.GetObject()))
+		
+	
+
+def _GetStudyIndex( comp = "GEOM" ):
+	"""
+	Gives the index of the objects published in a component of the study tree, built again from the study tree if the study was modified since the index was last updated.
+	"""
+	
+	modifications = _GetStudyModifications()
+	
+	index = study_indexes.get(comp)
+	
+	if index == None or modifications == None or index["modifications"] != modifications:
+		
+		index = {"modifications": modifications, "names": [], "study_objects": [], "study_objects_by_id": {}, "name_ids": {}, "ids": None}
+		
+		component = salome.myStudy.FindComponent(comp)
+		
+		try:
+			
+			child_iterator = salome.myStudy.NewChildIterator(component)
+			
+			child_iterator.InitEx(True)
+			
+			while(child_iterator.More()):
+				
+				study_object = child_iterator.Value()
+				
+				if study_object.GetAllAttributes():
+					
+					_IndexStudyObject(index, study_object)
+					
+				
+				child_iterator.Next()
+				
+			
+		
+		except:
+			
+			pass
+			
+		
+		study_indexes[comp] = index
+		
+	
+	return index
+	
+
+def _InvalidateStudyIndexes():
+	"""
+	Forgets the study indexes and the name index registries, after objects were deleted from the study tree.
+	"""
+	
+	study_indexes.clear()
+	study_name_indexes.clear()
+	
+
 def ListComponentShapes( comp = "GEOM", output = "name", rec = True ):
 	"""
 	
@@ -64,7 +293,7 @@ Arguments:
 		Default value:     "name"  
 
 	# rec 
-		Description:       If equals False, the function will only iterate over the first level of the study tree. 
+		Description:       If equals False, the function will only iterate over the first level of the study tree. Else, the shapes are read from an index of the study tree, built again only when the study was modified. 
 		Type:              Boolean 
 		GUI selection:     - 
 		Selection by name: - 
@@ -105,6 +334,35 @@ Conditions of use:
 		return []
 		
 	
+	# Get the shapes from the study index
+	
+	if rec == True:
+		
+		index = _GetStudyIndex(comp)
+		
+		if output == "name":
+			
+			return list(index["names"])
+			
+		
+		elif output in ["id", "ID"]:
+			
+			if index["ids"] == None:
+				
+				index["ids"] = [salome.ObjectToID(study_object.GetObject()) for study_object in index["study_objects"]]
+				
+			
+			return list(index["ids"])
+			
+		
+		else:
+			
+			return [None] * len(index["names"])
+			
+		
+	
+	#-
+	
 	component = salome.myStudy.FindComponent(comp)
 	
 	sub_shape_list = []
@@ -211,7 +469,7 @@ Conditions of use:
 		
 		# Get the existing names
 		
-		name_list = ListComponentShapes(comp)
+		name_ids = _GetStudyIndex(comp)["name_ids"]
 		
 		#-
 		
@@ -222,7 +480,7 @@ Conditions of use:
 			return None
 			
 		
-		elif name in name_list:
+		elif name in name_ids:
 			
 			return True
 			
@@ -238,6 +496,172 @@ Conditions of use:
 
 coe = CheckObjectExistence
 
+# Name indexes of the published objects
+# (component: {"modifications": study modification counter, "indexes": {name: [used indexes, next index]}})
+
+study_name_indexes = {}
+
+def _GetStudyModifications():
+	"""
+	Gives the modification counter of the study, or None if it is not available.
+	"""
+	
+	try:
+		
+		return salome.myStudy.GetProperties().GetModified()
+		
+	
+	except:
+		
+		return None
+		
+	
+
+def _RegisterName( registry, name ):
+	"""
+	Records in a name index registry a published name of the form "<prefix><base name>_<index>", under each base name for which the GetNextNameIndex function finds this index.
+	"""
+	
+	[stem, separator, index] = name.rpartition("_")
+	
+	if separator == "" or re.fullmatch("[0-9]+", index) == None: return
+	
+	for start in range(len(stem) + 1):
+		
+		if name.find(stem[start:] + "_") == start:
+			
+			registry["indexes"].setdefault(stem[start:], [set(), 1])[0].add(int(index))
+			
+		
+	
+
+def _GetNameRegistry( comp = "GEOM" ):
+	"""
+	Gives the name index registry of a component, built from the study tree if the study was modified since the registry was last updated. Inside a BatchPublish block, the registry is not checked against the study.
+	"""
+	
+	registry = study_name_indexes.get(comp)
+	
+	if registry != None and batch_publication["depth"] > 0:
+		
+		return registry
+		
+	
+	modifications = _GetStudyModifications()
+	
+	if registry == None or modifications == None or registry["modifications"] != modifications:
+		
+		registry = {"modifications": modifications, "indexes": {}}
+		
+		for name in ListComponentShapes(comp):
+			
+			_RegisterName(registry, name)
+			
+		
+		study_name_indexes[comp] = registry
+		
+	
+	return registry
+	
+
+def _RegisterPublication( name, id, father, modifications, comp = "GEOM" ):
+	"""
+	Records an object just published, of a given name and study ID, into the study index and the name index registry of a component, if they were up to date before the publication (modifications being the study modification counter read then). The study index is forgotten if the object was published in a father shape.
+	"""
+	
+	# Update the study index
+	
+	index = study_indexes.get(comp)
+	
+	if index != None:
+		
+		if father == None and modifications != None and index["modifications"] == modifications:
+			
+			_IndexStudyObject(index, salome.myStudy.FindObjectID(id))
+			
+			index["modifications"] = _GetStudyModifications()
+			
+		
+		else:
+			
+			del study_indexes[comp]
+			
+		
+	
+	#-
+	
+	registry = study_name_indexes.get(comp)
+	
+	if registry == None: return
+	
+	if batch_publication["depth"] == 0 and (modifications == None or registry["modifications"] != modifications): return
+	
+	_RegisterName(registry, name)
+	
+	registry["modifications"] = _GetStudyModifications()
+	
+
+# State of the BatchPublish blocks
+# (number of nested blocks, study IDs of the objects to display and object browser refresh request)
+
+batch_publication = {"depth": 0, "ids": [], "refresh": False}
+
+def _DisplayObject( id ):
+	"""
+	Displays a published GEOM object of a given study ID, or queues it until the end of the current BatchPublish block.
+	"""
+	
+	if batch_publication["depth"] > 0:
+		
+		batch_publication["ids"].append(id)
+		
+	
+	else:
+		
+		gg = salome.ImportComponentGUI("GEOM")
+		
+		gg.createAndDisplayGO(id)
+		
+	
+
+def _UpdateObjectBrowser():
+	"""
+	Refreshes the object browser, or requests a refresh at the end of the current BatchPublish block.
+	"""
+	
+	if batch_publication["depth"] > 0:
+		
+		batch_publication["refresh"] = True
+		
+	
+	elif salome.sg.hasDesktop():
+		
+		salome.sg.updateObjBrowser(1)
+		
+	
+
+def _AddToStudy( object, name, father = None ):
+	"""
+	Publishes a geometrical object under a given name, in its father if different from None, and records the publication in the name registry and the study index. Returns the ID of the published object.
+	"""
+	
+	modifications = _GetStudyModifications()
+	
+	if father == None:
+		
+		id = geompy.addToStudy(object, name)
+		
+	
+	else:
+		
+		id = geompy.addToStudyInFather(father, object, name)
+		
+	
+	_RegisterPublication(name, id, father, modifications)
+	
+	return id
+	
+
 def GetNextNameIndex( name, comp = "GEOM" ):
 	"""
 	
@@ -271,68 +695,27 @@ Returned Values:
 	Name:           -  
 
 Conditions of use:
-	-
+	The existing indexes are read from a registry built once from the study tree and updated by the AddToStudy function. The registry is built again when the study was modified otherwise.
 	
 
 """
 	
-	# Get the existing names
+	# Get the existing indexes
+	
+	registry = _GetNameRegistry(comp)
 	
-	name_list = ListComponentShapes(comp)
+	indexes = registry["indexes"].setdefault(name, [set(), 1])
 	
 	#-
 	
-	name += "_"
+	# Get the next index
 	
-	# Get the existing indexes
+	while indexes[1] in indexes[0]:
+		
+		indexes[1] += 1
+		
 	
-	existing_indexes = []
-	
-	for existing_name in name_list:
-		
-		if existing_name.find(name) != -1:
-			
-			name_ending = existing_name.split(name)[1]
-			
-			try:
-				
-				index = int(name_ending)
-				
-				existing_indexes.append(index)
-				
-			
-			except:
-				
-				pass
-				
-			
-		
-	
-	#-
-	
-	# Sort the existing indexes list
-	
-	existing_indexes = list(set(existing_indexes))
-	
-	existing_indexes.sort()
-	
-	#-
-	
-	# Get the next index
-	
-	i = 1
-	
-	for existing_index in existing_indexes:
-		
-		if existing_index != i:
-			
-			break
-			
-		
-		i += 1
-		
-	
-	next_index = str(i)
+	next_index = str(indexes[1])
 	
 	#-
 	
@@ -439,37 +822,106 @@ Conditions of use:
 			name += index
 			
 		
-		if father == None:
+		id = _AddToStudy(object, name, father)
+		
+		if refresh == True:
 			
-			id = geompy.addToStudy(object, name)
+			if disp == True:
+				
+				_DisplayObject(id)
+				
+			
+			else:
+				
+				_UpdateObjectBrowser()
+				
 			
 		
-		else:
+	
+
+ats = AddToStudy
+
+@contextlib.contextmanager
+def BatchPublish(  ):
+	"""
+	
+	
+Description:
+	Opens a block of publications, to be used in a "with" statement, in which the display of the published objects and the refresh of the object browser are deferred to the end of the block.
+	
+
+Arguments:
+	-
+
+Returned Values:
+	"dim" value:    - 
+	"single" value: - 
+	Type:           Context Manager 
+	Number:         1 
+	Name:           -  
+
+Conditions of use:
+	The objects are published in the study tree as soon as the AddToStudy function is called, so that they can be got by their name inside the block. Their suffixes are given from a single scan of the study tree made at the beginning of the block and from the publications made by the AddToStudy function. The objects to display are displayed and the object browser refreshed once, at the end of the outermost block, even if an error occurs inside the block.
+	
+	Example: with BatchPublish(): GetTriEdgeFaces(shapes)
+	
+
+"""
+	
+	if batch_publication["depth"] == 0:
+		
+		_GetNameRegistry("GEOM")
+		
+	
+	batch_publication["depth"] += 1
+	
+	try:
+		
+		yield
+		
+	
+	finally:
+		
+		batch_publication["depth"] -= 1
+		
+		if batch_publication["depth"] == 0:
 			
-			id = geompy.addToStudyInFather(father, object, name)
+			ids = batch_publication["ids"]
 			
-		
-		if refresh == True:
+			refresh = batch_publication["refresh"] or len(ids) > 0
 			
-			if disp == True:
+			batch_publication["ids"] = []
+			batch_publication["refresh"] = False
+			
+			# Display the published objects
+			
+			if len(ids) > 0:
 				
 				gg = salome.ImportComponentGUI("GEOM")
 				
-				gg.createAndDisplayGO(id)
+				for id in ids:
+					
+					gg.createAndDisplayGO(id, False)
+					
+				
+				gg.UpdateViewer()
 				
 			
-			else:
+			#-
+			
+			# Refresh the object browser
+			
+			if refresh == True and salome.sg.hasDesktop():
 				
-				if salome.sg.hasDesktop():
-					
-					salome.sg.updateObjBrowser(1)
-					
+				salome.sg.updateObjBrowser(1)
 				
 			
+			#-
+			
 		
 	
 
-ats = AddToStudy
+bp = BatchPublish
 
 def GetObject( object = None, comp = "GEOM", silent = False ):
 	"""
@@ -537,7 +989,9 @@ Conditions of use:
 		
 		if CheckObjectExistence(object, comp):
 			
-			object = salome.myStudy.FindObjectByName(object, comp)[0].GetObject()
+			index = _GetStudyIndex(comp)
+			
+			object = index["study_objects_by_id"][index["name_ids"][object][0]].GetObject()
 			
 		
 		else:
@@ -721,6 +1175,7 @@ Conditions of use:
 CheckObjectExistence
 GetNextNameIndex
 AddToStudy
+BatchPublish
 GetObject
 GetSubShapes
 GetGUISelection
@@ -785,8 +1240,16 @@ ExportMeshConfiguration
 ImportMeshConfiguration
 ExportHypotheses
 ImportHypotheses
+GetMeshArrays
+DetectPlanarAxes
 ExportAmshFile
-ExportSU2File""")
+ExportSU2File
+ExportSU2Files
+ExportPolyMesh
+WriteAmshFile
+WriteSU2File
+WritePolyMesh
+ReadSU2File""")
 		
 	
 	else:
@@ -801,6 +1264,7 @@ Internal Functions
 	Check Object Existence
 	Get Next Name Index
 	Add To Study
+	Batch Publish
 	Get Object
 	Get Sub Shapes
 	Get GUI Selection
@@ -970,8 +1434,20 @@ Hypothesis Management
 Mesh Export
 ...........
 
+	Get Mesh Arrays
+	Detect Planar Axes
 	Export Amsh File
 	Export SU2 File
+	Export SU2 Files
+	Export Poly Mesh
+	Write Amsh File
+	Write SU2 File
+	Write Poly Mesh
+
+Mesh Import
+...........
+
+	Read SU2 File
 """)
 	
 
@@ -2190,7 +2666,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -2542,7 +3018,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -2753,7 +3229,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -2764,7 +3240,77 @@ Conditions of use:
 
 se = SplitEdge
 
-def DiscretizeEdgeByCurvature( edge = None, np = 20, fine = 1e3, it_max = 10, single = True, add = True, infa = False, dim = 1 ):
+def _RefineCurveSampling( edge, parameter_list, vertex_list, dist, it_max ):
+	"""
+	Refines the vertexes of an edge as DiscretizeEdgeByCurvature does, the coordinates of each vertex being read once and the distances to the chords being computed with NumPy. After each iteration, only the vertex triples containing a new vertex are checked again. Returns the refined parameters and vertexes.
+	"""
+	
+	parameters = numpy.array(parameter_list, dtype = numpy.float64)
+	points = numpy.array([geompy.PointCoordinates(vertex) for vertex in vertex_list], dtype = numpy.float64).reshape(-1, 3)
+	vertexes = list(vertex_list)
+	
+	to_check = numpy.ones(max(len(vertexes) - 2, 0), dtype = bool)
+	
+	for j in range(it_max):# For each iteration...
+		
+		# Get segments to refine
+		
+		starts = numpy.flatnonzero(to_check)
+		
+		p0 = points[starts]
+		p1 = points[starts + 1]
+		p2 = points[starts + 2]
+		
+		chords = p2 - p0
+		chord_lengths = (chords ** 2).sum(axis = 1)
+		
+		t = ((p1 - p0) * chords).sum(axis = 1) / numpy.where(chord_lengths > 0, chord_lengths, 1.0)
+		t = numpy.clip(t, 0.0, 1.0)
+		
+		distances = numpy.sqrt(((p1 - p0 - t[:, None] * chords) ** 2).sum(axis = 1))
+		
+		starts = starts[distances > dist]
+		
+		segment_to_refine_indexes = numpy.unique(numpy.concatenate((starts, starts + 1)))
+		
+		#-
+		
+		if len(segment_to_refine_indexes) == 0:
+			
+			break
+			
+		
+		# Refine segments
+		
+		new_parameters = (parameters[segment_to_refine_indexes] + parameters[segment_to_refine_indexes + 1]) / 2.0
+		new_vertexes = [geompy.MakeVertexOnCurve(edge, parameter) for parameter in new_parameters.tolist()]
+		new_points = numpy.array([geompy.PointCoordinates(vertex) for vertex in new_vertexes], dtype = numpy.float64).reshape(-1, 3)
+		
+		nb_vertexes = len(vertexes)
+		nb_new_vertexes = len(new_vertexes)
+		
+		order = numpy.insert(numpy.arange(nb_vertexes), segment_to_refine_indexes + 1, numpy.arange(nb_vertexes, nb_vertexes + nb_new_vertexes))
+		
+		parameters = numpy.concatenate((parameters, new_parameters))[order]
+		points = numpy.concatenate((points, new_points))[order]
+		vertexes = vertexes + new_vertexes
+		vertexes = [vertexes[index] for index in order.tolist()]
+		
+		#-
+		
+		# Flag the triples containing a new vertex
+		
+		is_new = order >= nb_vertexes
+		
+		to_check = is_new[:-2] | is_new[1:-1] | is_new[2:]
+		
+		#-
+		
+	
+	return [parameters.tolist(), vertexes]
+	
+
+def DiscretizeEdgeByCurvature( edge = None, np = 20, fine = 1e3, it_max = 10, single = True, add = True, infa = False, dim = 1, bulk = False ):
 	"""
 	
 	
@@ -2837,6 +3383,14 @@ Arguments:
 		Recursive:         - 
 		Default value:     1  
 
+	# bulk 
+		Description:       If equals True, the coordinates of each vertex are read only once and the distances to the chords are computed with NumPy, only the parts of the edge refined during the previous iteration being checked again. Gives the same discretization as when equals False, with much less calls to the geometry kernel. 
+		Type:              Boolean 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     False  
+
 Returned Values:
 	"dim" value:    0 
 	"single" value: False 
@@ -2892,7 +3446,7 @@ Conditions of use:
 		
 		for sub_object in input_shape:
 			
-			return_list.append(DiscretizeEdgeByCurvature(sub_object, np, fine, it_max, single, add, infa, dim))
+			return_list.append(DiscretizeEdgeByCurvature(sub_object, np, fine, it_max, single, add, infa, dim, bulk))
 			
 		
 		return return_list
@@ -2953,66 +3507,74 @@ Conditions of use:
 		
 		#-
 		
-		for j in range(it_max):# For each iteration...
+		if bulk == True:
 			
-			# Get segments to refine
+			[parameter_list, vertex_list] = _RefineCurveSampling(edge, parameter_list, vertex_list, dist, it_max)
 			
-			nb_vertexes = len(vertex_list)
-			segment_to_refine_index_list = []
-			for i in range(nb_vertexes - 2):
-				
-				p0 = parameter_list[i]
-				p1 = parameter_list[i + 1]
-				p2 = parameter_list[i + 2]
-				
-				v0 = vertex_list[i]
-				v1 = vertex_list[i + 1]
-				v2 = vertex_list[i + 2]
+		
+		else:
+			
+			for j in range(it_max):# For each iteration...
 				
-				straight_edge = geompy.MakeEdge(v0, v2)
-				distance = geompy.MinDistance(v1, straight_edge)
+				# Get segments to refine
 				
-				if distance > dist:
+				nb_vertexes = len(vertex_list)
+				segment_to_refine_index_list = []
+				for i in range(nb_vertexes - 2):
 					
-					segment_to_refine_index_list.extend([i, i + 1])
+					p0 = parameter_list[i]
+					p1 = parameter_list[i + 1]
+					p2 = parameter_list[i + 2]
+					
+					v0 = vertex_list[i]
+					v1 = vertex_list[i + 1]
+					v2 = vertex_list[i + 2]
+					
+					straight_edge = geompy.MakeEdge(v0, v2)
+					distance = geompy.MinDistance(v1, straight_edge)
+					
+					if distance > dist:
+						
+						segment_to_refine_index_list.extend([i, i + 1])
+						
 					
 				
-			
-			segment_to_refine_index_list = list(set(segment_to_refine_index_list))
-			segment_to_refine_index_list.sort()
-			
-			#-
-			
-			if len(segment_to_refine_index_list) == 0:
-				
-				break
-				
-			
-			# Refine segments
-			
-			new_parameter_list = list(parameter_list)
-			new_vertex_list = list(vertex_list)
-			for segment_to_refine_index in reversed(segment_to_refine_index_list):
+				segment_to_refine_index_list = list(set(segment_to_refine_index_list))
+				segment_to_refine_index_list.sort()
 				
-				index = segment_to_refine_index
+				#-
 				
-				p0 = parameter_list[index]
-				p1 = parameter_list[index + 1]
+				if len(segment_to_refine_index_list) == 0:
+					
+					break
+					
 				
-				p01 = (p0 + p1) / 2.0
+				# Refine segments
 				
-				new_parameter_list.insert(index + 1, p01)
+				new_parameter_list = list(parameter_list)
+				new_vertex_list = list(vertex_list)
+				for segment_to_refine_index in reversed(segment_to_refine_index_list):
+					
+					index = segment_to_refine_index
+					
+					p0 = parameter_list[index]
+					p1 = parameter_list[index + 1]
+					
+					p01 = (p0 + p1) / 2.0
+					
+					new_parameter_list.insert(index + 1, p01)
+					
+					v01 = geompy.MakeVertexOnCurve(edge, p01)
+					
+					new_vertex_list.insert(index + 1, v01)
+					
 				
-				v01 = geompy.MakeVertexOnCurve(edge, p01)
+				parameter_list = list(new_parameter_list)
+				vertex_list = list(new_vertex_list)
 				
-				new_vertex_list.insert(index + 1, v01)
+				#-
 				
 			
-			parameter_list = list(new_parameter_list)
-			vertex_list = list(new_vertex_list)
-			
-			#-
-			
 		
 		if dim == -1:
 			
@@ -3079,7 +3641,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -3369,7 +3931,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -3691,7 +4253,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -4826,7 +5388,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -5163,7 +5725,7 @@ Conditions of use:
 			all_edges_group = PutAllSubShapesInAGroup(1, shell, add = False)
 			
 			internal_edge_compound = geompy.MakeCut(all_edges_group, boundary_wire)
-			geompy.addToStudy(internal_edge_compound, "internal_edges")
+			_AddToStudy(internal_edge_compound, "internal_edges")
 			
 			#-
 			
@@ -5189,6 +5751,7 @@ Conditions of use:
 			so = salome.ObjectToSObject(internal_edge_compound)
 			sb = salome.myStudy.NewBuilder()
 			sb.RemoveObjectWithChildren(so)
+			_InvalidateStudyIndexes()
 			
 			#-
 			
@@ -5221,6 +5784,7 @@ Conditions of use:
 		if SO: a_study_builder.RemoveObjectWithChildren(SO)
 		SO = salome.myStudy.FindObjectIOR(salome.myStudy.ConvertObjectToIOR(netgen_hypo))
 		if SO: a_study_builder.RemoveObjectWithChildren(SO)
+		_InvalidateStudyIndexes()
 		
 		#-
 		
@@ -6331,7 +6895,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -6619,7 +7183,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -6953,7 +7517,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -7225,7 +7789,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -8188,7 +8752,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -8884,7 +9448,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -12589,11 +13153,6 @@ Conditions of use:
 
 """
 	
-	if add == True:
-		
-		gg = salome.ImportComponentGUI("GEOM")
-		
-	
 	# Get the input shape(s)
 	
 	[shape1, shape2] = GetObject([shape1, shape2])
@@ -12610,7 +13169,7 @@ Conditions of use:
 		
 		# Get the list of the IDs of all the shapes visible in the study tree
 		
-		visible_ids = ListComponentShapes("GEOM", output = "ID")
+		visible_ids = set(ListComponentShapes("GEOM", output = "ID"))
 		
 		#-
 		
@@ -12740,7 +13299,8 @@ Conditions of use:
 						
 						try:
 							
-							salome.geom.geomtools.GeomStudyTools().deleteShape(salome.ObjectToID(visible_groups_2[i]))
+							geomtools.GeomStudyTools().deleteShape(salome.ObjectToID(visible_groups_2[i]))
+							_InvalidateStudyIndexes()
 							
 						
 						except:
@@ -12808,13 +13368,13 @@ Conditions of use:
 					
 					try:
 						
-						id = geompy.addToStudyInFather(shape2, new_group_2, visible_group_1_name)
+						id = _AddToStudy(new_group_2, visible_group_1_name, shape2)
 						
-						gg.createAndDisplayGO(id)
+						_DisplayObject(id)
 						
 						if salome.sg.hasDesktop():
 							
-							salome.sg.updateObjBrowser(1)
+							_UpdateObjectBrowser()
 							
 						
 					
@@ -12837,7 +13397,7 @@ Conditions of use:
 		
 		#-
 		
-		salome.sg.updateObjBrowser(1)
+		_UpdateObjectBrowser()
 		
 	
 
@@ -12923,7 +13483,7 @@ Conditions of use:
 		
 		# Get the list of the IDs of all the shapes visible in the study tree
 		
-		visible_ids = ListComponentShapes("GEOM", output = "ID")
+		visible_ids = set(ListComponentShapes("GEOM", output = "ID"))
 		
 		#-
 		
@@ -13164,8 +13724,6 @@ Conditions of use:
 
 """
 	
-	if add == True: gg = salome.ImportComponentGUI("GEOM")
-	
 	# Get the input shape(s)
 	
 	shape = GetGUISelection(shape, uniq = True)
@@ -13185,7 +13743,7 @@ Conditions of use:
 		
 		# Get the list of the IDs of all the shapes visible in the study tree
 		
-		visible_ids = ListComponentShapes("GEOM", output = "ID")
+		visible_ids = set(ListComponentShapes("GEOM", output = "ID"))
 		
 		#-
 		
@@ -13287,7 +13845,8 @@ Conditions of use:
 								
 								try:
 									
-									salome.geom.geomtools.GeomStudyTools().deleteShape(salome.ObjectToID(visible_old_groups[j]))
+									geomtools.GeomStudyTools().deleteShape(salome.ObjectToID(visible_old_groups[j]))
+									_InvalidateStudyIndexes()
 									
 								
 								except:
@@ -13329,13 +13888,13 @@ Conditions of use:
 					
 					if add == True:
 						
-						id = geompy.addToStudyInFather(shape, new_group, group_name)
+						id = _AddToStudy(new_group, group_name, shape)
 						
-						gg.createAndDisplayGO(id)
+						_DisplayObject(id)
 						
 						if salome.sg.hasDesktop():
 							
-							salome.sg.updateObjBrowser(1)
+							_UpdateObjectBrowser()
 							
 						
 					
@@ -13513,14 +14072,14 @@ Conditions of use:
 		
 		if add == True:
 			
-			if dim == 0: geompy.addToStudyInFather(father, group, "AllSubShapes (Vertexes)")
-			if dim == 1: geompy.addToStudyInFather(father, group, "AllSubShapes (Edges)")
-			if dim == 2: geompy.addToStudyInFather(father, group, "AllSubShapes (Faces)")
-			if dim == 3: geompy.addToStudyInFather(father, group, "AllSubShapes (Solids)")
+			if dim == 0: _AddToStudy(group, "AllSubShapes (Vertexes)", father)
+			if dim == 1: _AddToStudy(group, "AllSubShapes (Edges)", father)
+			if dim == 2: _AddToStudy(group, "AllSubShapes (Faces)", father)
+			if dim == 3: _AddToStudy(group, "AllSubShapes (Solids)", father)
 			
 			# Update the study tree
 			
-			salome.sg.updateObjBrowser(1)
+			_UpdateObjectBrowser()
 			
 			#-
 			
@@ -13663,7 +14222,7 @@ Conditions of use:
 
 src = SetRandomColors
 
-def ExportCSVFile( compound = None, file = None, head = True ):
+def ExportCSVFile( compound = None, file = None, head = True, callback = None, log = None ):
 	"""
 	
 	
@@ -13696,6 +14255,22 @@ Arguments:
 		Recursive:         - 
 		Default value:     True  
 
+	# callback 
+		Description:       If different from None, a function called at the end of the export with a report dictionary giving the time spent in each phase ("extraction" and "io"), the total time, the number of exported vertexes, the number of vertexes exported per second and the peak memory of the process in bytes. 
+		Type:              Function 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# log 
+		Description:       If different from None, the name of a file to which the export report is appended as a JSON line. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
 Returned Values:
 	"dim" value:    - 
 	"single" value: - 
@@ -13733,8 +14308,14 @@ Conditions of use:
 		
 		# Get vertexes
 		
+		monitor = _StartMonitor("ExportCSVFile", callback, log)
+		
+		_SwitchPhase(monitor, "extraction")
+		
 		vertexes = GetSubShapes(compound)[0]
 		
+		vertex_coordinates = [geompy.PointCoordinates(vertex) for vertex in vertexes]
+		
 		#-
 		
 		# Get the file name
@@ -13748,7 +14329,9 @@ Conditions of use:
 		
 		# Export them in the CSV file
 		
-		with open(file, "wb") as csvfile:
+		_SwitchPhase(monitor, "io")
+		
+		with open(file, "w", newline = "") as csvfile:
 			
 			writer = csv.writer(csvfile, quoting = csv.QUOTE_NONNUMERIC)
 			
@@ -13757,14 +14340,17 @@ Conditions of use:
 				writer.writerow(["X","Y","Z"])
 				
 			
-			for vertex in vertexes:
-				
-				writer.writerow(geompy.PointCoordinates(vertex))
-				
+			writer.writerows(vertex_coordinates)
 			
 		
 		#-
 		
+		# Report the export
+		
+		_StopMonitor(monitor, file, len(vertexes), len(vertexes))
+		
+		#-
+		
 	
 
 ecf = ExportCSVFile
@@ -13971,7 +14557,7 @@ Conditions of use:
 			
 			if slow_add == False:
 				if salome.sg.hasDesktop():
-					salome.sg.updateObjBrowser(1)
+					_UpdateObjectBrowser()
 			
 		
 		return to_return
@@ -14331,6 +14917,7 @@ Conditions of use:
 							so = salome.ObjectToSObject(vertex_compound)
 							sb = salome.myStudy.NewBuilder()
 							sb.RemoveObjectWithChildren(so)
+							_InvalidateStudyIndexes()
 						except:
 							pass
 						
@@ -14338,6 +14925,7 @@ Conditions of use:
 							so = salome.ObjectToSObject(tmp_mesh.GetMesh())
 							sb = salome.myStudy.NewBuilder()
 							sb.RemoveObjectWithChildren(so)
+							_InvalidateStudyIndexes()
 						except:
 							pass
 						
@@ -14345,6 +14933,7 @@ Conditions of use:
 							so = salome.ObjectToSObject(tmp_hypo)
 							sb = salome.myStudy.NewBuilder()
 							sb.RemoveObjectWithChildren(so)
+							_InvalidateStudyIndexes()
 						except:
 							pass
 						
@@ -14393,7 +14982,7 @@ Conditions of use:
 			
 			if salome.sg.hasDesktop():
 				
-				salome.sg.updateObjBrowser(1)
+				_UpdateObjectBrowser()
 				
 			
 			#-
@@ -14544,7 +15133,7 @@ Conditions of use:
 			
 			# Update the study tree
 			
-			salome.sg.updateObjBrowser(1)
+			_UpdateObjectBrowser()
 			
 			#-
 			
@@ -14675,7 +15264,7 @@ Conditions of use:
 		
 		if salome.sg.hasDesktop():
 			
-			salome.sg.updateObjBrowser(1)
+			_UpdateObjectBrowser()
 			
 		
 		#-
@@ -14840,7 +15429,7 @@ Conditions of use:
 			
 			for edge in edges:
 				
-				geompy.addToStudyInFather(void_compound, edge, "edge_" + str(n))
+				_AddToStudy(edge, "edge_" + str(n), void_compound)
 				
 				hypo.SetLocalSizeOnShape(edge, size)
 				
@@ -14852,7 +15441,7 @@ Conditions of use:
 		
 		if salome.sg.hasDesktop():
 			
-			salome.sg.updateObjBrowser(1)
+			_UpdateObjectBrowser()
 			
 		
 		return void_compound
@@ -15322,7 +15911,69 @@ Conditions of use:
 
 mvfmg = MakeVertexesFromMeshGroup
 
-def RotateFlapGenerateAndExportMeshInAmshFormat( angles, group_file = "cfdmsh_grps", mesh_file = "cfdmsh_msh", domain = "domain", fixed_edges = "fixed_edges", rotating_face = "rotating_face", rotating_edges = "rotating_edges", flap_axis = "flap_axis", keep_mesh = True, help = False ):
+def _RunSalomeScript( launcher, script, output ):
+	"""
+	Runs a Python script in a new Salome session without GUI, the session being shut down at the end of the script. The outputs of the session are written into the output file. Returns the return code of the session and its duration in seconds.
+	"""
+	
+	start_time = time.time()
+	
+	output_file = open(output, "w")
+	
+	return_code = subprocess.call([launcher, "-t", "--shutdown-servers=1", script], stdout = output_file, stderr = subprocess.STDOUT)
+	
+	output_file.close()
+	
+	return [return_code, time.time() - start_time]
+	
+
+def _SaveStudyCopy( study_file ):
+	"""
+	Saves a copy of the current study into a file. The URL of the study is restored afterwards, so that saving it still goes to the file of the user.
+	"""
+	
+	url = salome.myStudy.URL()
+	
+	try:
+		
+		salome.myStudy.SaveAs(study_file, False, False)
+		
+	
+	finally:
+		
+		salome.myStudy.URL(url)
+		
+	
+
+def _GetFlapSweepChecksum( shapes, group_file, mesh_file ):
+	"""
+	Gives a checksum of the inputs of a flap sweep: the BREP descriptions of its shapes and the contents of its group file and mesh file.
+	"""
+	
+	checksum = hashlib.sha1()
+	
+	working_directory = tempfile.mkdtemp(prefix = "cfdmsh_")
+	
+	for shape in shapes:
+		
+		brep_file = os.path.join(working_directory, "shape.brep")
+		
+		geompy.ExportBREP(shape, brep_file)
+		
+		checksum.update(open(brep_file, "rb").read())
+		
+	
+	shutil.rmtree(working_directory)
+	
+	for file in [group_file, mesh_file]:
+		
+		checksum.update(open(file, "rb").read())
+		
+	
+	return checksum.hexdigest()
+	
+
+def RotateFlapGenerateAndExportMeshInAmshFormat( angles, group_file = "cfdmsh_grps", mesh_file = "cfdmsh_msh", domain = "domain", fixed_edges = "fixed_edges", rotating_face = "rotating_face", rotating_edges = "rotating_edges", flap_axis = "flap_axis", keep_mesh = True, help = False, log = None, proc = 1, launcher = "salome", cache = None ):
 	"""
 	
 	
@@ -15411,16 +16062,52 @@ Arguments:
 		Recursive:         - 
 		Default value:     False  
 
-Returned Values:
-	"dim" value:    - 
-	"single" value: - 
-	Type:           - 
-	Number:         - 
-	Name:           -   
-
-Conditions of use:
-	To use this function, the group file and mesh file have to be previously generated manually and the hypotheses to be used in the mesh have to be present in the study.
-	
+	# log 
+		Description:       This argument is passed to the ExportAmshFile function. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# proc 
+		Description:       The number of angles computed at the same time. If greater than 1, each angle is computed in a separate Salome session without GUI. 
+		Type:              Integer 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     1  
+
+	# launcher 
+		Description:       The command used to launch the Salome sessions when proc is greater than 1. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     "salome"  
+
+	# cache 
+		Description:       If different from None, the name of a cache file recording the exported angles. The angles whose flap angle, input shapes, group file and mesh file are unchanged since their last export are not computed again, their existing files being kept. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+Returned Values:
+	"dim" value:    - 
+	"single" value: - 
+	Type:           - 
+	Number:         - 
+	Name:           -   
+
+Conditions of use:
+	To use this function, the group file and mesh file have to be previously generated manually and the hypotheses to be used in the mesh have to be present in the study.
+	
+	When proc is greater than 1, the study is saved into a temporary file opened by each Salome session, the partitions and meshes being then not added to the current study. The export time of each angle is printed and, if log is different from None, the export reports of all the angles are appended to the log file. When an angle fails, the outputs of its session are kept in the temporary directory.
+	
+	The cache only detects changes of the shapes and of the group and mesh files. After modifying the hypotheses of the study, the cache file has to be deleted.
+	
 
 """
 	
@@ -15441,73 +16128,259 @@ Conditions of use:
 	
 	#-
 	
-	else:
+	else:# All checks done
 		
-		for angle in angles:# For each rotation angle...
+		# Get the outputs found in the cache
+		
+		if cache != None:
 			
-			# Convert angle from degrees to radians
+			input_checksum = _GetFlapSweepChecksum([domain, fixed_edges, rotating_face, rotating_edges, flap_axis], group_file, mesh_file)
 			
-			angle_in_radians = angle * pi / 180
+			if os.path.exists(cache):
+				
+				cache_file = open(cache, "r")
+				
+				cached_outputs = json.load(cache_file)
+				
+				cache_file.close()
+				
 			
-			#-
+			else:
+				
+				cached_outputs = {}
+				
+			
+			keys = {}
+			
+			new_angles = []
+			
+			for angle in angles:
+				
+				mesh_name = "Mesh_" + str(angle) + "deg"
+				
+				keys[mesh_name] = hashlib.sha1(repr([input_checksum, angle, help]).encode()).hexdigest()
+				
+				cached_output = cached_outputs.get(mesh_name)
+				
+				if cached_output != None and cached_output["key"] == keys[mesh_name] and all(os.path.exists(file) and os.path.getsize(file) == size for [file, size] in cached_output["files"].items()):
+					
+					print("[i] Angle", angle, "deg taken from the cache.")
+					
+				
+				else:
+					
+					new_angles.append(angle)
+					
+				
 			
-			# Rotate the flap
+			angles = new_angles
 			
-			rotated_flap_face = geompy.MakeRotation(rotating_face, flap_axis, angle_in_radians)
+			start_time = time.time()
 			
-			rotated_flap_edges = geompy.MakeRotation(rotating_edges, flap_axis, angle_in_radians)
+		
+		#-
+		
+		if proc > 1 and len(angles) > 0:
 			
-			#-
+			# Save the study for the Salome sessions
 			
-			# Cut and partition the domain
+			working_directory = tempfile.mkdtemp(prefix = "cfdmsh_")
 			
-			cut_domain = geompy.MakeCut(domain, rotated_flap_face)
+			study_file = os.path.join(working_directory, "study.hdf")
 			
-			partition = geompy.MakePartition([cut_domain], [rotated_flap_edges, fixed_edges], Limit = geompy.ShapeType["FACE"])
+			_SaveStudyCopy(study_file)
 			
 			#-
 			
-			# Import the geometrical groups
+			# Write the script of each angle
+			
+			module_directory = os.path.dirname(os.path.abspath(__file__))
 			
-			partition_name = "Partition_" + str(angle) + "deg"
+			module_name = os.path.splitext(os.path.basename(__file__))[0]
 			
-			geompy.addToStudy(partition, partition_name)
+			scripts = []
 			
-			ImportGeometricalGroups(partition_name, group_file)
+			for angle in angles:
+				
+				angle_prefix = os.path.join(working_directory, "angle_" + str(angle) + "deg")
+				
+				script_lines = [
+					"import sys",
+					"sys.path.insert(0, %r)"%(module_directory),
+					"import os",
+					"os.chdir(%r)"%(os.getcwd()),
+					"import salome",
+					"salome.salome_init(%r)"%(study_file),
+					"from %s import RotateFlapGenerateAndExportMeshInAmshFormat"%(module_name),
+					"RotateFlapGenerateAndExportMeshInAmshFormat([%r], %r, %r, %r, %r, %r, %r, %r, keep_mesh = False, help = %r, log = %r)"%(angle, group_file, mesh_file, domain.GetName(), fixed_edges.GetName(), rotating_face.GetName(), rotating_edges.GetName(), flap_axis.GetName(), help, angle_prefix + ".json")]
+				
+				script_file = open(angle_prefix + ".py", "w")
+				
+				script_file.write("\n".join(script_lines) + "\n")
+				
+				script_file.close()
+				
+				scripts.append(angle_prefix)
+				
 			
 			#-
 			
-			# Create the mesh
+			# Run the sessions
+			
+			start_time = time.time()
 			
-			mesh_name = "Mesh_" + str(angle) + "deg"
+			pool = concurrent.futures.ThreadPoolExecutor(max_workers = proc)
 			
-			mesh = smesh.Mesh(partition, mesh_name)
+			runs = [pool.submit(_RunSalomeScript, launcher, angle_prefix + ".py", angle_prefix + ".out") for angle_prefix in scripts]
+			
+			pool.shutdown(wait = True)
 			
 			#-
 			
-			# Import the mesh configuration
+			# Gather the results
 			
-			ImportMeshConfiguration(mesh, mesh_file)
+			nb_failures = 0
 			
-			#-
+			for angle, angle_prefix, run in zip(angles, scripts, runs):
+				
+				[return_code, run_time] = run.result()
+				
+				if return_code != 0 or not os.path.exists(angle_prefix + ".json"):
+					
+					print("[X] The angle", angle, "could not be computed. See the file", angle_prefix + ".out")
+					
+					nb_failures += 1
+					
+					continue
+					
+				
+				reports = [json.loads(line) for line in open(angle_prefix + ".json")]
+				
+				print("[i] Angle %s deg computed in %.1f s (export: %.1f s)."%(angle, run_time, reports[-1]["time"]))
+				
+				if log != None:
+					
+					log_file = open(log, "a")
+					
+					for report in reports:
+						
+						report["session_time"] = run_time
+						
+						log_file.write(json.dumps(report) + "\n")
+						
+					
+					log_file.close()
+					
+				
 			
-			# Compute the mesh
+			print("[i] %i angles computed in %.1f s."%(len(angles) - nb_failures, time.time() - start_time))
 			
-			mesh.Compute()
+			if nb_failures == 0:
+				
+				shutil.rmtree(working_directory)
+				
 			
 			#-
 			
-			# Export the mesh
+		
+		else:
 			
-			ExportAmshFile(mesh, mesh_name, help = help)
+			for angle in angles:# For each rotation angle...
+				
+				# Convert angle from degrees to radians
+				
+				angle_in_radians = angle * pi / 180
+				
+				#-
+				
+				# Rotate the flap
+				
+				rotated_flap_face = geompy.MakeRotation(rotating_face, flap_axis, angle_in_radians)
+				
+				rotated_flap_edges = geompy.MakeRotation(rotating_edges, flap_axis, angle_in_radians)
+				
+				#-
+				
+				# Cut and partition the domain
+				
+				cut_domain = geompy.MakeCut(domain, rotated_flap_face)
+				
+				partition = geompy.MakePartition([cut_domain], [rotated_flap_edges, fixed_edges], Limit = geompy.ShapeType["FACE"])
+				
+				#-
+				
+				# Import the geometrical groups
+				
+				partition_name = "Partition_" + str(angle) + "deg"
+				
+				_AddToStudy(partition, partition_name)
+				
+				ImportGeometricalGroups(partition_name, group_file)
+				
+				#-
+				
+				# Create the mesh
+				
+				mesh_name = "Mesh_" + str(angle) + "deg"
+				
+				mesh = smesh.Mesh(partition, mesh_name)
+				
+				#-
+				
+				# Import the mesh configuration
+				
+				ImportMeshConfiguration(mesh, mesh_file)
+				
+				#-
+				
+				# Compute the mesh
+				
+				mesh.Compute()
+				
+				#-
+				
+				# Export the mesh
+				
+				ExportAmshFile(mesh, mesh_name, help = help, log = log)
+				
+				#-
+				
+				if keep_mesh == False:
+					
+					mesh.Clear()
+					
+				
 			
-			#-
+		
+		# Update the cache
+		
+		if cache != None:
 			
-			if keep_mesh == False:
+			for angle in angles:
 				
-				mesh.Clear()
+				mesh_name = "Mesh_" + str(angle) + "deg"
+				
+				files = [mesh_name + ".amsh"]
+				
+				if help == True:
+					
+					files.append(mesh_name + ".help")
+					
+				
+				if all(os.path.exists(file) and os.path.getmtime(file) >= int(start_time) for file in files):
+					
+					cached_outputs[mesh_name] = {"key": keys[mesh_name], "files": {file: os.path.getsize(file) for file in files}}
+					
 				
 			
+			cache_file = open(cache, "w")
+			
+			json.dump(cached_outputs, cache_file, indent = 1)
+			
+			cache_file.close()
+			
+		
+		#-
 		
 	
 
@@ -16050,7 +16923,7 @@ Conditions of use:
 		
 		# Update the study tree
 		
-		salome.sg.updateObjBrowser(1)
+		_UpdateObjectBrowser()
 		
 		#-
 		
@@ -16809,7 +17682,7 @@ Conditions of use:
 		
 		# Update the study tree
 		
-		salome.sg.updateObjBrowser(1)
+		_UpdateObjectBrowser()
 		
 		#-
 		
@@ -16823,33 +17696,129 @@ Conditions of use:
 
 ih = ImportHypotheses
 
-def ExportAmshFile( mesh = None, file = None, only = [None], ignore = [None], help = False ):
+def _GetFlatArray( ids, GetValues, dtype, nb_values = None, chunk_size = 100000 ):
+	"""
+	Queries the mesh once per ID and stores the values chunk by chunk into a flat array. Also returns the offsets of the values of each ID if nb_values is None.
+	"""
+	
+	nb_ids = len(ids)
+	
+	chunks = []
+	
+	counts = []
+	
+	for start in range(0, nb_ids, chunk_size):
+		
+		values = [GetValues(id) for id in ids[start:start + chunk_size]]
+		
+		if nb_values == None:
+			
+			counts.append(numpy.fromiter((len(value) for value in values), dtype = numpy.int64, count = len(values)))
+			
+		
+		chunks.append(numpy.fromiter(itertools.chain.from_iterable(values), dtype = dtype))
+		
+	
+	if len(chunks) == 0:
+		
+		chunks = [numpy.zeros(0, dtype = dtype)]
+		
+		counts = [numpy.zeros(0, dtype = numpy.int64)]
+		
+	
+	array = numpy.concatenate(chunks)
+	
+	if nb_values == None:
+		
+		offsets = numpy.zeros(nb_ids + 1, dtype = numpy.int64)
+		
+		numpy.cumsum(numpy.concatenate(counts), out = offsets[1:])
+		
+		return array, offsets
+		
+	
+	return array.reshape(nb_ids, nb_values)
+	
+
+def _GetMeshKey( mesh, sample = 100 ):
+	"""
+	Gives a key describing the state of a mesh, made of its name, its numbers of nodes and elements and a checksum of its bounding box, of its group contents, of its node and element IDs and of the coordinates and nodes of a sample of nodes and elements. Only sample nodes and sample elements, evenly spread over the IDs, are queried one by one (all of them if sample is None), so that the key can be compared to the one of a snapshot before extracting the mesh. Also returns the node IDs, the groups with their element IDs and the queried "node_indexes" and "coordinates" and "element_ids", "offsets" and "connectivity" (node IDs), to be reused if the mesh has to be extracted.
+	"""
+	
+	checksum = hashlib.sha1()
+	
+	checksum.update(repr([mesh.NbEdges(), mesh.NbFaces(), mesh.NbVolumes(), mesh.BoundingBox()]).encode())
+	
+	groups = []
+	
+	for group in mesh.GetGroups():
+		
+		group_element_ids = group.GetListOfID()
+		
+		checksum.update(repr([group.GetName(), str(group.GetType())]).encode())
+		
+		checksum.update(numpy.asarray(group_element_ids, dtype = numpy.int64).tobytes())
+		
+		groups.append([group, group_element_ids])
+		
+	
+	# Check the nodes and the elements
+	
+	node_ids = numpy.asarray(mesh.GetNodesId(), dtype = numpy.int64)
+	
+	checksum.update(node_ids.tobytes())
+	
+	element_ids = numpy.asarray(mesh.GetElementsId(), dtype = numpy.int64)
+	
+	checksum.update(element_ids.tobytes())
+	
+	node_indexes = numpy.arange(len(node_ids))
+	element_indexes = numpy.arange(len(element_ids))
+	
+	if sample != None:
+		
+		node_indexes = numpy.unique(numpy.linspace(0, len(node_ids) - 1, min(sample, len(node_ids))).astype(numpy.int64))
+		element_indexes = numpy.unique(numpy.linspace(0, len(element_ids) - 1, min(sample, len(element_ids))).astype(numpy.int64))
+		
+	
+	queried = {
+		"node_indexes": node_indexes,
+		"coordinates": _GetFlatArray(node_ids[node_indexes].tolist(), mesh.GetNodeXYZ, numpy.float64, 3),
+		"element_ids": element_ids[element_indexes]
+		}
+	
+	[queried["connectivity"], queried["offsets"]] = _GetFlatArray(queried["element_ids"].tolist(), mesh.GetElemNodes, numpy.int64)
+	
+	checksum.update(queried["coordinates"].tobytes())
+	checksum.update(queried["offsets"].tobytes())
+	checksum.update(queried["connectivity"].tobytes())
+	
+	#-
+	
+	key = "%s %i %i %s"%(mesh.GetName(), len(node_ids), len(element_ids), checksum.hexdigest())
+	
+	return [key, node_ids, groups, queried]
+	
+
+def GetMeshArrays( mesh = None, only = [None], ignore = [None], batch = None, snapshot = None, sample = 100 ):
 	"""
 	
 	
 Description:
-	Exports a mesh into an .amsh file readable by the CFD solver Edge 5.0.0.
+	Extracts once the node coordinates and the element connectivity of a mesh into contiguous NumPy arrays.
 	
 
 Arguments:
 	# mesh 
-		Description:       The mesh to export. 
+		Description:       The mesh from which to extract the arrays. 
 		Type:              Mesh 
 		GUI selection:     yes 
 		Selection by name: yes 
 		Recursive:         - 
 		Default value:     None  
 
-	# file 
-		Description:       The name without extension of the amsh file to write. If equals None, the name of the mesh in the study tree is taken. 
-		Type:              String 
-		GUI selection:     - 
-		Selection by name: - 
-		Recursive:         - 
-		Default value:     None  
-
 	# only 
-		Description:       The list of names of groups to export, excluding the others. 
+		Description:       The list of names of groups to extract, excluding the others. 
 		Type:              List of Strings 
 		GUI selection:     - 
 		Selection by name: - 
@@ -16864,25 +17833,40 @@ Arguments:
 		Recursive:         - 
 		Default value:     [None]  
 
-	# help 
-		Description:       Activates the generation of a help file giving relation between Edge and Salome node IDs (slows down the mesh export). 
-		Type:              Boolean 
+	# batch 
+		Description:       If different from None, the number of group elements to extract at once. The group elements are then extracted lazily, batch after batch, when iterating over the "batches" of each group. 
+		Type:              Integer 
 		GUI selection:     - 
 		Selection by name: - 
 		Recursive:         - 
-		Default value:     False  
+		Default value:     None  
+
+	# snapshot 
+		Description:       If different from None, the name without extension of a compressed NPZ file in which the arrays of the mesh and of all its groups are saved. If this file already exists and was saved from the same mesh state (same mesh name, same numbers of nodes and elements and same checksum of the bounding box, of the group contents, of the node and element IDs and of the coordinates and nodes of a sample of nodes and elements), the arrays are loaded from it instead of being queried from the mesh. Cannot be used with the batch argument. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# sample 
+		Description:       The number of nodes and of elements, evenly spread over the IDs, whose coordinates and nodes are checked to know if the mesh changed since the snapshot was saved. The other nodes and elements are only checked through their IDs and the bounding box of the mesh, so that moving inner nodes without changing the sampled ones (for example by smoothing) does not invalidate the snapshot, which is then stale. If equals None, all the nodes and elements are checked, which costs as many queries as extracting the mesh. The queried coordinates and nodes are reused if the mesh has to be extracted. 
+		Type:              Integer 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     100  
 
 Returned Values:
 	"dim" value:    - 
 	"single" value: - 
-	Type:           - 
-	Number:         - 
+	Type:           Dictionary 
+	Number:         1 
 	Name:           -  
 
 Conditions of use:
-	The mesh has to be computed and to contain groups describing the desired boundary conditions (inlet, outlet, wall, farfield, etc.).
+	The mesh has to be computed. The returned dictionary contains the mesh "name" and "dimension", the "node_ids" and "coordinates" (one row of X, Y and Z per node) of the nodes, the "element_ids", "offsets" and "connectivity" of the domain elements and the list of "groups". The connectivity gives node indexes (starting from 0) into the coordinate array, the nodes of the element n being connectivity[offsets[n]:offsets[n + 1]]. Each group is a dictionary with the "name", "type" and "size" keys, plus either the "element_ids", "offsets" and "connectivity" keys or, if batch is different from None, a "batches" iterator over dictionaries having these three keys. The group elements are then read by ranges of batch element IDs, one filter query per range, so that no list of all the IDs of a group is built.
 	
-	Warning: In the case the mesh is the result of a mesh fusion, the nodes and then the elements of the meshes to fuse have to be reordered before the fusion, else Edge can detect a Max dev. of accum. surface vector superior to its allowed tolerance during the preprocessor command execution.  
 
 """
 	
@@ -16902,84 +17886,111 @@ Conditions of use:
 	
 	else:# All checks done
 		
-		def WriteInColumns(file, table, nb_columns, nb_identation_spaces, nb_spaces = 6):
+		def GetElementArrays(element_ids):
+			
+			element_ids = numpy.asarray(element_ids, dtype = numpy.int64)
+			
+			# Reuse the element nodes already queried for the snapshot key
 			
-			n = 0
+			positions = numpy.minimum(numpy.searchsorted(queried["element_ids"], element_ids, sorter = queried_element_sorter), max(len(queried["element_ids"]) - 1, 0))
 			
-			for element in table:
+			if len(queried["element_ids"]) > 0:
 				
-				if n%nb_columns == 0:
-					
-					for s in range(nb_identation_spaces):
-						
-						file.write(" ")
-						
-					
+				positions = queried_element_sorter[positions]
 				
-				else:
-					
-					for s in range(nb_spaces):
-						
-						file.write(" ")
-						
-					
+				is_queried = queried["element_ids"][positions] == element_ids
 				
-				if type(element) == type("string"):
-					
-					file.write("%s"%(element))
-					
+			
+			else:
 				
-				elif type(element) == type(1.0):
-					
-					file.write("%.16f"%(element))
-					
+				is_queried = numpy.zeros(len(element_ids), dtype = bool)
 				
-				elif type(element) == type(1):
-					
-					file.write("%i"%(element))
-					
+			
+			[new_connectivity, new_offsets] = _GetFlatArray(element_ids[~is_queried].tolist(), mesh.GetElemNodes, numpy.int64)
+			
+			counts = numpy.zeros(len(element_ids), dtype = numpy.int64)
+			
+			counts[is_queried] = numpy.diff(queried["offsets"])[positions[is_queried]]
+			counts[~is_queried] = numpy.diff(new_offsets)
+			
+			offsets = numpy.zeros(len(element_ids) + 1, dtype = numpy.int64)
+			
+			numpy.cumsum(counts, out = offsets[1:])
+			
+			connectivity = numpy.empty(offsets[-1], dtype = numpy.int64)
+			
+			for [mask, values] in [[is_queried, _GetRanges(queried["connectivity"], queried["offsets"][positions[is_queried]], counts[is_queried])[0]], [~is_queried, new_connectivity]]:
 				
-				if (n + 1)%nb_columns == 0 or n == len(table) - 1:
-					
-					file.write("\n")
-					
+				connectivity[_GetRanges(numpy.arange(offsets[-1]), offsets[:-1][mask], counts[mask])[0]] = values
 				
-				n += 1
 			
-		
-		def powerOfTen(figure):
+			#-
 			
-			figure *= 1.0
+			# Convert node IDs into node indexes
 			
-			n = 0
+			if contiguous_node_ids == True:
+				
+				connectivity -= 1
+				
 			
-			if figure != 0:
+			else:
 				
-				if abs(figure) < 1:
-					
-					while abs(figure) < 1:
-						
-						figure *= 10
-						
-						n -= 1
-						
-					
+				connectivity = node_sorter[numpy.searchsorted(node_ids, connectivity, sorter = node_sorter)]
+				
+			
+			return element_ids, offsets, connectivity
+			
+		
+		def SelectGroups(mesh_arrays):
+			
+			selected_groups = []
+			
+			for group in mesh_arrays["groups"]:
 				
-				if abs(figure) >= 10:
+				if (only == [None] or group["name"] in only) and (ignore == [None] or group["name"] not in ignore):
 					
-					while abs(figure) >= 10:
-						
-						figure /= 10
-						
-						n += 1
-						
+					selected_groups.append(group)
 					
 				
 			
-			return figure, n
+			mesh_arrays["groups"] = selected_groups
+			
+			return mesh_arrays
 			
 		
-		if "SMESH_Mesh instance" in str(mesh) or "meshProxy instance" in str(mesh) or "Mesh object" in str(mesh):
+		def GetGroupBatches(group, nb_elements_in_group):
+			
+			# Get the group elements by ranges of batch IDs, one query per range
+			
+			group_type = group.GetType()
+			
+			nb_elements_read = 0
+			
+			start = 1
+			
+			while nb_elements_read < nb_elements_in_group:
+				
+				batch_filter = smesh.GetFilterFromCriteria([smesh.GetCriterion(group_type, SMESH.FT_BelongToMeshGroup, SMESH.FT_Undefined, group), smesh.GetCriterion(group_type, SMESH.FT_RangeOfIds, SMESH.FT_Undefined, "%i-%i"%(start, start + batch - 1))])
+				
+				group_element_ids = mesh.GetIdsFromFilter(batch_filter)
+				
+				start += batch
+				
+				if len(group_element_ids) == 0: continue
+				
+				nb_elements_read += len(group_element_ids)
+				
+				[element_ids_in_batch, offsets_in_batch, connectivity_in_batch] = GetElementArrays(group_element_ids)
+				
+				yield {
+					"element_ids": element_ids_in_batch,
+					"offsets": offsets_in_batch,
+					"connectivity": connectivity_in_batch
+					}
+				
+			
+		
+		if "SMESH_Mesh instance" in str(mesh) or "meshProxy" in str(mesh) or "Mesh object" in str(mesh):
 			
 			try:
 				mesh = smesh.Mesh(mesh)
@@ -16992,92 +18003,106 @@ Conditions of use:
 			print("[X] The input object is not a mesh or the Mesh module was not yet loaded."); return
 			
 		
-		# Get the mesh name
-		
-		mesh_name = mesh.GetName()
-		
-		#-
+		# Load or save the snapshot
 		
-		# Renumber elements and nodes
+		if snapshot != None:
+			
+			if batch != None:
+				
+				print("[X] The snapshot cannot be used with batches of group elements."); return
+				
+			
+			[key, node_ids, groups, queried] = _GetMeshKey(mesh, sample)
+			
+			mesh_arrays = _LoadMeshSnapshot(snapshot, key)
+			
+			if mesh_arrays != None:
+				
+				print("[i] Loading the mesh snapshot... (%s.npz)"%(snapshot))
+				
+				return SelectGroups(mesh_arrays)
+				
+			
 		
-		mesh.RenumberNodes()
-		mesh.RenumberElements()
+		else:
+			
+			node_ids = mesh.GetNodesId()
+			
+			groups = [[group, None] for group in mesh.GetGroups()]
+			
+			queried = {
+				"node_indexes": numpy.zeros(0, dtype = numpy.int64),
+				"coordinates": numpy.zeros((0, 3)),
+				"element_ids": numpy.zeros(0, dtype = numpy.int64),
+				"offsets": numpy.zeros(1, dtype = numpy.int64),
+				"connectivity": numpy.zeros(0, dtype = numpy.int64)
+				}
+			
 		
 		#-
 		
-		# Get nodes number and IDs
-		
-		nb_nodes_in_mesh = mesh.NbNodes()
+		# Get the mesh name
 		
-		node_ids_in_mesh = mesh.GetNodesId()
+		mesh_name = mesh.GetName()
 		
 		#-
 		
-		# Get edges IDs
-		
-		edge_ids_in_mesh = mesh.GetElementsByType(SMESH.EDGE)
-		
-		nb_edges_in_mesh = mesh.NbEdges()
+		# Get the node coordinates
 		
-		#-
+		node_ids = numpy.asarray(node_ids, dtype = numpy.int64)
 		
-		# Get faces IDs
+		nb_nodes_in_mesh = len(node_ids)
 		
-		face_ids_in_mesh = mesh.GetElementsByType(SMESH.FACE)
+		contiguous_node_ids = bool(numpy.array_equal(node_ids, numpy.arange(1, nb_nodes_in_mesh + 1)))
 		
-		nb_faces_in_mesh = mesh.NbFaces()
-		nb_triangles_in_mesh = mesh.NbTriangles()
-		nb_quadrangles_in_mesh = mesh.NbQuadrangles()
+		node_sorter = numpy.argsort(node_ids, kind = "stable")
 		
-		#-
+		is_queried = numpy.zeros(nb_nodes_in_mesh, dtype = bool)
 		
-		# Get volumes IDs
+		is_queried[queried["node_indexes"]] = True
 		
-		nb_volumes_in_mesh = mesh.NbVolumes()
+		coordinates = numpy.empty((nb_nodes_in_mesh, 3))
 		
-		nb_tetrahedrons_in_mesh = mesh.NbTetras()
-		nb_pyramids_in_mesh = mesh.NbPyramids()
-		nb_prisms_in_mesh = mesh.NbPrisms()
-		nb_hexahedrons_in_mesh = mesh.NbHexas()
+		coordinates[is_queried] = queried["coordinates"]
+		coordinates[~is_queried] = _GetFlatArray(node_ids[~is_queried].tolist(), mesh.GetNodeXYZ, numpy.float64, 3)
 		
-		volume_ids_in_mesh = mesh.GetElementsByType(SMESH.VOLUME)
+		queried_element_sorter = numpy.argsort(queried["element_ids"], kind = "stable")
 		
 		#-
 		
 		# Get mesh dimension
 		
-		if nb_volumes_in_mesh != 0:
+		if mesh.NbVolumes() != 0:
 			
 			mesh_dimension = 3
 			
-			nb_elements_in_domain = nb_volumes_in_mesh
+			element_ids_in_domain = mesh.GetElementsByType(SMESH.VOLUME)
+			
 		
 		else:
 			
 			mesh_dimension = 2
 			
-			nb_elements_in_domain = nb_faces_in_mesh
+			element_ids_in_domain = mesh.GetElementsByType(SMESH.FACE)
 			
 		
 		#-
 		
-		# Get groups
+		# Get the domain element connectivity
 		
-		group_names = mesh.GetGroupNames()
-		
-		groups = mesh.GetGroups()
+		[element_ids, offsets, connectivity] = GetElementArrays(element_ids_in_domain)
 		
 		#-
 		
-		# Sort groups
+		# Sort groups (all the groups are kept in a snapshot)
 		
 		sorted_groups = []
 		
-		if only != [None]:
+		if only != [None] and snapshot == None:
 			
 			for group in groups:
 				
-				group_name = group.GetName()
+				group_name = group[0].GetName()
 				
 				if group_name in only:
 					
@@ -17090,11 +18115,11 @@ Conditions of use:
 		
 		sorted_groups = []
 		
-		if ignore != [None]:
+		if ignore != [None] and snapshot == None:
 			
 			for group in groups:
 				
-				group_name = group.GetName()
+				group_name = group[0].GetName()
 				
 				if group_name not in ignore:
 					
@@ -17105,741 +18130,843 @@ Conditions of use:
 			groups = sorted_groups
 			
 		
-		# Get the number of groups
-		
-		nb_groups = len(groups)
-		
-		# Get group types
-		
-		group_types = []
-		
-		for group in groups:
-			
-			group_type = str(group.GetType())
-			
-			group_types.append(group_type)
-			
-		
 		#-
 		
-		# Open the amsh file
-		
-		date = time.asctime(time.localtime())
-		
-		if file == None:
-			
-			file = mesh_name
-			
-		
-		amsh_file = open("%s.amsh"%(file), "w")
-		
-		amsh_file.write("unstr_grid_data N 0 0 2\n")
-		amsh_file.write(" title L 1 1 0\n")
-		amsh_file.write(" '%s exported from Salome on %s'\n"%(mesh_name, date))
-		
-		#-
+		# Get the group element connectivity
 		
-		# Open the help file
+		group_arrays = []
 		
-		if help == True:
-			
-			mesh_file = open("%s.help"%(file), "w")
+		for [group, group_element_ids] in groups:
 			
-			mesh_file.write("%s\n"%(date))
-			mesh_file.write("'%s'	'%s'\n"%(mesh_name, file))
-			mesh_file.write("NODES	EDGES	TRIA	QUAD	TETRA	PYRA	PRISM	HEXA\n")
-			mesh_file.write("%i	%i	%i	%i	%i	%i	%i	%i\n"%(nb_nodes_in_mesh, nb_edges_in_mesh, nb_triangles_in_mesh, nb_quadrangles_in_mesh, nb_tetrahedrons_in_mesh, nb_pyramids_in_mesh, nb_prisms_in_mesh, nb_hexahedrons_in_mesh))
+			group_array = {
+				"name": group.GetName(),
+				"type": str(group.GetType()),
+				"size": group.Size()
+				}
 			
-			for n in range(nb_groups):
+			if batch == None:
+				
+				if group_element_ids == None:
+					
+					group_element_ids = group.GetListOfID()
+					
 				
-				mesh_file.write("'%s'	"%(mesh.GetGroupNames()[n]))
+				[group_array["element_ids"], group_array["offsets"], group_array["connectivity"]] = GetElementArrays(group_element_ids)
 				
 			
-			mesh_file.write("\n")
+			else:
+				
+				group_array["batches"] = GetGroupBatches(group, group_array["size"])
+				
 			
-			mesh_file.write("NODES\nID	X	Y	Z\n")
+			group_arrays.append(group_array)
 			
 		
 		#-
 		
-		# Get the region ffa dimension
+		mesh_arrays = {
+			"name": mesh_name,
+			"dimension": mesh_dimension,
+			"node_ids": node_ids,
+			"coordinates": coordinates,
+			"element_ids": element_ids,
+			"offsets": offsets,
+			"connectivity": connectivity,
+			"groups": group_arrays
+			}
 		
-		region_ffa_dimension = 2 + nb_groups
-		
-		if mesh_dimension == 2:
-			
-			if nb_triangles_in_mesh > 0:
-				
-				region_ffa_dimension += 1
-				
-			
-			if nb_quadrangles_in_mesh > 0:
-				
-				region_ffa_dimension += 1
-				
-			
+		# Save the snapshot
 		
-		elif mesh_dimension == 3:
+		if snapshot != None:
 			
-			if nb_tetrahedrons_in_mesh > 0:
-				
-				region_ffa_dimension += 1
-				
-			
-			if nb_pyramids_in_mesh > 0:
-				
-				region_ffa_dimension += 1
-				
+			print("[i] Saving the mesh snapshot... (%s.npz)"%(snapshot))
 			
-			if nb_prisms_in_mesh > 0:
-				
-				region_ffa_dimension += 1
-				
+			_SaveMeshSnapshot(snapshot, mesh_arrays, key)
 			
-			if nb_hexahedrons_in_mesh > 0:
-				
-				region_ffa_dimension += 1
-				
+			mesh_arrays = SelectGroups(mesh_arrays)
 			
 		
-		amsh_file.write(" region N 0 0 %i\n"%(region_ffa_dimension))
-		amsh_file.write(" region_name L 1 1 0\n")
-		amsh_file.write(" 'volume_elements'\n")
-		amsh_file.write(" coordinates DF %i %i 0\n"%(mesh_dimension, nb_nodes_in_mesh))
-		
 		#-
 		
-		print("[i] Writing node coordinates... (%s nodes)"%(nb_nodes_in_mesh))
-		
-		# Get the node coordinates
-		
-		node_coordinates = []
+		# Return the arrays
 		
-		for n in range(mesh_dimension):
-			
-			node_coordinates.append([])
-			
+		return mesh_arrays
 		
 		#-
 		
-		# Write the node coordinates
+	
+
+gma = GetMeshArrays
+
+def DetectPlanarAxes( mesh = None, tol = 1e-7 ):
+	"""
+	
+	
+Description:
+	Detects the two coordinate axes in which a planar mesh extends.
+	
+
+Arguments:
+	# mesh 
+		Description:       The planar mesh, or the arrays of a mesh as returned by the GetMeshArrays function. 
+		Type:              Mesh or Dictionary 
+		GUI selection:     yes 
+		Selection by name: yes 
+		Recursive:         - 
+		Default value:     None  
+
+	# tol 
+		Description:       The maximum extent of the mesh along the third axis for the mesh to be considered as planar. 
+		Type:              Float 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     1e-7  
+
+Returned Values:
+	"dim" value:    - 
+	"single" value: - 
+	Type:           List of Integers 
+	Number:         2 
+	Name:           -  
+
+Conditions of use:
+	The mesh has to be parallel to the XY, XZ or YZ plane. The returned axes are sorted (0 = X, 1 = Y, 2 = Z).
+	
+
+"""
+	
+	if isinstance(mesh, dict):
+		
+		coordinates = mesh["coordinates"]
 		
-		for node_id in node_ids_in_mesh:
-			
-			if help == True:
-				
-				mesh_file.write("%i	%f	%f	%f\n"%(node_id, mesh.GetNodeXYZ(node_id)[0], mesh.GetNodeXYZ(node_id)[1], mesh.GetNodeXYZ(node_id)[2]))
-				
-			
-			for n in range(mesh_dimension):
-				
-				node_coordinate = mesh.GetNodeXYZ(node_id)[n]
-				
-				[node_float_coordinate, node_coordinate_power_of_ten] = powerOfTen(node_coordinate)
-				
-				node_coordinate = "%.16fE%i"%(node_float_coordinate, node_coordinate_power_of_ten)
-				
-				node_coordinates[n].append(node_coordinate)
-				
-			
+	
+	else:
 		
-		figures = []
+		# Get the input shape(s)
 		
-		for n in range(mesh_dimension):
-			
-			figures += node_coordinates[n]
-			
+		mesh = GetGUISelection(mesh, uniq = True)
 		
-		WriteInColumns(amsh_file, figures, mesh_dimension, 18)
+		mesh = GetObject(mesh, "SMESH")
 		
 		#-
 		
-		# Get the group element definition
+		# Check the input shape existence
 		
-		print("[i] Writing definition of group elements... (%s groups)"%(nb_groups))
+		if "error" in [mesh] or None in [mesh]: return
 		
-		if help == True:
-			
-			mesh_file.write("GROUPS\n")
-			
+		#-
 		
-		for group in groups:# For each group of the mesh
-			
-			group_name = group.GetName()
-			
-			element_ids_in_group = group.GetListOfID()
-			
-			triangle_ids_in_group = []
-			quadrangle_ids_in_group = []
-			edges_ids_in_group = []
-			
-			for element_id_in_group in element_ids_in_group:
-				
-				nb_nodes_in_element = mesh.GetElemNbNodes(element_id_in_group)
-				
-				if mesh_dimension == 3:
-					
-					if nb_nodes_in_element == 3:
-						
-						triangle_ids_in_group.append(element_id_in_group)
-						
-					
-					if nb_nodes_in_element == 4:
-						
-						quadrangle_ids_in_group.append(element_id_in_group)
-						
-					
-				
-				elif mesh_dimension == 2:
-					
-					edges_ids_in_group.append(element_id_in_group)
-					
-				
-			
-			nb_types_in_group = 0
-			
-			types_in_groups = 0 #-1 = edges ; + 1 = triangles ; + 2 = quadrangles
-			
-			nb_triangles_in_group = len(triangle_ids_in_group)
-			nb_quadrangles_in_group = len(quadrangle_ids_in_group)
-			nb_edges_in_group = len(edges_ids_in_group)
-			
-			if nb_triangles_in_group > 0:
-				
-				types_in_groups += 1
-				
-				nb_types_in_group += 1
-				
-			
-			if nb_quadrangles_in_group > 0:
-				
-				types_in_groups += 2
-				
-				nb_types_in_group += 1
-				
+		if "SMESH_Mesh instance" in str(mesh) or "meshProxy" in str(mesh) or "Mesh object" in str(mesh):
 			
-			if nb_edges_in_group > 0:
-				
-				types_in_groups -= 1
-				
-				nb_types_in_group += 1
-				
+			try:
+				mesh = smesh.Mesh(mesh)
+			except:
+				pass
 			
-			amsh_file.write(" boundary N 0 0 %i\n"%(nb_types_in_group + 1))
-			amsh_file.write(" boundary_name L 1 1 0\n")
-			amsh_file.write(" '%s'\n"%(group_name))
+		
+		else:
 			
-			if help == True:
-				
-				mesh_file.write("'%s'\n"%(group_name))
-				
+			print("[X] The input object is not a mesh or the Mesh module was not yet loaded."); return
 			
-			for n in range(nb_types_in_group):
-				
-				amsh_file.write(" belem_group N 0 0 2\n")
-				amsh_file.write(" bound_elem_type L 1 1 0\n")
-				
-				if types_in_groups == -1: # edges
-					
-					if help == True:
-						
-						mesh_file.write("EDGES\n")
-						
-					element_ids_in_group = edges_ids_in_group
-					nb_elements_in_group = nb_edges_in_group
-					
-					nb_nodes_in_elements = 2
-					
-					elements_type = "bar2"
-					
-				
-				elif types_in_groups == 2: # quadrangles
-					
-					if help == True:
-						
-						mesh_file.write("QUAD\n")
-						
-					
-					element_ids_in_group = quadrangle_ids_in_group
-					nb_elements_in_group = nb_quadrangles_in_group
-					
-					nb_nodes_in_elements = 4
-					
-					elements_type = "quad4"
-					
-				
-				elif types_in_groups == 1 or types_in_groups == 3: # triangles
-					
-					if help == True:
-						
-						mesh_file.write("TRIA\n")
-						
-					
-					element_ids_in_group = triangle_ids_in_group
-					nb_elements_in_group = nb_triangles_in_group
-					
-					nb_nodes_in_elements = 3
-					
-					types_in_groups -= 1
-					
-					elements_type = "tria3"
-					
-				
-				if help == True:
-					
-					mesh_file.write("N	ID	NODE1	NODE2	...\n")
-					
-					N = 1
-					
-				
-				amsh_file.write(" '%s'\n"%(elements_type))
-				amsh_file.write(" bound_elem_nodes IF %i %i 0\n"%(nb_nodes_in_elements, nb_elements_in_group))
-				
-				node_ids = []
-				
-				for n in range(nb_nodes_in_elements):
-					
-					node_ids.append([])
-					
-				
-				for element_id in element_ids_in_group:
-					
-					if help == True:
-						
-						mesh_file.write("%i	%i	"%(N, element_id))
-						
-						N += 1
-						
-					
-					for n in range(nb_nodes_in_elements):
-						
-						if help == True:
-							
-							mesh_file.write("%i	"%(mesh.GetElemNodes(element_id)[n]))
-							
-						
-						node_ids[n].append(mesh.GetElemNodes(element_id)[n])
-						
-					
-					if help == True:
-						
-						mesh_file.write("\n")
-						
-					
-				
-				figures = []
-				
-				for n in range(nb_nodes_in_elements):
-					
-					figures += node_ids[n]
-					
-				
-				WriteInColumns(amsh_file, figures, nb_nodes_in_elements, 30)
+		
+		coordinates = _GetFlatArray(mesh.GetNodesId(), mesh.GetNodeXYZ, numpy.float64, 3)
+		
+	
+	return _GetPlanarAxes(coordinates, tol)
+	
+
+dpa = DetectPlanarAxes
+
+def ExportAmshFile( mesh = None, file = None, only = [None], ignore = [None], help = False, callback = None, log = None, renumber = None, snapshot = None, sample = 100 ):
+	"""
+	
+	
+Description:
+	Exports a mesh into an .amsh file readable by the CFD solver Edge 5.0.0.
+	
+
+Arguments:
+	# mesh 
+		Description:       The mesh to export. 
+		Type:              Mesh 
+		GUI selection:     yes 
+		Selection by name: yes 
+		Recursive:         - 
+		Default value:     None  
+
+	# file 
+		Description:       The name without extension of the amsh file to write. If equals None, the name of the mesh in the study tree is taken. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# only 
+		Description:       The list of names of groups to export, excluding the others. 
+		Type:              List of Strings 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     [None]  
+
+	# ignore 
+		Description:       The list of names of groups to ignore. 
+		Type:              List of Strings 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     [None]  
+
+	# help 
+		Description:       Activates the generation of a help file giving relation between Edge and Salome node IDs. 
+		Type:              Boolean 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     False  
+
+	# callback 
+		Description:       If different from None, a function called at the end of the export with a report dictionary giving the time spent in each phase ("extraction", "classification", "formatting" and "io"), the total time, the numbers of exported elements and nodes, the number of elements exported per second and the peak memory of the process in bytes. 
+		Type:              Function 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# log 
+		Description:       If different from None, the name of a file to which the export report is appended as a JSON line. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# renumber 
+		Description:       If different from None, the renumbering applied to reduce the bandwidth of the mesh (see the ExportSU2File function). 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# snapshot 
+		Description:       If different from None, the name without extension of an NPZ snapshot from which the mesh arrays are loaded if the mesh did not change since it was saved, or into which they are saved otherwise (see the GetMeshArrays function). 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# sample 
+		Description:       See the GetMeshArrays function. 
+		Type:              Integer 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     100  
+
+Returned Values:
+	"dim" value:    - 
+	"single" value: - 
+	Type:           - 
+	Number:         - 
+	Name:           -  
+
+Conditions of use:
+	The mesh has to be computed and to contain groups describing the desired boundary conditions (inlet, outlet, wall, farfield, etc.).
+	
+	Warning: In the case the mesh is the result of a mesh fusion, the nodes and then the elements of the meshes to fuse have to be reordered before the fusion, else Edge can detect a Max dev. of accum. surface vector superior to its allowed tolerance during the preprocessor command execution.  
+
+"""
+	
+	# Get the input shape(s)
+	
+	mesh = GetGUISelection(mesh, uniq = True)
+	
+	mesh = GetObject(mesh, "SMESH")
+	
+	#-
+	
+	# Check the input shape existence
+	
+	if "error" in [mesh] or None in [mesh]: return
+	
+	#-
+	
+	else:# All checks done
+		
+		if "SMESH_Mesh instance" in str(mesh) or "meshProxy instance" in str(mesh) or "Mesh object" in str(mesh):
+			
+			try:
+				mesh = smesh.Mesh(mesh)
+			except:
+				pass
+			
+		
+		else:
+			
+			print("[X] The input object is not a mesh or the Mesh module was not yet loaded."); return
+			
+		
+		monitor = _StartMonitor("ExportAmshFile", callback, log)
+		
+		# Renumber elements and nodes
+		
+		_SwitchPhase(monitor, "extraction")
+		
+		mesh.RenumberNodes()
+		mesh.RenumberElements()
+		
+		#-
+		
+		# Extract the node coordinates and the element connectivity
+		
+		mesh_arrays = GetMeshArrays(mesh, only, ignore, snapshot = snapshot, sample = sample)
+		
+		if mesh_arrays == None: return
+		
+		mesh_arrays["counts"] = [mesh.NbNodes(), mesh.NbEdges(), mesh.NbTriangles(), mesh.NbQuadrangles(), mesh.NbTetras(), mesh.NbPyramids(), mesh.NbPrisms(), mesh.NbHexas()]
+		
+		#-
+		
+		# Reduce the bandwidth
+		
+		if renumber != None:
+			
+			_SwitchPhase(monitor, "ordering")
+			
+			print("[i] Renumbering the mesh... (%s)"%(renumber))
+			
+			if _ReorderMeshArrays(mesh_arrays, renumber) == None: return
+			
+		
+		#-
+		
+		# Write the amsh file
+		
+		if file == None:
 			
+			file = mesh_arrays["name"]
+			
+		
+		_WriteAmshFile(file, mesh_arrays, help, monitor)
 		
 		#-
 		
-		# Write the domain element definitions
+		# Report the export
+		
+		nb_elements = len(mesh_arrays["element_ids"]) + sum([group["size"] for group in mesh_arrays["groups"]])
+		
+		_StopMonitor(monitor, file, nb_elements, len(mesh_arrays["coordinates"]))
+		
+		#-
+		
+	
+
+eaf = ExportAmshFile
+
+def ExportPolyMesh( mesh = None, case_dir = None, only = [None], ignore = [None], binary = False, callback = None, log = None, renumber = None, snapshot = None, sample = 100 ):
+	"""
+	
+	
+Description:
+	Exports a 3D mesh into the polyMesh directory of an OpenFOAM case.
+	
+
+Arguments:
+	# mesh 
+		Description:       The mesh to export. 
+		Type:              Mesh 
+		GUI selection:     yes 
+		Selection by name: yes 
+		Recursive:         - 
+		Default value:     None  
+
+	# case_dir 
+		Description:       The directory of the OpenFOAM case. The points, faces, owner, neighbour and boundary files are written into its constant/polyMesh subdirectory, created if needed. If equals None, the name of the mesh in the study tree is taken. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# only 
+		Description:       The list of names of groups to export, excluding the others. 
+		Type:              List of Strings 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     [None]  
+
+	# ignore 
+		Description:       The list of names of groups to ignore. 
+		Type:              List of Strings 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     [None]  
+
+	# binary 
+		Description:       If equals True, the points, faces, owner and neighbour files are written in the OpenFOAM binary format (little-endian, 32-bit labels and 64-bit scalars). 
+		Type:              Boolean 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     False  
+
+	# callback 
+		Description:       If different from None, a function called at the end of the export with the export report (see the ExportAmshFile function). 
+		Type:              Function 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# log 
+		Description:       If different from None, the name of a file to which the export report is appended as a JSON line. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# renumber 
+		Description:       If different from None, the renumbering applied to reduce the bandwidth of the mesh (see the ExportSU2File function). The cells are written in the renumbered element order. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# snapshot 
+		Description:       If different from None, the name without extension of an NPZ snapshot from which the mesh arrays are loaded if the mesh did not change since it was saved, or into which they are saved otherwise (see the GetMeshArrays function). 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# sample 
+		Description:       See the GetMeshArrays function. 
+		Type:              Integer 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     100  
+
+Returned Values:
+	"dim" value:    - 
+	"single" value: - 
+	Type:           - 
+	Number:         - 
+	Name:           -  
+
+Conditions of use:
+	The mesh has to be computed, to be made of tetrahedrons, pyramids, prisms and hexahedrons, and to contain face groups describing the boundary conditions. Each face group gives a patch of type "patch", to be changed in the boundary file if needed, and the boundary faces belonging to no group are put into a last "defaultFaces" patch. A boundary face belonging to several groups is put into the first one.
+	
+	The faces are written as a compact face list. The faces of the cells are matched by a hash of their nodes, and oriented from their geometry so that their normals point from the owner cell to the neighbour cell.
+	
+
+"""
+	
+	# Get the input shape(s)
+	
+	mesh = GetGUISelection(mesh, uniq = True)
+	
+	mesh = GetObject(mesh, "SMESH")
+	
+	#-
+	
+	# Check the input shape existence
+	
+	if "error" in [mesh] or None in [mesh]: return
+	
+	#-
+	
+	else:# All checks done
 		
-		print("[i] Writing definition of domain elements... (%s elements)"%(nb_elements_in_domain))
+		if "SMESH_Mesh instance" in str(mesh) or "meshProxy instance" in str(mesh) or "Mesh object" in str(mesh):
+			
+			try:
+				mesh = smesh.Mesh(mesh)
+			except:
+				pass
+			
 		
-		if help == True:
+		else:
 			
-			mesh_file.write("DOMAIN CELLS\n")
+			print("[X] The input object is not a mesh or the Mesh module was not yet loaded."); return
 			
 		
-		triangle_ids_in_domain = []
-		quadrangle_ids_in_domain = []
-		tetrahedron_ids_in_domain = []
-		pyramid_ids_in_domain = []
-		prism_ids_in_domain = []
-		hexahedron_ids_in_domain = []
+		monitor = _StartMonitor("ExportPolyMesh", callback, log)
+		
+		# Renumber elements and nodes
+		
+		_SwitchPhase(monitor, "extraction")
+		
+		mesh.RenumberNodes()
+		mesh.RenumberElements()
+		
+		#-
+		
+		# Extract the node coordinates and the element connectivity
+		
+		mesh_arrays = GetMeshArrays(mesh, only, ignore, snapshot = snapshot, sample = sample)
+		
+		if mesh_arrays == None: return
+		
+		#-
+		
+		# Reduce the bandwidth
 		
-		if mesh_dimension == 2:
+		if renumber != None:
+			
+			_SwitchPhase(monitor, "ordering")
+			
+			print("[i] Renumbering the mesh... (%s)"%(renumber))
 			
-			element_ids_in_domain = face_ids_in_mesh
+			if _ReorderMeshArrays(mesh_arrays, renumber) == None: return
 			
 		
-		elif mesh_dimension == 3:
+		#-
+		
+		# Write the polyMesh files
+		
+		if case_dir == None:
 			
-			element_ids_in_domain = volume_ids_in_mesh
+			case_dir = mesh_arrays["name"]
 			
 		
-		for element_id_in_domain in element_ids_in_domain:
-			
-			nb_nodes_in_element = mesh.GetElemNbNodes(element_id_in_domain)
-			
-			if mesh_dimension == 2:
-				
-				if nb_nodes_in_element == 3:
-					
-					triangle_ids_in_domain.append(element_id_in_domain)
-					
-				
-				if nb_nodes_in_element == 4:
-					
-					quadrangle_ids_in_domain.append(element_id_in_domain)
-					
-				
+		if _WritePolyMesh(case_dir, mesh_arrays, binary, monitor) == None: return
+		
+		#-
+		
+		# Report the export
+		
+		_StopMonitor(monitor, case_dir, len(mesh_arrays["element_ids"]), len(mesh_arrays["coordinates"]))
+		
+		#-
+		
+	
+
+epm = ExportPolyMesh
+
+def _GetSU2Arrays( mesh, only = [None], ignore = [None], batch = None, tol = 1e-7, part = None, renumber = None, monitor = None, snapshot = None, sample = 100 ):
+	"""
+	Renumbers a mesh and extracts its arrays, prepared for the SU2 format by the _PrepareSU2Arrays function. If snapshot is different from None, the mesh arrays are loaded from or saved into this snapshot, sample being the number of nodes and elements checked against it (see the GetMeshArrays function). Returns None if the mesh cannot be exported.
+	"""
+	
+	if "SMESH_Mesh instance" in str(mesh) or "meshProxy" in str(mesh) or "Mesh object" in str(mesh):
+		
+		try:
+			mesh = smesh.Mesh(mesh)
+		except:
+			pass
+		
+	
+	else:
+		
+		print("[X] The input object is not a mesh or the Mesh module was not yet loaded."); return
+		
+	
+	# Renumber elements and nodes
+	
+	_SwitchPhase(monitor, "extraction")
+	
+	mesh.RenumberNodes()
+	mesh.RenumberElements()
+	
+	#-
+	
+	# Extract the node coordinates and the element connectivity
+	
+	mesh_arrays = GetMeshArrays(mesh, only, ignore, batch, snapshot, sample)
+	
+	if mesh_arrays == None: return
+	
+	#-
+	
+	return _PrepareSU2Arrays(mesh_arrays, tol, part, renumber, monitor)
+	
+
+def ExportSU2File( mesh = None, file = None, only = [None], ignore = [None], compress = None, batch = None, tol = 1e-7, incremental = False, part = None, renumber = None, callback = None, log = None, snapshot = None, sample = 100 ):
+	"""
+	
+	
+Description:
+	Exports a mesh into an .su2 file readable by the CFD solver SU2 4.0.
+	
+
+Arguments:
+	# mesh 
+		Description:       The mesh to export. 
+		Type:              Mesh 
+		GUI selection:     yes 
+		Selection by name: yes 
+		Recursive:         - 
+		Default value:     None  
+
+	# file 
+		Description:       The name without extension of the amsh file to write. If equals None, the name of the mesh in the study tree is taken. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# only 
+		Description:       The list of names of groups to export, excluding the others. 
+		Type:              List of Strings 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     [None]  
+
+	# ignore 
+		Description:       The list of names of groups to ignore. 
+		Type:              List of Strings 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     [None]  
+
+	# compress 
+		Description:       The compression of the written file : None, "gzip" (.su2.gz file) or "zstd" (.su2.zst file, requires the zstandard module). SU2 has no binary mesh format, so compressed files have to be decompressed before being read by the solver. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# batch 
+		Description:       If different from None, the number of group elements to extract and write at once, so that the memory used by the MARKER section stays bounded whatever the group sizes. The group element IDs are read by ranges of batch IDs, one query per range. 
+		Type:              Integer 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# tol 
+		Description:       In case of a 2D mesh, the maximum extent of the mesh along the dropped coordinate axis. 
+		Type:              Float 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     1e-7  
+
+	# incremental 
+		Description:       If equals True, the content of each section (elements, points and each marker) is hashed and saved in a .su2.hash file beside the su2 file. During the next export, only the sections whose content changed are rewritten, the other ones being copied from the previous file. 
+		Type:              Boolean 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     False  
+
+	# part 
+		Description:       If different from None, the number of parts into which the domain elements are partitioned by recursive coordinate bisection. The elements are then written partition after partition and the nodes renumbered in the order they are used, and the partition of each element is written in a <file>.su2.epart.<part> file (one line per element, named like the partition files of the METIS mpmetis program). Has to be at least 1. 
+		Type:              Integer 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# renumber 
+		Description:       If different from None, the nodes and the elements are renumbered before writing to reduce the bandwidth of the mesh and improve the memory locality of the solver. Can equal "rcm" (Reverse Cuthill-McKee ordering of the nodes, the elements being sorted by their first node) or "morton" (elements sorted along a Morton space-filling curve, the nodes being numbered in the order they are used). The bandwidth and the mean node index gap per element before and after renumbering are printed. The renumbered order is only kept if it does not increase the bandwidth and reduces the bandwidth or the mean node index gap. When used with the part argument, the elements keep the renumbered order inside each partition. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# callback 
+		Description:       If different from None, a function called at the end of the export with a report dictionary giving the time spent in each phase ("extraction", "classification", "ordering", "hashing", "formatting" and "io"), the total time, the numbers of exported elements and nodes, the number of elements exported per second and the peak memory of the process in bytes. 
+		Type:              Function 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# log 
+		Description:       If different from None, the name of a file to which the export report is appended as a JSON line. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# snapshot 
+		Description:       If different from None, the name without extension of an NPZ snapshot from which the mesh arrays are loaded if the mesh did not change since it was saved, or into which they are saved otherwise (see the GetMeshArrays function). Cannot be used with the batch argument. 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# sample 
+		Description:       See the GetMeshArrays function. 
+		Type:              Integer 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     100  
+
+Returned Values:
+	"dim" value:    - 
+	"single" value: - 
+	Type:           - 
+	Number:         - 
+	Name:           -  
+
+Conditions of use:
+	The mesh has to be computed and to contain groups describing the desired boundary conditions (inlet, outlet, wall, farfield, etc.).
+	
+
+"""
+	
+	# Get the input shape(s)
+	
+	mesh = GetGUISelection(mesh, uniq = True)
+	
+	mesh = GetObject(mesh, "SMESH")
+	
+	#-
+	
+	# Check the input shape existence
+	
+	if "error" in [mesh] or None in [mesh]: return
+	
+	#-
+	
+	else:# All checks done
+		
+		if part != None and part < 1:
 			
-			elif mesh_dimension == 3:
-				
-				if nb_nodes_in_element == 4:
-					
-					tetrahedron_ids_in_domain.append(element_id_in_domain)
-					
-				
-				if nb_nodes_in_element == 5:
-					
-					pyramid_ids_in_domain.append(element_id_in_domain)
-					
-				
-				if nb_nodes_in_element == 6:
-					
-					prism_ids_in_domain.append(element_id_in_domain)
-					
-				
-				if nb_nodes_in_element == 8:
-					
-					hexahedron_ids_in_domain.append(element_id_in_domain)
-					
-				
+			print("[X] The number of parts should be at least 1."); return
 			
 		
-		nb_types_in_domain = 0
-		types_in_domain = 0 #-2 = quadrangles ; - 1 = triangles ; + 1 = tetrahedrons ; + 2 = pyramids ; + 4 = prisms ; + 8 = hexahedrons
-		
-		nb_triangles_in_domain = len(triangle_ids_in_domain)
-		nb_quandrangles_in_domain = len(quadrangle_ids_in_domain)
-		nb_tetrahedrons_in_domain = len(tetrahedron_ids_in_domain)
-		nb_pyramids_in_domain = len(pyramid_ids_in_domain)
-		nb_prisms_in_domain = len(prism_ids_in_domain)
-		nb_hexahedrons_in_domain = len(hexahedron_ids_in_domain)
+		# Extract the mesh
 		
-		if nb_triangles_in_domain > 0:
-			
-			types_in_domain -= 1
-			
-			nb_types_in_domain += 1
-			
+		monitor = _StartMonitor("ExportSU2File", callback, log)
 		
-		if nb_quandrangles_in_domain > 0:
-			
-			types_in_domain -= 2
-			
-			nb_types_in_domain += 1
-			
+		mesh_arrays = _GetSU2Arrays(mesh, only, ignore, batch, tol, part, renumber, monitor, snapshot, sample)
 		
-		if nb_tetrahedrons_in_domain > 0:
-			
-			types_in_domain += 1
-			
-			nb_types_in_domain += 1
-			
+		if mesh_arrays == None: return
 		
-		if nb_pyramids_in_domain > 0:
-			
-			types_in_domain += 2
-			
-			nb_types_in_domain += 1
-			
+		#-
 		
-		if nb_prisms_in_domain > 0:
-			
-			types_in_domain += 4
-			
-			nb_types_in_domain += 1
-			
+		# Write the su2 file
 		
-		if nb_hexahedrons_in_domain > 0:
-			
-			types_in_domain += 8
+		if file == None:
 			
-			nb_types_in_domain += 1
+			file = mesh_arrays["name"]
 			
 		
-		types_for_quadrangles = [ - 3, - 2]
-		types_for_triangles = [ - 3, - 1]
-		types_for_tetrahedrons = [1, 3, 5, 7, 9, 11, 13, 15]
-		types_for_pyramids = [2, 3, 6, 7, 10, 11, 14, 15]
-		types_for_prisms = [4, 5, 6, 7, 12, 13, 14, 15]
-		types_for_hexahedrons = [8, 9, 10, 11, 12, 13, 14, 15]
-		
-		for n in range(nb_types_in_domain):
-			
-			amsh_file.write(" element_group N 0 0 2\n")
-			amsh_file.write(" element_type L 1 1 0\n")
-			
-			if types_in_domain in types_for_quadrangles:
-				
-				if help == True:
-					
-					mesh_file.write("QUAD\n")
-					
-				
-				element_ids_in_domain = quadrangle_ids_in_domain
-				nb_elements_in_domain = nb_quandrangles_in_domain
-				
-				nb_nodes_in_elements = 4
-				
-				types_in_domain += 2
-				
-				elements_type = "quad4"
-				
-			
-			elif types_in_domain in types_for_triangles:
-				
-				if help == True:
-					
-					mesh_file.write("TRIA\n")
-					
-				
-				element_ids_in_domain = triangle_ids_in_domain
-				nb_elements_in_domain = nb_triangles_in_domain
-				
-				nb_nodes_in_elements = 3
-				
-				types_in_domain += 1
-				
-				elements_type = "tria3"
-				
-			
-			elif types_in_domain in types_for_hexahedrons:
-				
-				if help == True:
-					
-					mesh_file.write("HEXA\n")
-					
-				
-				element_ids_in_domain = hexahedron_ids_in_domain
-				nb_elements_in_domain = nb_hexahedrons_in_domain
-				
-				nb_nodes_in_elements = 8
-				
-				types_in_domain -= 8
-				
-				elements_type = "hexa8"
-				
-			
-			elif types_in_domain in types_for_prisms:
-				
-				if help == True:
-					
-					mesh_file.write("PRISM\n")
-					
-				
-				element_ids_in_domain = prism_ids_in_domain
-				nb_elements_in_domain = nb_prisms_in_domain
-				
-				nb_nodes_in_elements = 6
-				
-				types_in_domain -= 4
-				
-				elements_type = "penta6"
-				
-			
-			elif types_in_domain in types_for_pyramids:
-				
-				if help == True:
-					
-					mesh_file.write("PENTA\n")
-					
-				
-				element_ids_in_domain = pyramid_ids_in_domain
-				
-				nb_elements_in_domain = nb_pyramids_in_domain
-				
-				nb_nodes_in_elements = 5
-				
-				types_in_domain -= 2
-				
-				elements_type = "penta5"
-				
-			
-			elif types_in_domain in types_for_tetrahedrons:
-				
-				if help == True:
-					
-					mesh_file.write("TETRA\n")
-					
-				
-				element_ids_in_domain = tetrahedron_ids_in_domain
-				nb_elements_in_domain = nb_tetrahedrons_in_domain
-				
-				nb_nodes_in_elements = 4
-				
-				types_in_domain -= 1
-				
-				elements_type = "tetra4"
-				
-			
-			if help == True:
-				
-				mesh_file.write("N	ID	NODE1	NODE2	...\n")
-				
-				N = 1
-				
-			
-			amsh_file.write(" '%s'\n"%(elements_type))
-			amsh_file.write(" element_nodes IF %i %i 0\n"%(nb_nodes_in_elements, nb_elements_in_domain))
-			
-			node_ids = []
-			
-			for n in range(nb_nodes_in_elements):
-				
-				node_ids.append([])
-				
-			
-			for element_id in element_ids_in_domain:
-				
-				if help == True:
-					
-					mesh_file.write("%i	%i	"%(N, element_id))
-					
-					N += 1
-					
-				
-				for n in range(nb_nodes_in_elements):
-					
-					if help == True:
-						
-						mesh_file.write("%i	"%(mesh.GetElemNodes(element_id)[n]))
-						
-					
-					node_ids[n].append(mesh.GetElemNodes(element_id)[n])
-					
-				
-				if help == True:
-					
-					mesh_file.write("\n")
-					
-				
-			
-			figures = []
-			
-			for n in range(nb_nodes_in_elements):
-				
-				figures += node_ids[n]
-				
-			
-			if mesh_dimension == 3:
-				
-				# reorder node IDs
-				
-				reordered_figures = []
-				split_figures = []
-				reordered_split_figures = []
-				
-				for n in range(nb_nodes_in_elements):
-					
-					split_figures.append([])
-					
-					reordered_split_figures.append([])
-					
-				
-				f = 0
-				n = 0
-				
-				for figure in figures:
-					
-					split_figures[n].append(figure)
-					
-					f += 1
-					
-					if f == nb_elements_in_domain:
-						
-						n += 1
-						f = 0
-						
-					
-				
-				if elements_type == "hexa8" or elements_type == "penta6":
-					
-					for n in range(nb_nodes_in_elements / 2):
-						
-						reordered_split_figures[n] = split_figures[nb_nodes_in_elements / 2 + n]
-						reordered_split_figures[nb_nodes_in_elements / 2 + n] = split_figures[n]
-						
-					
-					for n in range(nb_nodes_in_elements):
-						
-						reordered_figures += reordered_split_figures[n]
-						
-					
-					figures = reordered_figures
-					
-				
-				elif elements_type == "tetra4" or elements_type == "penta5":
-					
-					for n in range(nb_nodes_in_elements - 1):
-						
-						reordered_figures += split_figures[nb_nodes_in_elements - 2 - n]
-						
-					
-					figures = reordered_figures + split_figures[nb_nodes_in_elements - 1]
-					
-				
-			
-			WriteInColumns(amsh_file, figures, nb_nodes_in_elements, 24)
-			
+		if _WriteSU2File(file, mesh_arrays, compress, incremental, monitor) == None: return
 		
 		#-
 		
-		# Close the files
+		# Report the export
 		
-		amsh_file.close()
+		nb_elements = len(mesh_arrays["types"]) + sum([group["size"] for group in mesh_arrays["groups"]])
 		
-		if help == True:
-			
-			mesh_file.close()
-			
+		_StopMonitor(monitor, file, nb_elements, len(mesh_arrays["coordinates"]))
 		
 		#-
 		
 	
 
-eaf = ExportAmshFile
+esf = ExportSU2File
 
-def ExportSU2File( mesh = None, file = None, only = [None], ignore = [None]):
+def ExportSU2Files( meshes = [None], files = [None], only = [None], ignore = [None], compress = None, tol = 1e-7, incremental = False, part = None, renumber = None, proc = None ):
 	"""
 	
 	
 Description:
-	Exports a mesh into an .su2 file readable by the CFD solver SU2 4.0.
+	Exports several meshes into .su2 files, the formatting and the writing of the files being done in parallel by a pool of processes.
 	
 
-Arguments:
-	# mesh 
-		Description:       The mesh to export. 
-		Type:              Mesh 
-		GUI selection:     yes 
-		Selection by name: yes 
+Arguments:
+	# meshes 
+		Description:       The meshes to export. 
+		Type:              List of Meshes 
+		GUI selection:     yes 
+		Selection by name: yes 
+		Recursive:         - 
+		Default value:     [None]  
+
+	# files 
+		Description:       The names without extension of the su2 files to write. If equals [None], the names of the meshes in the study tree are taken. 
+		Type:              List of Strings 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     [None]  
+
+	# only 
+		Description:       The list of names of groups to export, excluding the others. 
+		Type:              List of Strings 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     [None]  
+
+	# ignore 
+		Description:       The list of names of groups to ignore. 
+		Type:              List of Strings 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     [None]  
+
+	# compress 
+		Description:       The compression of the written files : None, "gzip" or "zstd" (see the ExportSU2File function). 
+		Type:              String 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     None  
+
+	# tol 
+		Description:       In case of 2D meshes, the maximum extent of the meshes along the dropped coordinate axis. 
+		Type:              Float 
+		GUI selection:     - 
+		Selection by name: - 
+		Recursive:         - 
+		Default value:     1e-7  
+
+	# incremental 
+		Description:       If equals True, only the sections which changed since the previous export are rewritten (see the ExportSU2File function). 
+		Type:              Boolean 
+		GUI selection:     - 
+		Selection by name: - 
 		Recursive:         - 
-		Default value:     None  
+		Default value:     False  
 
-	# file 
-		Description:       The name without extension of the amsh file to write. If equals None, the name of the mesh in the study tree is taken. 
-		Type:              String 
+	# part 
+		Description:       If different from None, the number of parts into which the domain elements of each mesh are partitioned (see the ExportSU2File function). 
+		Type:              Integer 
 		GUI selection:     - 
 		Selection by name: - 
 		Recursive:         - 
 		Default value:     None  
 
-	# only 
-		Description:       The list of names of groups to export, excluding the others. 
-		Type:              List of Strings 
+	# renumber 
+		Description:       If different from None, the renumbering applied to each mesh to reduce its bandwidth (see the ExportSU2File function). 
+		Type:              String 
 		GUI selection:     - 
 		Selection by name: - 
 		Recursive:         - 
-		Default value:     [None]  
+		Default value:     None  
 
-	# ignore 
-		Description:       The list of names of groups to ignore. 
-		Type:              List of Strings 
+	# proc 
+		Description:       The number of processes writing the files. If equals None, the number of processors of the machine is taken. If equals 1, or if the function is called from the Salome GUI, the files are written one after the other without starting any process. 
+		Type:              Integer 
 		GUI selection:     - 
 		Selection by name: - 
 		Recursive:         - 
-		Default value:     [None]  
+		Default value:     None  
 
 Returned Values:
 	"dim" value:    - 
@@ -17849,465 +18976,216 @@ Returned Values:
 	Name:           -  
 
 Conditions of use:
-	The mesh has to be computed and to contain groups describing the desired boundary conditions (inlet, outlet, wall, farfield, etc.).
+	The meshes have to be computed and to contain groups describing the desired boundary conditions (inlet, outlet, wall, farfield, etc.). The meshes are extracted one after the other in the Salome session, while the files of the already extracted meshes are written by the processes. At most proc extracted meshes are held in memory at the same time, and only the arrays written into the files are sent to the processes. The processes are started with the "forkserver" method ("spawn" where not available) and import the main module of the script again, so a script calling this function outside of the Salome GUI has to protect its own code by an if __name__ == "__main__": block.
 	
 
 """
 	
 	# Get the input shape(s)
 	
-	mesh = GetGUISelection(mesh, uniq = True)
+	meshes = GetGUISelection(meshes)
 	
-	mesh = GetObject(mesh, "SMESH")
+	meshes = GetObject(meshes, "SMESH")
+	
+	if not isinstance(meshes, list):
+		
+		meshes = [meshes]
+		
 	
 	#-
 	
 	# Check the input shape existence
 	
-	if "error" in [mesh] or None in [mesh]: return
+	if "error" in meshes or None in meshes: return
 	
 	#-
 	
 	else:# All checks done
 		
-		def FindElementType(mesh_dimension, nb_nodes_in_element, boundary = False):
-			
-			if boundary == True: mesh_dimension -= 1
-			
-			line_type = 3
-			triangle_type = 5
-			quadrilateral_type = 9
-			tetrahedral_type = 10
-			hexahedral_type = 12
-			wedge_type = 13
-			pyramid_type = 14
-			
-			element_type = None
-			
-			if mesh_dimension == 1:
-				
-				if nb_nodes_in_element == 2:
-					
-					element_type = line_type
-					
-				
-			
-			if mesh_dimension == 2:
-				
-				if nb_nodes_in_element == 3:
-					
-					element_type = triangle_type
-					
-				
-				if nb_nodes_in_element == 4:
-					
-					element_type = quadrilateral_type
-					
-				
-			
-			elif mesh_dimension == 3:
-				
-				if nb_nodes_in_element == 4:
-					
-					element_type = tetrahedral_type
-					
-				
-				if nb_nodes_in_element == 5:
-					
-					element_type = pyramid_type
-					
-				
-				if nb_nodes_in_element == 6:
-					
-					element_type = wedge_type
-					
-				
-				if nb_nodes_in_element == 8:
-					
-					element_type = hexahedral_type
-					
-				
+		if files == [None]:
 			
-			return element_type
+			files = [None] * len(meshes)
 			
 		
-		def powerOfTen(figure):
+		if len(files) != len(meshes):
 			
-			figure *= 1.0
-			
-			n = 0
-			
-			if figure != 0:
-				
-				if abs(figure) < 1:
-					
-					while abs(figure) < 1:
-						
-						figure *= 10
-						
-						n -= 1
-						
-					
-				
-				if abs(figure) >= 10:
-					
-					while abs(figure) >= 10:
-						
-						figure /= 10
-						
-						n += 1
-						
-					
-				
-			
-			return figure, n
-			
-		print(str(mesh))
-		if "SMESH_Mesh instance" in str(mesh) or "meshProxy" in str(mesh) or "Mesh object" in str(mesh):
-			
-			try:
-				mesh = smesh.Mesh(mesh)
-			except:
-				pass
+			print("[X] The number of file names is different from the number of meshes."); return
 			
 		
-		else:
+		if part != None and part < 1:
 			
-			print("[X] The input object is not a mesh or the Mesh module was not yet loaded."); return
+			print("[X] The number of parts should be at least 1."); return
 			
 		
-		# Get the mesh name
-		
-		mesh_name = mesh.GetName()
-		
-		#-
-		
-		# Renumber elements and nodes
-		
-		mesh.RenumberNodes()
-		mesh.RenumberElements()
-		
-		#-
-		
-		# Get nodes number and IDs
-		
-		nb_nodes_in_mesh = mesh.NbNodes()
-		
-		node_ids_in_mesh = mesh.GetNodesId()
-		
-		#-
-		
-		# Get edges IDs
-		
-		edge_ids_in_mesh = mesh.GetElementsByType(SMESH.EDGE)
-		
-		nb_edges_in_mesh = mesh.NbEdges()
-		
-		#-
-		
-		# Get faces IDs
-		
-		face_ids_in_mesh = mesh.GetElementsByType(SMESH.FACE)
-		
-		nb_faces_in_mesh = mesh.NbFaces()
-		nb_triangles_in_mesh = mesh.NbTriangles()
-		nb_quadrangles_in_mesh = mesh.NbQuadrangles()
-		
-		#-
-		
-		# Get volumes IDs
-		
-		nb_volumes_in_mesh = mesh.NbVolumes()
-		
-		nb_tetrahedrons_in_mesh = mesh.NbTetras()
-		nb_pyramids_in_mesh = mesh.NbPyramids()
-		nb_prisms_in_mesh = mesh.NbPrisms()
-		nb_hexahedrons_in_mesh = mesh.NbHexas()
-		
-		volume_ids_in_mesh = mesh.GetElementsByType(SMESH.VOLUME)
-		
-		#-
-		
-		# Get mesh dimension
-		
-		if nb_volumes_in_mesh != 0:
+		if proc == None:
 			
-			mesh_dimension = 3
+			proc = os.cpu_count() or 1
 			
-			nb_elements_in_domain = nb_volumes_in_mesh
 		
-		else:
+		# Write the files one after the other from the Salome GUI, whose Python interpreter is embedded and whose main module cannot be protected
+		
+		if proc > 1:
 			
-			mesh_dimension = 2
+			try:
+				gui_session = "salome" in sys.modules and salome.sg.hasDesktop()
+			except:
+				gui_session = False
 			
-			nb_elements_in_domain = nb_faces_in_mesh
+			if gui_session == True:
+				
+				print("[i] No process can be started from the Salome GUI. The files are written one after the other.")
+				
+				proc = 1
+				
 			
 		
 		#-
 		
-		# Get groups
-		
-		group_names = mesh.GetGroupNames()
-		
-		groups = mesh.GetGroups()
+		# Create the process pool
 		
-		#-
-		
-		# Sort groups
+		# The processes only run _WriteSU2File, which is sent by reference, so they do not need a copy of the Salome session
 		
-		sorted_groups = []
+		pool = None
 		
-		if only != [None]:
+		if proc > 1:
 			
-			for group in groups:
-				
-				group_name = group.GetName()
+			if "forkserver" in multiprocessing.get_all_start_methods():
 				
-				if group_name in only:
-					
-					sorted_groups.append(group)
-					
+				context = multiprocessing.get_context("forkserver")
 				
 			
-			groups = sorted_groups
-			
-		
-		sorted_groups = []
-		
-		if ignore != [None]:
-			
-			for group in groups:
-				
-				group_name = group.GetName()
+			else:
 				
-				if group_name not in ignore:
-					
-					sorted_groups.append(group)
-					
+				context = multiprocessing.get_context("spawn")
 				
 			
-			groups = sorted_groups
-			
-		
-		# Get the number of groups
-		
-		nb_groups = len(groups)
-		
-		#-
-		
-		# Get group types
-		
-		group_types = []
-		
-		for group in groups:
-			
-			group_type = str(group.GetType())
-			
-			group_types.append(group_type)
-			
-		
-		#-
-		
-		# Open the su2 file
-		
-		if file == None:
+			pool = concurrent.futures.ProcessPoolExecutor(max_workers = proc, mp_context = context)
 			
-			file = mesh_name
-			
-		
-		su2_file = open("%s.su2"%(file), "w")
-		
-		su2_file.write("NDIME= %i\n"%(mesh_dimension))
 		
 		#-
 		
-		# Write the domain element definitions
-		
-		print("[i] Writing definition of domain elements... (%s elements)"%(nb_elements_in_domain))
-		
-		su2_file.write("NELEM= %i\n"%(nb_elements_in_domain))
-		
-		if mesh_dimension == 2:
-			
-			element_ids_in_domain = face_ids_in_mesh
+		try:
 			
-		
-		elif mesh_dimension == 3:
+			# Extract the meshes and send them to the pool
 			
-			element_ids_in_domain = volume_ids_in_mesh
+			start_time = time.time()
 			
-		
-		for element_id_in_domain in element_ids_in_domain:
+			written_files = []
 			
-			nb_nodes_in_element = mesh.GetElemNbNodes(element_id_in_domain)
+			writings = []
 			
-			element_type = FindElementType(mesh_dimension, nb_nodes_in_element)
+			nb_failures = 0
 			
-			element_definition = str(element_type)
+			running_writings = set()
 			
-			for n in range(nb_nodes_in_element):
+			for mesh, file in zip(meshes, files):
 				
-				#if element_type == pyramid_type: n *= -1
+				# Wait for a free process before extracting the next mesh
 				
-				node_id = mesh.GetElemNodes(element_id_in_domain)[n]
-				
-				node_id -= 1
-				
-				element_definition += "\t" + str(node_id)
+				if len(running_writings) >= proc:
+					
+					[done_writings, running_writings] = concurrent.futures.wait(running_writings, return_when = concurrent.futures.FIRST_COMPLETED)
+					
 				
-			
-			element_definition += "\t" + str(element_id_in_domain)
-			
-			su2_file.write(element_definition + "\n")
-			
-		
-		#-
-		
-		print("[i] Writing node coordinates... (%s nodes)"%(nb_nodes_in_mesh))
-		
-		su2_file.write("NPOIN= %i\n"%(nb_nodes_in_mesh))
-		
-        
-        # In case 2D checks which is the mesh dimension to be deleted
-		if mesh_dimension == 2:
-            
-			uniqueList1 = []
-            
-			uniqueList2 = []
-            
-			uniqueList3 = []
-            
-			for node_id in node_ids_in_mesh:
-			
-				rangeCustom = []
+				#-
 				
-				if mesh.GetNodeXYZ(node_id)[0] not in uniqueList1:
+				mesh_arrays = _GetSU2Arrays(mesh, only, ignore, None, tol, part, renumber)
 				
-					uniqueList1.append(mesh.GetNodeXYZ(node_id)[0])
+				if mesh_arrays == None:
 					
-				if mesh.GetNodeXYZ(node_id)[1] not in uniqueList2:
-				
-					uniqueList2.append(mesh.GetNodeXYZ(node_id)[1])
+					nb_failures += 1; continue
 					
-				if mesh.GetNodeXYZ(node_id)[2] not in uniqueList3:
-				
-					uniqueList3.append(mesh.GetNodeXYZ(node_id)[2])
-
-				# If the dimension of the loop has more than 1 unique elements
-				# it is not the dimension to be deleted in the 2D problems. 
-				if len(uniqueList1)>1:
 				
-					rangeCustom.append(0)
+				if file == None:
 					
-				if len(uniqueList2)>1:
-				
-					rangeCustom.append(1)
+					file = mesh_arrays["name"]
 					
-				if len(uniqueList3)>1:
-				
-					rangeCustom.append(2)
-				
-				# Checks if only one (of 3) dimension has a unique value 
-				if len(rangeCustom) > 1:
 				
-					break
-
-		#print(rangeCustom)
-		print(range)
-		# Write the node coordinates
-		
-		for node_id in node_ids_in_mesh:
-			
-			node_definition = ""
-			
-			if mesh_dimension == 2:
-				for n in rangeCustom:
-				
-					node_coordinate = mesh.GetNodeXYZ(node_id)[n]
-				
-					[node_float_coordinate, node_coordinate_power_of_ten] = powerOfTen(node_coordinate)
-				
-					node_coordinate = "%.16fE%i"%(node_float_coordinate, node_coordinate_power_of_ten)
-				
-					node_definition += "\t" + node_coordinate
+				if pool == None:
+					
+					writing = concurrent.futures.Future()
+					
+					try:
+						writing.set_result(_WriteSU2File(file, mesh_arrays, compress, incremental))
+					except Exception as error:
+						writing.set_exception(error)
 					
-			elif mesh_dimension == 3:
-				for n in range(mesh_dimension):
-				
-					node_coordinate = mesh.GetNodeXYZ(node_id)[n]
 				
-					[node_float_coordinate, node_coordinate_power_of_ten] = powerOfTen(node_coordinate)
+				else:
+					
+					writing = pool.submit(_WriteSU2File, file, _GetSU2WriterArrays(mesh_arrays), compress, incremental)
+					
+					running_writings.add(writing)
+					
 				
-					node_coordinate = "%.16fE%i"%(node_float_coordinate, node_coordinate_power_of_ten)
+				written_files.append(file)
 				
-					node_definition += "\t" + node_coordinate
+				writings.append(writing)
 				
 			
-			node_id -= 1
-			# Obsolete SU2 format
-			#node_definition += "\t" + str(node_id)
-			
-			su2_file.write(node_definition + "\n")
+			#-
 			
 		
-		#-
-		
-		# Get the group element definition
-		
-		print("[i] Writing definition of group elements... (%s groups)"%(nb_groups))
-		
-		su2_file.write("NMARK= %i\n"%(nb_groups))
-		
-		for group in groups:# For each group of the mesh
+		finally:
 			
-			group_name = group.GetName()
-			
-			su2_file.write("MARKER_TAG= %s\n"%(group_name))
+			# Wait for the end of the writings
 			
-			element_ids_in_group = group.GetListOfID()
+			if pool != None:
+				
+				pool.shutdown(wait = True)
+				
 			
-			nb_elements_in_group = len(element_ids_in_group)
+			#-
 			
-			su2_file.write("MARKER_ELEMS= %s\n"%(nb_elements_in_group))
+		
+		for file, writing in zip(written_files, writings):
 			
-			for element_id_in_group in element_ids_in_group:
+			if writing.exception() != None:
 				
-				nb_nodes_in_element = mesh.GetElemNbNodes(element_id_in_group)
+				print("[X] The file", file, "could not be written:", writing.exception())
 				
-				element_type = FindElementType(mesh_dimension, nb_nodes_in_element, boundary = True)
+				nb_failures += 1
 				
-				element_definition = str(element_type)
+			
+			elif writing.result() == None:
 				
-				for n in range(nb_nodes_in_element):
-					
-					node_id = mesh.GetElemNodes(element_id_in_group)[n]
-					
-					node_id -= 1
-					
-					element_definition += "\t" + str(node_id)
-					
+				print("[X] The file", file, "could not be written.")
 				
-				element_definition += "\t" + str(element_id_in_group)
+				nb_failures += 1
 				
-				su2_file.write(element_definition + "\n")
-			
 			
-		#-
-		
-		# Close the files
 		
-		su2_file.close()
+		print("[i] %i meshes exported and %i failed in %.1f s."%(len(meshes) - nb_failures, nb_failures, time.time() - start_time))
 		
 		#-
 		
 	
 
-esf = ExportSU2File
+esfs = ExportSU2Files
 
 #### - ####
 
-print("Welcome in cfdmsh!")
+# Greet the user in interactive sessions only (the Salome GUI having already imported the salome module)
+
+try:
+	interactive_session = hasattr(sys, "ps1") or sys.flags.interactive or ("salome" in sys.modules and salome.sg.hasDesktop())
+except:
+	interactive_session = False
 
-pv()
+if interactive_session == True:
+	
+	print("Welcome in cfdmsh!")
+	
+	pv()
+	
+	print("Type pdf() to see implemented functions.")
+	
 
-print("Type pdf() to see implemented functions.")
+#-
+
+import_time = time.time() - import_start_time
+
+if import_time > import_time_budget:
+	
+	print("[i] cfdmsh was imported in %.2f s, more than its budget of %.2f s."%(import_time, import_time_budget))
+	
@@ -0,0 +1,440 @@
+"""
+Tests of the mesh writers of the CFDMSH library
+
+These tests build small meshes as NumPy arrays, in the form returned by
+the GetMeshArrays function, so that they run without a Salome session.
+"""
+
+import os
+import sys
+import gzip
+
+import numpy
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mesh_writers
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+#### Mesh arrays ####
+
+def GetGroup( name, group_type, elements, first_id ):
+	"""
+	Gives the arrays of a group made of elements given as lists of node indexes.
+	"""
+	
+	return {
+		"name": name,
+		"type": group_type,
+		"size": len(elements),
+		"element_ids": numpy.arange(first_id, first_id + len(elements)),
+		"offsets": numpy.concatenate(([0], numpy.cumsum([len(element) for element in elements]))),
+		"connectivity": numpy.array([node for element in elements for node in element])
+		}
+		
+	
+def GetMeshArrays( name, dimension, coordinates, elements, groups ):
+	"""
+	Gives the arrays of a mesh made of elements given as lists of node indexes.
+	"""
+	
+	return {
+		"name": name,
+		"dimension": dimension,
+		"node_ids": numpy.arange(1, len(coordinates) + 1),
+		"coordinates": numpy.array(coordinates, dtype = numpy.float64),
+		"element_ids": numpy.arange(100, 100 + len(elements)),
+		"offsets": numpy.concatenate(([0], numpy.cumsum([len(element) for element in elements]))),
+		"connectivity": numpy.array([node for element in elements for node in element]),
+		"groups": groups
+		}
+		
+	
+def GetPlanarMesh( nb_x = 3, nb_y = 2 ):
+	"""
+	Gives a planar grid of quadrangles whose last cell is split into two triangles, with a "bottom" and a "top" group of edges.
+	"""
+	
+	Index = lambda i, j: j * (nb_x + 1) + i
+	
+	coordinates = [[i, j, 0.0] for j in range(nb_y + 1) for i in range(nb_x + 1)]
+	
+	elements = [[Index(i, j), Index(i + 1, j), Index(i + 1, j + 1), Index(i, j + 1)] for j in range(nb_y) for i in range(nb_x)]
+	
+	[a, b, c, d] = elements.pop()
+	
+	elements += [[a, b, c], [a, c, d]]
+	
+	groups = [
+		GetGroup("bottom", "EDGE", [[Index(i, 0), Index(i + 1, 0)] for i in range(nb_x)], 1),
+		GetGroup("top", "EDGE", [[Index(i + 1, nb_y), Index(i, nb_y)] for i in range(nb_x)], 50)
+		]
+		
+	return GetMeshArrays("planar", 2, coordinates, elements, groups)
+	
+
+def GetVolumeMesh( nb_x = 3, nb_y = 2, nb_z = 2 ):
+	"""
+	Gives a grid of hexahedra with a "bottom" group of quadrangles.
+	"""
+	
+	Index = lambda i, j, k: (k * (nb_y + 1) + j) * (nb_x + 1) + i
+	
+	coordinates = [[i, j, k] for k in range(nb_z + 1) for j in range(nb_y + 1) for i in range(nb_x + 1)]
+	
+	elements = [[Index(i, j, k), Index(i + 1, j, k), Index(i + 1, j + 1, k), Index(i, j + 1, k), Index(i, j, k + 1), Index(i + 1, j, k + 1), Index(i + 1, j + 1, k + 1), Index(i, j + 1, k + 1)] for k in range(nb_z) for j in range(nb_y) for i in range(nb_x)]
+	
+	groups = [GetGroup("bottom", "FACE", [[Index(i, j, 0), Index(i, j + 1, 0), Index(i + 1, j + 1, 0), Index(i + 1, j, 0)] for j in range(nb_y) for i in range(nb_x)], 1000)]
+	
+	return GetMeshArrays("volume", 3, coordinates, elements, groups)
+	
+
+def GetElementPoints( mesh_arrays ):
+	"""
+	Gives the sorted coordinates of the nodes of each element, which do not depend on the node and element numbering.
+	"""
+	
+	coordinates = mesh_arrays["coordinates"]
+	offsets = mesh_arrays["offsets"]
+	connectivity = mesh_arrays["connectivity"]
+	
+	return sorted(tuple(sorted(map(tuple, coordinates[connectivity[offsets[n]:offsets[n + 1]]].tolist()))) for n in range(len(offsets) - 1))
+	
+
+def ReadLines( file ):
+	"""
+	Reads the lines of a text file, whatever its line endings.
+	"""
+	
+	with open(file) as text_file:
+	
+		return text_file.read().splitlines()
+		
+	
+
+#-
+
+#### SU2 format ####
+
+def test_su2_file_matches_known_file( tmp_path ):
+	"""
+	Checks the SU2 file of a planar mesh with quadrangles and triangles against a known file.
+	"""
+	
+	mesh_writers.WriteSU2File(GetPlanarMesh(), str(tmp_path / "planar"))
+	
+	assert ReadLines(tmp_path / "planar.su2") == ReadLines(os.path.join(data_dir, "planar.su2"))
+	
+
+def test_su2_batched_groups_match_plain_groups( tmp_path ):
+	"""
+	Checks that groups given by batches are written as the same MARKER sections as whole groups.
+	"""
+	
+	mesh_arrays = GetPlanarMesh()
+	
+	mesh_writers.WriteSU2File(mesh_arrays, str(tmp_path / "plain"))
+	
+	batched_arrays = dict(mesh_arrays)
+	
+	batched_arrays["groups"] = []
+	
+	for group in mesh_arrays["groups"]:
+	
+		batches = [{"element_ids": group["element_ids"][start:start + 2], "offsets": group["offsets"][start:start + 3] - group["offsets"][start], "connectivity": group["connectivity"][group["offsets"][start]:group["offsets"][min(start + 2, group["size"])]]} for start in range(0, group["size"], 2)]
+		
+		batched_arrays["groups"].append({"name": group["name"], "type": group["type"], "size": group["size"], "batches": iter(batches)})
+		
+	
+	mesh_writers.WriteSU2File(batched_arrays, str(tmp_path / "batched"))
+	
+	assert ReadLines(tmp_path / "batched.su2") == ReadLines(tmp_path / "plain.su2")
+	
+
+def test_su2_group_of_domain_elements_is_rejected( tmp_path ):
+	"""
+	Checks that no file is written when a group does not contain boundary elements.
+	"""
+	
+	mesh_arrays = GetPlanarMesh()
+	
+	mesh_arrays["groups"] = [dict(mesh_arrays["groups"][0], type = "FACE")]
+	
+	mesh_writers.WriteSU2File(mesh_arrays, str(tmp_path / "planar"))
+	
+	assert os.listdir(tmp_path) == []
+	
+
+@pytest.mark.parametrize("GetMesh", [GetPlanarMesh, GetVolumeMesh])
+def test_su2_round_trip( tmp_path, GetMesh ):
+	"""
+	Checks that ReadSU2File gives back the written arrays.
+	"""
+	
+	mesh_arrays = GetMesh()
+	
+	mesh_writers.WriteSU2File(mesh_arrays, str(tmp_path / "mesh"))
+	
+	read_arrays = mesh_writers.ReadSU2File(str(tmp_path / "mesh.su2"))
+	
+	mesh_dimension = mesh_arrays["dimension"]
+	
+	assert read_arrays["dimension"] == mesh_dimension
+	
+	numpy.testing.assert_array_equal(read_arrays["coordinates"], mesh_arrays["coordinates"][:, :mesh_dimension])
+	
+	for array_name in ["element_ids", "offsets", "connectivity"]:
+	
+		numpy.testing.assert_array_equal(read_arrays[array_name], mesh_arrays[array_name])
+		
+		for read_group, group in zip(read_arrays["groups"], mesh_arrays["groups"]):
+		
+			numpy.testing.assert_array_equal(read_group[array_name], group[array_name])
+			
+		
+	
+	assert [group["name"] for group in read_arrays["groups"]] == [group["name"] for group in mesh_arrays["groups"]]
+	
+
+def test_su2_read_skips_comments( tmp_path ):
+	"""
+	Checks that ReadSU2File ignores comment lines.
+	"""
+	
+	lines = ReadLines(os.path.join(data_dir, "planar.su2"))
+	
+	lines.insert(lines.index("NPOIN= 12"), "% node coordinates")
+	
+	with open(tmp_path / "commented.su2", "w") as su2_file:
+	
+		su2_file.write("\n".join(lines) + "\n")
+		
+	
+	read_arrays = mesh_writers.ReadSU2File(str(tmp_path / "commented.su2"))
+	
+	numpy.testing.assert_array_equal(read_arrays["coordinates"], GetPlanarMesh()["coordinates"][:, :2])
+	
+
+def test_su2_read_empty_file( tmp_path ):
+	"""
+	Checks that ReadSU2File reports an empty file instead of failing.
+	"""
+	
+	open(tmp_path / "empty.su2", "w").close()
+	
+	assert mesh_writers.ReadSU2File(str(tmp_path / "empty.su2")) == None
+	
+
+def test_su2_compressed_file_matches_plain_file( tmp_path ):
+	"""
+	Checks that a gzip compressed SU2 file has the content of the uncompressed one.
+	"""
+	
+	mesh_writers.WriteSU2File(GetPlanarMesh(), str(tmp_path / "planar"), compress = "gzip")
+	
+	with gzip.open(tmp_path / "planar.su2.gz", "rt") as su2_file:
+	
+		assert su2_file.read().splitlines() == ReadLines(os.path.join(data_dir, "planar.su2"))
+		
+	
+
+def test_su2_incremental_export_rewrites_changed_sections( tmp_path ):
+	"""
+	Checks that an incremental export gives the same file as a full export once the nodes moved.
+	"""
+	
+	mesh_arrays = GetPlanarMesh()
+	
+	mesh_writers.WriteSU2File(mesh_arrays, str(tmp_path / "planar"), incremental = True)
+	
+	mesh_arrays["coordinates"] = mesh_arrays["coordinates"] * 2.0
+	
+	mesh_writers.WriteSU2File(mesh_arrays, str(tmp_path / "planar"), incremental = True)
+	
+	mesh_writers.WriteSU2File(mesh_arrays, str(tmp_path / "reference"))
+	
+	assert ReadLines(tmp_path / "planar.su2") == ReadLines(tmp_path / "reference.su2")
+	
+
+def test_su2_partition_file( tmp_path ):
+	"""
+	Checks the element partition file written beside the SU2 file.
+	"""
+	
+	mesh_writers.WriteSU2File(GetPlanarMesh(), str(tmp_path / "planar"), part = 2)
+	
+	partitions = numpy.loadtxt(tmp_path / "planar.su2.epart.2", dtype = numpy.int64)
+	
+	assert len(partitions) == 7
+	
+	assert sorted(set(partitions.tolist())) == [0, 1]
+	
+
+def test_su2_file_from_snapshot( tmp_path ):
+	"""
+	Checks that a mesh snapshot is only loaded with its key and is written like the mesh arrays it was saved from.
+	"""
+	
+	mesh_arrays = GetPlanarMesh()
+	
+	mesh_writers._SaveMeshSnapshot(str(tmp_path / "snapshot"), mesh_arrays, "key")
+	
+	assert mesh_writers._LoadMeshSnapshot(str(tmp_path / "snapshot"), "other key") == None
+	
+	mesh_writers.WriteSU2File(str(tmp_path / "snapshot"), str(tmp_path / "planar"))
+	
+	assert ReadLines(tmp_path / "planar.su2") == ReadLines(os.path.join(data_dir, "planar.su2"))
+	
+
+#-
+
+#### AMSH format ####
+
+def test_amsh_file_matches_known_file( tmp_path ):
+	"""
+	Checks the AMSH file of a planar mesh with quadrangles and triangles against a known file, except for the date in its title.
+	"""
+	
+	mesh_writers.WriteAmshFile(GetPlanarMesh(), str(tmp_path / "planar"))
+	
+	lines = ReadLines(tmp_path / "planar.amsh")
+	known_lines = ReadLines(os.path.join(data_dir, "planar.amsh"))
+	
+	# The title gives the export date
+	
+	assert lines[2].startswith(" 'planar exported from Salome on ")
+	
+	assert lines[:2] + lines[3:] == known_lines[:2] + known_lines[3:]
+	
+
+#-
+
+#### Renumbering ####
+
+def test_rcm_renumbering_reduces_bandwidth():
+	"""
+	Checks that the Reverse Cuthill-McKee renumbering reduces the bandwidth of a shuffled grid without changing its elements.
+	"""
+	
+	mesh_arrays = GetPlanarMesh(8, 8)
+	
+	# Shuffle the nodes
+	
+	node_order = numpy.random.default_rng(0).permutation(len(mesh_arrays["coordinates"]))
+	
+	new_node_indexes = numpy.empty(len(node_order), dtype = numpy.int64)
+	
+	new_node_indexes[node_order] = numpy.arange(len(node_order))
+	
+	mesh_arrays["coordinates"] = mesh_arrays["coordinates"][node_order]
+	mesh_arrays["node_ids"] = mesh_arrays["node_ids"][node_order]
+	mesh_arrays["connectivity"] = new_node_indexes[mesh_arrays["connectivity"]]
+	
+	for group in mesh_arrays["groups"]:
+	
+		group["connectivity"] = new_node_indexes[group["connectivity"]]
+		
+	
+	#-
+	
+	element_points = GetElementPoints(mesh_arrays)
+	
+	bandwidth = mesh_writers._GetBandwidth(mesh_arrays["offsets"], mesh_arrays["connectivity"])
+	
+	mesh_writers._ReorderMeshArrays(mesh_arrays, "rcm")
+	
+	assert mesh_writers._GetBandwidth(mesh_arrays["offsets"], mesh_arrays["connectivity"]) <= min(bandwidth // 2, 2 * (8 + 1))
+	
+	assert GetElementPoints(mesh_arrays) == element_points
+	
+
+@pytest.mark.parametrize("renumber", ["rcm", "morton"])
+def test_renumbering_never_increases_bandwidth( renumber ):
+	"""
+	Checks that the renumberings keep the bandwidth of an already ordered grid and its elements.
+	"""
+	
+	mesh_arrays = GetVolumeMesh(6, 5, 4)
+	
+	element_points = GetElementPoints(mesh_arrays)
+	
+	bandwidth = mesh_writers._GetBandwidth(mesh_arrays["offsets"], mesh_arrays["connectivity"])
+	
+	mesh_writers._ReorderMeshArrays(mesh_arrays, renumber)
+	
+	assert mesh_writers._GetBandwidth(mesh_arrays["offsets"], mesh_arrays["connectivity"]) <= bandwidth
+	
+	assert GetElementPoints(mesh_arrays) == element_points
+	
+
+#-
+
+#### OpenFOAM polyMesh format ####
+
+def test_polymesh_owner_and_neighbour_order():
+	"""
+	Checks the face order and orientation of the polyMesh arrays of a grid of hexahedra.
+	"""
+	
+	mesh_arrays = GetVolumeMesh()
+	
+	polymesh_arrays = mesh_writers._GetPolyMeshArrays(mesh_arrays)
+	
+	faces = polymesh_arrays["faces"]
+	owner = polymesh_arrays["owner"]
+	neighbour = polymesh_arrays["neighbour"]
+	
+	nb_internal_faces = len(neighbour)
+	
+	assert nb_internal_faces == 2 * 2 * 2 + 3 * 1 * 2 + 3 * 2 * 1
+	
+	assert len(faces) == len(owner) == nb_internal_faces + 2 * (3 * 2 + 3 * 2 + 2 * 2)
+	
+	# Internal faces first, sorted by owner then neighbour, the owner being the lower cell
+	
+	assert (owner[:nb_internal_faces] < neighbour).all()
+	
+	assert list(zip(owner[:nb_internal_faces], neighbour)) == sorted(zip(owner[:nb_internal_faces], neighbour))
+	
+	# Boundary faces grouped by patch
+	
+	assert [(patch["name"], patch["size"], patch["start"]) for patch in polymesh_arrays["patches"]] == [("bottom", 6, 20), ("defaultFaces", 26, 26)]
+	
+	# Face normals pointing out of the owner cell
+	
+	coordinates = mesh_arrays["coordinates"]
+	
+	cell_centres = coordinates[mesh_arrays["connectivity"].reshape(-1, 8)].mean(axis = 1)
+	
+	face_points = coordinates[faces]
+	
+	normals = numpy.cross(face_points[:, 2] - face_points[:, 0], face_points[:, 3] - face_points[:, 1])
+	
+	assert ((normals * (face_points.mean(axis = 1) - cell_centres[owner])).sum(axis = 1) > 0).all()
+	
+	bottom_faces = face_points[20:26]
+	
+	assert (bottom_faces[:, :, 2] == 0).all()
+	
+
+def test_polymesh_files( tmp_path ):
+	"""
+	Checks the files written into the polyMesh directory.
+	"""
+	
+	mesh_writers.WritePolyMesh(GetVolumeMesh(2, 1, 1), str(tmp_path))
+	
+	polymesh_dir = tmp_path / "constant" / "polyMesh"
+	
+	assert sorted(os.listdir(polymesh_dir)) == ["boundary", "faces", "neighbour", "owner", "points"]
+	
+	owner_lines = ReadLines(polymesh_dir / "owner")
+	
+	assert owner_lines[owner_lines.index("(") - 1] == "11"
+	
+	assert ReadLines(polymesh_dir / "neighbour")[-5:] == ["1", "(", "1", ")", ""]
+	
+
+#-